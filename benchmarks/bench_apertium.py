@@ -0,0 +1,76 @@
+# benchmarks/bench_apertium.py
+"""
+Compara a latência por string do Apertium:
+  - spawn: 1 processo `apertium -f txt <par>` por string (caminho antigo)
+  - worker: processo vivo `apertium -z` (pool do ApertiumManager)
+
+Uso (na raiz do projeto, com apertium + par instalados):
+    python benchmarks/bench_apertium.py [rodadas]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cogs.promo_embed import ApertiumManager  # noqa: E402
+from utils import APERTIUM_PAIR  # noqa: E402
+
+SAMPLES = [
+    "For over two decades, Counter-Strike has offered an elite competitive experience.",
+    "Explore a vast open world, craft weapons and armor, and defend your base from zombies.",
+    "Build, fight and survive with your friends in this co-op adventure.",
+    "A story-driven RPG where every choice matters.",
+    "Scavenge for loot, extract with your gear, and do it again.",
+]
+
+
+def _report(name: str, samples: list) -> None:
+    ms = [x * 1000 for x in samples]
+    print(
+        f"{name:>7}: n={len(ms)} mean={statistics.mean(ms):.1f}ms "
+        f"p50={statistics.median(ms):.1f}ms max={max(ms):.1f}ms"
+    )
+
+
+async def main(rounds: int) -> None:
+    pair = (APERTIUM_PAIR or "").strip()
+    tr = ApertiumManager()
+    if not await tr.ensure_ready():
+        print(f"Apertium não pronto: {tr.err}")
+        return
+
+    spawn = []
+    for _ in range(rounds):
+        for text in SAMPLES:
+            t0 = time.perf_counter()
+            await tr._translate_spawn(pair, text)
+            spawn.append(time.perf_counter() - t0)
+
+    # sem cache: cada rodada usa o worker de verdade
+    worker = []
+    await tr._translate_worker(pair, ["warm up"])
+    for _ in range(rounds):
+        for text in SAMPLES:
+            t0 = time.perf_counter()
+            await tr._translate_worker(pair, [text])
+            worker.append(time.perf_counter() - t0)
+
+    batch = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        await tr._translate_worker(pair, SAMPLES)
+        batch.append((time.perf_counter() - t0) / len(SAMPLES))
+
+    await tr.close()
+
+    _report("spawn", spawn)
+    _report("worker", worker)
+    _report("batch", batch)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5))
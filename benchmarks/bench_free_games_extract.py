@@ -0,0 +1,102 @@
+# benchmarks/bench_free_games_extract.py
+"""
+Compara a extração do FreeStuffMonitor em páginas salvas:
+  - soup: BeautifulSoup(html, "html.parser") (caminho antigo)
+  - extractor: free_games.extract_game_info (regex + balanceamento, sem árvore)
+
+Mede tempo (p50/max) e pico de memória (tracemalloc).
+
+Uso (na raiz do projeto; salve as páginas com "Salvar como... HTML"):
+    python benchmarks/bench_free_games_extract.py Steam:steam.html Epic:epic.html GOG:gog.html [rodadas]
+
+BeautifulSoup é opcional (pip install beautifulsoup4); sem ele só o extractor roda.
+"""
+
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cogs.free_games import extract_game_info  # noqa: E402
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+
+def soup_game_info(platform, html):
+    # cópia do fetch_game_info antigo
+    soup = BeautifulSoup(html, "html.parser")
+    if platform == "Steam":
+        desc = soup.find("div", id="game_area_description")
+        details = soup.select_one(".details_block")
+        genres = "Indisponível"
+        if details:
+            text = details.get_text("\n", strip=True)
+            for token in ("Genre:", "Gênero:", "Género:"):
+                if token in text:
+                    genres = text.split(token, 1)[1].split("\n", 1)[0].strip()
+                    break
+        return {
+            "desc": desc.get_text("\n", strip=True)[:900] if desc else "Indisponível",
+            "genres": genres,
+            "end_date": "Não informado",
+        }
+    meta = soup.find("meta", {"name": "description"})
+    return {
+        "desc": meta["content"][:900] if meta and meta.get("content") else "Indisponível",
+        "genres": "Indisponível",
+        "end_date": "Não informado",
+    }
+
+
+def _measure(fn, platform, html, rounds):
+    times = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn(platform, html)
+        times.append((time.perf_counter() - t0) * 1000)
+    tracemalloc.start()
+    result = fn(platform, html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return times, peak, result
+
+
+def _report(name, times, peak):
+    print(
+        f"  {name:>9}: p50={statistics.median(times):.2f}ms max={max(times):.2f}ms "
+        f"pico={peak / 1024:.0f}KiB"
+    )
+
+
+def main(args):
+    rounds = 20
+    if args and args[-1].isdigit():
+        rounds = int(args.pop())
+    if not args:
+        print(__doc__)
+        return
+
+    for spec in args:
+        platform, _, path = spec.partition(":")
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            html = f.read()
+        print(f"{platform} {os.path.basename(path)} ({len(html) / 1024:.0f}KiB)")
+
+        t, peak, res = _measure(extract_game_info, platform, html, rounds)
+        _report("extractor", t, peak)
+        print(f"  {'':>9}  genres={res['genres']!r} desc={res['desc'][:60]!r}")
+
+        if BeautifulSoup is not None:
+            t, peak, res = _measure(soup_game_info, platform, html, rounds)
+            _report("soup", t, peak)
+            print(f"  {'':>9}  genres={res['genres']!r} desc={res['desc'][:60]!r}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,153 @@
+# benchmarks/bench_platform_extract.py
+"""
+Compara a extração de campos dos webhooks do PlatformMonitor:
+  - old: merge do data + _get por campo + _deep_get por campo faltante (caminho antigo)
+  - new: platform_monitor._extract (tabela alias -> campo, uma varredura)
+
+Confere também que os dois devolvem a mesma tupla.
+
+Uso (na raiz do projeto):
+    python benchmarks/bench_platform_extract.py [payloads.jsonl] [rodadas]
+
+payloads.jsonl: um JSON por linha (corpo do webhook como chegou). Sem arquivo,
+usa os exemplos abaixo (formatos vistos da TikFinity).
+"""
+
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cogs.platform_monitor import _extract  # noqa: E402
+
+SAMPLES = [
+    # TikFinity plano (o mais comum)
+    {"event": "live_start", "username": "@fulano", "title": "jogando ranked", "game": "Valorant",
+     "thumb": "https://p16.tiktokcdn.com/x.jpg", "live_url": "https://www.tiktok.com/@fulano/live"},
+    # plano sem jogo/capa -> antes varria tudo de novo por campo
+    {"event": "live_info", "username": "fulano", "title": "papo"},
+    {"type": "live_end", "uniqueId": "fulano"},
+    # com data aninhado
+    {"event": "live_start", "data": {"uniqueId": "ciclano", "liveTitle": "speedrun",
+                                     "categoryName": "Minecraft", "coverUrl": "https://c/x.jpg",
+                                     "shareUrl": "https://www.tiktok.com/@ciclano/live"}},
+    # room aninhado em vários níveis
+    {"event": "live_info", "user": "beltrano",
+     "data": {"room": {"roomName": "noite de terror", "roomCover": "https://c/y.jpg",
+                       "stats": [{"viewers": 120}, {"likes": 5000}],
+                       "game": {"subCategoryName": "Phasmophobia"}}}},
+]
+
+
+def old_extract(payload):
+    # cópia do _extract antigo
+    def _norm(x):
+        if x is None:
+            return None
+        if not isinstance(x, str):
+            x = str(x)
+        x = x.strip()
+        return x or None
+
+    def _empty(v):
+        return v in (None, "", [], {}, ())
+
+    def _get(p, *keys):
+        for k in keys:
+            if k in p and not _empty(p[k]):
+                return p[k]
+        return None
+
+    def _deep_get(obj, keys):
+        if isinstance(obj, dict):
+            for k, v in obj.items():
+                if k in keys and not _empty(v):
+                    return v
+            for v in obj.values():
+                found = _deep_get(v, keys)
+                if not _empty(found):
+                    return found
+        elif isinstance(obj, list):
+            for item in obj:
+                found = _deep_get(item, keys)
+                if not _empty(found):
+                    return found
+        return None
+
+    base = payload
+    data = payload.get("data") if isinstance(payload.get("data"), dict) else None
+    if data:
+        merged = dict(data)
+        merged.update({k: v for k, v in base.items() if k != "data"})
+        payload = merged
+
+    event = _norm(_get(payload, "event", "type", "action", "name"))
+    username = _norm(_get(payload, "username", "unique_id", "uniqueId", "user"))
+    if username:
+        username = username.lstrip("@")
+
+    title = _norm(_get(payload, "title", "live_title", "liveTitle", "room_title", "roomTitle", "roomTitleText"))
+    game = _norm(_get(payload, "game", "gameName", "game_name", "category", "category_name", "categoryName", "partitionName"))
+    thumb = _norm(_get(payload, "thumb", "thumbnail", "thumb_url", "thumbUrl", "cover", "coverUrl", "cover_url", "coverURL", "coverImageUrl"))
+    live_url = _norm(_get(payload, "live_url", "liveUrl", "shareUrl", "share_url", "url", "link"))
+
+    if not title:
+        title = _norm(_deep_get(base, {"title", "live_title", "liveTitle", "room_title", "roomTitle", "roomTitleText", "roomName"}))
+    if not game:
+        game = _norm(_deep_get(base, {"game", "gameName", "game_name", "category", "category_name", "categoryName", "partitionName", "subCategoryName"}))
+    if not thumb:
+        thumb = _norm(_deep_get(base, {"thumb", "thumbnail", "thumb_url", "thumbUrl", "cover", "coverUrl", "cover_url", "coverURL", "coverImageUrl", "roomCover"}))
+    if not live_url:
+        live_url = _norm(_deep_get(base, {"live_url", "liveUrl", "shareUrl", "share_url", "url", "link"}))
+
+    return event.lower() if event else None, username, title, game, thumb, live_url
+
+
+def _load(path):
+    out = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                obj = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(obj, dict):
+                out.append(obj)
+    return out
+
+
+def _measure(fn, payloads, rounds):
+    times = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        for p in payloads:
+            fn(p)
+        times.append((time.perf_counter() - t0) * 1e6 / len(payloads))
+    return times
+
+
+def main(args):
+    rounds = 2000
+    if args and args[-1].isdigit():
+        rounds = int(args.pop())
+    payloads = _load(args[0]) if args else SAMPLES
+    if not payloads:
+        print("Nenhum payload válido.")
+        return
+
+    diff = sum(1 for p in payloads if old_extract(p) != _extract(p))
+    print(f"{len(payloads)} payloads, {rounds} rodadas, divergências: {diff}")
+
+    for name, fn in (("old", old_extract), ("new", _extract)):
+        t = _measure(fn, payloads, rounds)
+        print(f"  {name:>3}: p50={statistics.median(t):.2f}us/payload min={min(t):.2f}us")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,53 @@
+# benchmarks/bench_steam_catalog.py
+"""
+Mede a busca título -> appid no catálogo offline (índice de trigramas).
+
+Uso (na raiz do projeto):
+    python benchmarks/bench_steam_catalog.py [dump.json] [rodadas]
+"""
+
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from steam_catalog import STEAM_CATALOG_PATH, SteamCatalog  # noqa: E402
+
+SAMPLES = [
+    "Counter-Strike 2",
+    "Hollow Knight",
+    "ELDEN RING Shadow of the Erdtree",
+    "The Witcher 3: Wild Hunt - Complete Edition",
+    "Stardew Valley (PC)",
+    "Red Dead Redemption 2",
+    "jogo que não existe xyz",
+]
+
+
+def main(path: str, rounds: int) -> None:
+    cat = SteamCatalog(path)
+    t0 = time.perf_counter()
+    n = cat.reload()
+    if not n:
+        print(f"Catálogo não carregou: {cat.err}")
+        return
+    print(f"carga: {n} apps em {time.perf_counter() - t0:.2f}s")
+
+    for title in SAMPLES:
+        times = []
+        hits = []
+        for _ in range(rounds):
+            t = time.perf_counter()
+            hits = cat.search(title, limit=3)
+            times.append((time.perf_counter() - t) * 1e6)
+        top = f"{hits[0][1]} ({hits[0][0]}, {hits[0][2]:.2f})" if hits else "-"
+        print(f"{title[:40]:>40}: p50={statistics.median(times):.0f}us max={max(times):.0f}us -> {top}")
+
+
+if __name__ == "__main__":
+    main(
+        sys.argv[1] if len(sys.argv) > 1 else STEAM_CATALOG_PATH,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 50,
+    )
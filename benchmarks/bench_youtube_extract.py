@@ -0,0 +1,100 @@
+# benchmarks/bench_youtube_extract.py
+"""
+Compara a extração do ytInitialData em páginas de canal salvas:
+  - old: regex não-guloso DOTALL + json.loads + varredura recursiva completa
+  - new: find por índice + raw_decode + caminhos conhecidos (varredura só se eles não trazem vídeo nenhum)
+
+Mede tempo (p50/max) e pico de memória (tracemalloc).
+
+Uso (na raiz do projeto; salve com "curl -L https://www.youtube.com/@canal > canal.html"):
+    python benchmarks/bench_youtube_extract.py live.html offline.html [rodadas]
+"""
+
+import json
+import os
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from platforms.youtube import _extract_yt_initial_data, _search_live_in_initial_data  # noqa: E402
+
+
+def old_path(html):
+    # cópia do caminho antigo
+    data = None
+    for pat in (r"ytInitialData\"\]\s*=\s*({.*?});</script>", r"var ytInitialData\s*=\s*({.*?});"):
+        m = re.search(pat, html, re.DOTALL)
+        if m:
+            try:
+                data = json.loads(m.group(1))
+                break
+            except Exception:
+                pass
+    if not isinstance(data, dict):
+        return None
+
+    def walk(obj):
+        if isinstance(obj, dict):
+            v = obj.get("videoRenderer")
+            if isinstance(v, dict):
+                for o in v.get("thumbnailOverlays", []):
+                    if o.get("thumbnailOverlayTimeStatusRenderer", {}).get("style") == "LIVE":
+                        return v
+            for val in obj.values():
+                r = walk(val)
+                if r:
+                    return r
+        elif isinstance(obj, list):
+            for item in obj:
+                r = walk(item)
+                if r:
+                    return r
+        return None
+
+    return walk(data)
+
+
+def new_path(html):
+    return _search_live_in_initial_data(_extract_yt_initial_data(html))
+
+
+def _measure(fn, html, rounds):
+    times = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn(html)
+        times.append((time.perf_counter() - t0) * 1000)
+    tracemalloc.start()
+    result = fn(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return times, peak, result
+
+
+def main(args):
+    rounds = 20
+    if args and args[-1].isdigit():
+        rounds = int(args.pop())
+    if not args:
+        print(__doc__)
+        return
+
+    for path in args:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            html = f.read()
+        print(f"{os.path.basename(path)} ({len(html) / 1024:.0f}KiB)")
+        for name, fn in (("old", old_path), ("new", new_path)):
+            t, peak, res = _measure(fn, html, rounds)
+            vid = res.get("videoId") if isinstance(res, dict) else None
+            print(
+                f"  {name:>3}: p50={statistics.median(t):.2f}ms max={max(t):.2f}ms "
+                f"pico={peak / 1024:.0f}KiB live={vid}"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
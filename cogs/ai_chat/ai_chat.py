@@ -1,7 +1,9 @@
 # cogs/ai_chat/ai_chat.py
 import asyncio
+import json
+import logging
+import os
 import random
-import re
 import time
 
 import discord
@@ -9,6 +11,7 @@ from discord.ext import commands
 from utils import CHANNEL_MAIN, OWNER_ID, ADMIN_ROLE_ID, WELCOME_CHANNEL_ID as WELCOME_CHANNEL_ID_CONST
 
 from utils import CHANNEL_MAIN
+from join_pipeline import join_pipeline, JoinBatch
 
 from .ai_engine import AIEngine
 from .message_buffer import MessageBuffer
@@ -18,6 +21,16 @@ from .ai_state import AIStateManager
 from .typing_tracker import TypingTracker
 from .core import ChatCore
 from .block_classifier import BlockClassifier
+from .history_store import HistoryStore
+
+log = logging.getLogger("ai_chat")
+
+# snapshot do ChatCore: salvo no cog_unload (reload / shutdown) e de tempos em
+# tempos; restaurado no cog_load. Mais velho que SNAPSHOT_MAX_AGE é ignorado.
+STATE_PATH = "data/ai_chat_state.json"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_MAX_AGE = 6 * 3600
+SNAPSHOT_EVERY = 120.0
 
 
 class CFG:
@@ -66,14 +79,11 @@ class CFG:
     welcome_delay_min = 1.0
     welcome_delay_max = 240.0
 
-    # anti-spam (raid)
-    welcome_per_user_cooldown = 60.0          # não dar boas-vindas repetidas pro mesmo cara rápido
+    # anti-spam (raid); cooldown por usuário e modo raid vêm do join_pipeline
     welcome_global_window = 120.0             # janela de contagem
     welcome_global_max_in_window = 4          # max boas-vindas na janela
 
 
-_MENTION_ID_RE = re.compile(r"<@!?(?P<id>\d+)>")
-
 
 class AIChatCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -102,6 +112,7 @@ class AIChatCog(commands.Cog):
 
         self.typing = TypingTracker()
         self.block = BlockClassifier(self.engine)
+        self.history = HistoryStore()
 
         self.core = ChatCore(
             bot=self.bot,
@@ -112,6 +123,7 @@ class AIChatCog(commands.Cog):
             state=self.state,
             typing=self.typing,
             block_classifier=self.block,
+            history=self.history,
             base_window=CFG.base_window,
             fragment_window=CFG.fragment_window,
             max_wait_soft=CFG.max_wait_soft,
@@ -131,10 +143,82 @@ class AIChatCog(commands.Cog):
         )
 
         # --- welcome bridge state (não toca no cooldown do core) ---
-        self._welcome_last_by_user = {}   # user_id -> ts
         self._welcome_global_hits = []    # [ts, ts, ...]
         self._welcome_pending = set()     # user_ids em fila
 
+        self._autosave_task: asyncio.Task | None = None
+        self._resume_task: asyncio.Task | None = None
+
+    async def cog_load(self):
+        # joins chegam agregados pelo join_pipeline (antes: lia a msg do WelcomeCog no canal de boas-vindas)
+        join_pipeline.subscribe("ai_chat_welcome", self.on_join_batch)
+
+        if self._load_snapshot():
+            self._resume_task = asyncio.create_task(self._resume_after_ready())
+        self._autosave_task = asyncio.create_task(self._autosave_loop())
+
+    async def cog_unload(self):
+        join_pipeline.unsubscribe("ai_chat_welcome")
+        for t in (self._autosave_task, self._resume_task):
+            if t:
+                t.cancel()
+        # salva antes de cancelar os batches (o texto pendente vai junto)
+        self._save_snapshot()
+        self.core.shutdown()
+        # grava o que ainda estava na fila do histórico
+        await self.history.close()
+
+    # ---------- snapshot ----------
+    def _load_snapshot(self) -> bool:
+        try:
+            if not os.path.isfile(STATE_PATH):
+                return False
+            with open(STATE_PATH, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            log.warning(f"[AI_CHAT] snapshot ilegível, ignorando: {e}")
+            return False
+
+        if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+            return False
+        age = time.time() - float(data.get("saved_at", 0.0) or 0.0)
+        if age > SNAPSHOT_MAX_AGE:
+            log.info(f"[AI_CHAT] snapshot velho ({age / 3600:.1f}h), começando do zero")
+            return False
+
+        try:
+            self.core.restore(data.get("core") or {})
+        except Exception:
+            log.exception("[AI_CHAT] falha restaurando snapshot, começando do zero")
+            return False
+        log.info(f"[AI_CHAT] estado restaurado ({len(self.core.buffers)} autores, {len(self.core.pending_buffers)} batches)")
+        return True
+
+    def _save_snapshot(self):
+        try:
+            data = {"version": SNAPSHOT_VERSION, "saved_at": time.time(), "core": self.core.snapshot()}
+            os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+            tmp = STATE_PATH + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, STATE_PATH)
+        except Exception as e:
+            log.warning(f"[AI_CHAT] falha salvando snapshot: {e}")
+
+    async def _resume_after_ready(self):
+        # no boot o cache de canais só existe depois do ready; no reload já está pronto
+        await self.bot.wait_until_ready()
+        await self.core.resume_pending()
+
+    async def _autosave_loop(self):
+        # cobre queda sem cog_unload (crash / kill)
+        try:
+            while True:
+                await asyncio.sleep(SNAPSHOT_EVERY)
+                self._save_snapshot()
+        except asyncio.CancelledError:
+            return
+
     def _now(self) -> float:
         return time.time()
 
@@ -144,39 +228,6 @@ class AIChatCog(commands.Cog):
         self._welcome_global_hits = [t for t in self._welcome_global_hits if (now - float(t)) <= w]
         return len(self._welcome_global_hits) < int(CFG.welcome_global_max_in_window)
 
-    def _extract_target_member(self, message: discord.Message) -> discord.Member | None:
-        """Tenta achar o membro que entrou a partir da mensagem no canal de boas-vindas."""
-        guild = getattr(message, "guild", None)
-        if not guild:
-            return None
-
-        # 1) mentions diretas
-        try:
-            for u in (message.mentions or []):
-                if isinstance(u, discord.Member) and (not u.bot):
-                    return u
-                # às vezes vem como User; tenta pegar Member
-                if hasattr(u, "id") and (not getattr(u, "bot", False)):
-                    m = guild.get_member(int(u.id))
-                    if m and (not m.bot):
-                        return m
-        except Exception:
-            pass
-
-        # 2) regex <@id>
-        try:
-            txt = (message.content or "")
-            m = _MENTION_ID_RE.search(txt)
-            if m:
-                uid = int(m.group("id"))
-                mem = guild.get_member(uid)
-                if mem and (not mem.bot):
-                    return mem
-        except Exception:
-            pass
-
-        return None
-
     def _pick_welcome_line(self, name: str) -> str:
         # seco/analítico + sarcasmo leve (sem humilhar)
         lines = [
@@ -189,23 +240,28 @@ class AIChatCog(commands.Cog):
         ]
         return random.choice(lines)
 
-    async def _delayed_welcome(self, guild_id: int, member_id: int, delay: float):
+    async def _delayed_welcome(self, guild_id: int, member_ids: list, delay: float):
         try:
             await asyncio.sleep(float(delay))
             guild = self.bot.get_guild(int(guild_id))
             if not guild:
                 return
 
-            member = guild.get_member(int(member_id))
-            if not member or member.bot:
+            # quem saiu durante o delay fica de fora
+            members = [m for m in (guild.get_member(int(i)) for i in member_ids) if m and not m.bot]
+            if not members:
                 return
 
             ch = guild.get_channel(int(CHANNEL_MAIN))
             if not isinstance(ch, discord.TextChannel):
                 return
 
-            line = self._pick_welcome_line(member.display_name)
-            content = f"{member.mention} {line}"
+            if len(members) == 1:
+                name = members[0].display_name
+            else:
+                name = ", ".join(m.display_name for m in members[:-1]) + f" e {members[-1].display_name}"
+            line = self._pick_welcome_line(name)
+            content = f"{' '.join(m.mention for m in members)} {line}"
 
             await ch.send(
                 content,
@@ -213,47 +269,30 @@ class AIChatCog(commands.Cog):
             )
         finally:
             # limpa pendência
-            try:
-                self._welcome_pending.discard(int(member_id))
-            except Exception:
-                pass
-
-    async def _handle_welcome_channel_message(self, message: discord.Message):
-        # só no canal de boas-vindas
-        if int(getattr(message.channel, "id", 0) or 0) != int(CFG.WELCOME_CHANNEL_ID):
-            return
+            for mid in member_ids:
+                self._welcome_pending.discard(int(mid))
 
-        # ignora mensagens do próprio Override
-        me = getattr(self.bot, "user", None)
-        if me and int(getattr(message.author, "id", 0) or 0) == int(me.id):
+    async def on_join_batch(self, batch: JoinBatch):
+        # raid: quem fala é o resumo do WelcomeCog
+        if batch.raid:
             return
 
-        # precisa achar um membro alvo
-        target = self._extract_target_member(message)
-        if not target:
+        targets = [m for m in batch.fresh if int(m.id) not in self._welcome_pending][:3]
+        if not targets:
             return
 
         now = self._now()
 
-        # por-user cooldown
-        last = float(self._welcome_last_by_user.get(int(target.id), 0.0) or 0.0)
-        if last and (now - last) < float(CFG.welcome_per_user_cooldown):
-            return
-
-        # anti-raid global
+        # anti-raid global (1 hit por mensagem)
         if not self._welcome_global_allow(now):
             return
 
-        # não agenda duplicado
-        if int(target.id) in self._welcome_pending:
-            return
-
-        self._welcome_last_by_user[int(target.id)] = now
         self._welcome_global_hits.append(now)
-        self._welcome_pending.add(int(target.id))
+        ids = [int(m.id) for m in targets]
+        self._welcome_pending.update(ids)
 
         delay = random.uniform(float(CFG.welcome_delay_min), float(CFG.welcome_delay_max))
-        asyncio.create_task(self._delayed_welcome(int(target.guild.id), int(target.id), delay))
+        asyncio.create_task(self._delayed_welcome(int(batch.guild.id), ids, delay))
 
     @commands.Cog.listener()
     async def on_typing(self, channel, user, when):
@@ -269,14 +308,6 @@ class AIChatCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
-        # ✅ welcome bridge precisa ver mensagem de bot no canal de boas-vindas
-        try:
-            if isinstance(message.channel, discord.TextChannel) and int(message.channel.id) == int(CFG.WELCOME_CHANNEL_ID):
-                await self._handle_welcome_channel_message(message)
-                return
-        except Exception:
-            pass
-
         # fluxo normal do ai_chat (ignora bots)
         if message.author.bot:
             return
@@ -2,6 +2,7 @@
 
 import time
 from dataclasses import dataclass
+from typing import Any, Dict
 
 
 CONVERSATION_TIMEOUT = 120  # segundos (inatividade para expirar conversa ativa)
@@ -77,6 +78,18 @@ class AIStateManager:
     def _touch(self, user_id: int):
         self.last_interaction[user_id] = time.time()
 
+    # -------- snapshot (reload/restart) --------
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "active_conversations": list(self.active_conversations),
+            "last_interaction": {str(k): v for k, v in self.last_interaction.items()},
+        }
+
+    def restore(self, data: Dict[str, Any]):
+        self.active_conversations = {int(u) for u in (data.get("active_conversations") or [])}
+        self.last_interaction = {int(k): float(v) for k, v in (data.get("last_interaction") or {}).items()}
+
     def end_conversation(self, user_id: int):
         self.active_conversations.discard(user_id)
         self.last_interaction[user_id] = time.time()  # ✅ alimenta cooldown pós-fim
\ No newline at end of file
@@ -1,7 +1,7 @@
 # cogs/ai_chat/channel_memory.py
 from collections import deque
 from dataclasses import dataclass
-from typing import Deque, List
+from typing import Any, Deque, Dict, List
 
 
 @dataclass
@@ -35,4 +35,18 @@ class ChannelMemory:
         lim = max(0, int(limit))
         if lim <= 0:
             return []
-        return [x.text for x in list(self._lines)[-lim:]]
\ No newline at end of file
+        return [x.text for x in list(self._lines)[-lim:]]
+
+    # -------- snapshot (reload/restart) --------
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"lines": [[x.ts, x.text] for x in self._lines]}
+
+    def restore(self, data: Dict[str, Any]):
+        self._lines.clear()
+        for item in data.get("lines") or []:
+            try:
+                ts, text = item
+            except (TypeError, ValueError):
+                continue
+            self.add(float(ts), str(text))
\ No newline at end of file
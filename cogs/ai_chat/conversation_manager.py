@@ -1,6 +1,6 @@
 import time
 from enum import Enum
-from typing import Optional
+from typing import Any, Dict, Optional
 
 
 class ConversationState(Enum):
@@ -72,6 +72,31 @@ class ConversationManager:
         self.ended_at = t
         self.exit_started_at = 0.0
 
+    # -------- snapshot (reload/restart) --------
+
+    def snapshot(self) -> Dict[str, Any]:
+        # só o estado; timeouts são config e vêm do construtor
+        return {
+            "active_author": self.active_author,
+            "started_at": self.started_at,
+            "last_activity_ts": self.last_activity_ts,
+            "exit_started_at": self.exit_started_at,
+            "ended_at": self.ended_at,
+            "state": self.state.value,
+        }
+
+    def restore(self, data: Dict[str, Any]):
+        a = data.get("active_author")
+        self.active_author = int(a) if a is not None else None
+        self.started_at = float(data.get("started_at", 0.0) or 0.0)
+        self.last_activity_ts = float(data.get("last_activity_ts", 0.0) or 0.0)
+        self.exit_started_at = float(data.get("exit_started_at", 0.0) or 0.0)
+        self.ended_at = float(data.get("ended_at", 0.0) or 0.0)
+        try:
+            self.state = ConversationState(data.get("state"))
+        except ValueError:
+            self.state = ConversationState.OBSERVING
+
     def _ended_recently(self, now: float) -> bool:
         if self.ended_at <= 0:
             return False
@@ -33,7 +33,7 @@ import random
 import re
 import time
 from dataclasses import dataclass
-from typing import Optional, Dict, List, Set
+from typing import Any, Optional, Dict, List, Set
 
 import discord
 
@@ -50,9 +50,15 @@ from .block_classifier import BlockClassifier
 from .interjection_policy import InterjectionPolicy
 from .channel_memory import ChannelMemory
 from .read_intent import build_read_intent, ReadIntent
+from .history_store import HistoryStore
 
 log = logging.getLogger("ai_chat.core")
 
+# histórico durável: só busca do disco quando a janela em RAM tem pouco contexto
+HISTORY_MIN_CONTEXT = 3          # msgs do usuário na janela abaixo disso -> busca mais antigas
+HISTORY_OLDER_LIMIT = 8
+HISTORY_LOOKBACK = 7 * 24 * 3600
+
 _MENTION_RE = re.compile(r"<@!?\d+>|<@&\d+>|<#\d+>")
 _SPECIAL_MENTIONS = {"@everyone", "@here"}
 _NAME_CALL_RE = re.compile(r"\boverride\b", re.IGNORECASE)
@@ -351,6 +357,7 @@ class ChatCore:
         state: AIStateManager,
         typing: TypingTracker,
         block_classifier: Optional[BlockClassifier] = None,
+        history: Optional[HistoryStore] = None,
         base_window: float = 3.0,
         fragment_window: float = 8.0,
         max_wait_soft: float = 14.0,
@@ -388,6 +395,7 @@ class ChatCore:
         self.buffers: Dict[int, MessageBuffer] = {}
         self.per_author_buffer_limit = int(per_author_buffer_limit)
         self.buffer = buffer  # compat
+        self.history = history
 
         self.social_focus = social_focus
 
@@ -481,14 +489,39 @@ class ChatCore:
 
     # -------- buffers por autor --------
 
+    def _new_buffer(self, author_id: int) -> MessageBuffer:
+        # o canal vai em cada mensagem (o autor pode trocar de canal)
+        return MessageBuffer(
+            max_messages=self.per_author_buffer_limit,
+            store=self.history,
+            owner_id=int(author_id),
+        )
+
     def _get_buffer(self, author_id: int) -> MessageBuffer:
         a = int(author_id)
         buf = self.buffers.get(a)
         if not buf:
-            buf = MessageBuffer(max_messages=self.per_author_buffer_limit)
+            buf = self._new_buffer(a)
             self.buffers[a] = buf
         return buf
 
+    async def _older_context_hint(self, buf: MessageBuffer, channel_id: int) -> Optional[str]:
+        """
+        Conversa anterior (disco) quando a janela tem pouco contexto — ex.:
+        depois de restart ou de uma conversa que já tinha terminado.
+        Só olha o canal atual.
+        """
+        if self.history is None:
+            return None
+        user_msgs = sum(1 for m in buf.get_messages(channel_id) if m.get("role") == "user")
+        if user_msgs >= HISTORY_MIN_CONTEXT:
+            return None
+        older = await buf.older(HISTORY_OLDER_LIMIT, max_age=HISTORY_LOOKBACK, channel_id=channel_id)
+        if not older:
+            return None
+        lines = [f"{m.get('author_name') or 'user'}: {m['content']}" for m in older]
+        return "CONVERSA ANTERIOR com essa pessoa (contexto antigo; use só se ajudar, não retome do nada):\n- " + "\n- ".join(lines)
+
     def _get_self_memory(self, author_id: int) -> List[str]:
         a = int(author_id)
         mem = self.self_memory_by_author.get(a)
@@ -500,6 +533,149 @@ class ChatCore:
     def notify_typing(self, author_id: int, channel_id: int):
         self.typing.notify_typing(author_id, channel_id)
 
+    # -------- snapshot (reload/restart) --------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Estado serializável (JSON) pra sobreviver a reload/restart.
+        Tasks não entram: batches pendentes voltam só com texto + meta e são
+        retomados por resume_pending().
+        """
+        return {
+            "buffers": {str(a): b.snapshot() for a, b in self.buffers.items()},
+            "conv_by_author": {str(a): c.snapshot() for a, c in self.conv_by_author.items()},
+            "self_memory_by_author": {str(a): list(m) for a, m in self.self_memory_by_author.items()},
+            "pending": {
+                str(a): {
+                    "messages": list(msgs),
+                    "meta": dict(self.pending_meta.get(a, {})),
+                    "first_ts": self.batch_first_ts.get(a, 0.0),
+                    "last_ts": self.batch_last_ts.get(a, 0.0),
+                    "hold_until": self.fragment_hold_until.get(a, 0.0),
+                }
+                for a, msgs in self.pending_buffers.items()
+            },
+            "topic_sessions": {
+                k: {
+                    "keywords": sorted(s.keywords),
+                    "authors": sorted(s.authors),
+                    "last_activity": s.last_activity,
+                    "turns": s.turns,
+                }
+                for k, s in self.topic_sessions.items()
+            },
+            "author_topic": {str(a): k for a, k in self.author_topic.items()},
+            "last_vibe_by_author": {str(a): t for a, t in self._last_vibe_by_author.items()},
+            "global_active_author": self.global_active_author,
+            "global_state": self.global_state.value,
+            "global_state_ts": self.global_state_ts,
+            "state": self.state.snapshot(),
+            "interject": self.interject.snapshot(),
+            "chanmem": self.chanmem.snapshot(),
+        }
+
+    def restore(self, data: Dict[str, Any]):
+        self.buffers = {}
+        for a, snap in (data.get("buffers") or {}).items():
+            buf = self._new_buffer(int(a))
+            buf.restore(snap)
+            self.buffers[int(a)] = buf
+
+        self.conv_by_author = {}
+        for a, snap in (data.get("conv_by_author") or {}).items():
+            conv = self._new_conv_like_template()
+            conv.restore(snap)
+            self.conv_by_author[int(a)] = conv
+
+        self.self_memory_by_author = {
+            int(a): [str(x) for x in m][-self.self_memory_limit:]
+            for a, m in (data.get("self_memory_by_author") or {}).items()
+        }
+
+        for a, p in (data.get("pending") or {}).items():
+            a = int(a)
+            msgs = [str(m) for m in (p.get("messages") or [])]
+            if not msgs:
+                continue
+            self.pending_buffers[a] = msgs
+            self.pending_meta[a] = dict(p.get("meta") or {})
+            self.batch_first_ts[a] = float(p.get("first_ts", 0.0) or 0.0)
+            self.batch_last_ts[a] = float(p.get("last_ts", 0.0) or 0.0)
+            self.fragment_hold_until[a] = float(p.get("hold_until", 0.0) or 0.0)
+
+        self.topic_sessions = {
+            k: TopicSession(
+                key=k,
+                keywords=set(s.get("keywords") or []),
+                authors={int(x) for x in (s.get("authors") or [])},
+                last_activity=float(s.get("last_activity", 0.0) or 0.0),
+                turns=int(s.get("turns", 0) or 0),
+            )
+            for k, s in (data.get("topic_sessions") or {}).items()
+        }
+        self.author_topic = {
+            int(a): k for a, k in (data.get("author_topic") or {}).items() if k in self.topic_sessions
+        }
+        self._last_vibe_by_author = {int(a): float(t) for a, t in (data.get("last_vibe_by_author") or {}).items()}
+
+        ga = data.get("global_active_author")
+        self.global_active_author = int(ga) if ga is not None else None
+        try:
+            self.global_state = ConversationState(data.get("global_state"))
+        except ValueError:
+            self.global_state = ConversationState.OBSERVING
+        self.global_state_ts = float(data.get("global_state_ts", 0.0) or 0.0)
+
+        self.state.restore(data.get("state") or {})
+        self.interject.restore(data.get("interject") or {})
+        self.chanmem.restore(data.get("chanmem") or {})
+
+    def _drop_batch(self, author_id: int):
+        self.pending_buffers.pop(author_id, None)
+        self.pending_meta.pop(author_id, None)
+        self.pending_tasks.pop(author_id, None)
+        self.batch_first_ts.pop(author_id, None)
+        self.batch_last_ts.pop(author_id, None)
+        self.fragment_hold_until.pop(author_id, None)
+
+    async def resume_pending(self):
+        """
+        Reagenda batches restaurados (sem task). Precisa da última mensagem de
+        cada autor (canal / reply / leitura): busca pela API; se sumiu ou o
+        batch ficou velho demais durante o restart, descarta.
+        """
+        now = time.time()
+        for a in list(self.pending_buffers):
+            task = self.pending_tasks.get(a)
+            if task and not task.done():
+                continue
+
+            meta = self.pending_meta.get(a, {})
+            if (now - self.batch_last_ts.get(a, 0.0)) > self.max_wait_hard:
+                self._drop_batch(a)
+                continue
+
+            ch_id = int(meta.get("channel_id", 0) or 0)
+            msg_id = int(meta.get("last_message_id", 0) or 0)
+            channel = self.bot.get_channel(ch_id) if ch_id else None
+            if not isinstance(channel, discord.TextChannel) or not msg_id:
+                self._drop_batch(a)
+                continue
+            try:
+                message = await channel.fetch_message(msg_id)
+            except Exception:
+                self._drop_batch(a)
+                continue
+
+            self._schedule_batch(message, a, ch_id, self.base_window)
+
+    def shutdown(self):
+        # cancela batches em voo (o snapshot já guardou o texto deles)
+        for task in list(self.pending_tasks.values()):
+            if task and not task.done():
+                task.cancel()
+        self.pending_tasks.clear()
+
     # -------- vibe (seguir deixa às vezes) --------
 
     def _should_follow_vibe(self, author_id: int) -> bool:
@@ -912,293 +1088,295 @@ class ChatCore:
         if elapsed >= self.max_wait_soft:
             window = 0.8
 
-        async def delayed(delay: float):
-            start_sleep = time.time()
-            await asyncio.sleep(delay)
+        self._schedule_batch(message, author_id, channel_id, window)
 
-            # espera silêncio real: mensagem + typing + hold fragmento
-            while True:
-                now2 = time.time()
-                batch_age = now2 - self.batch_first_ts.get(author_id, now2)
-                hard_hit = batch_age >= self.max_wait_hard
+    def _schedule_batch(self, message: discord.Message, author_id: int, channel_id: int, delay: float):
+        self._schedule(author_id, delay, lambda d: self._run_batch(message, author_id, channel_id, d))
 
-                last_msg_ts = self.batch_last_ts.get(author_id, now2)
-                last_typing_ts = self._last_typing_ts(author_id, channel_id)
-                last_activity = max(last_msg_ts, last_typing_ts or 0.0)
-                quiet_for = now2 - last_activity
+    async def _run_batch(self, message: discord.Message, author_id: int, channel_id: int, delay: float):
+        # fecha o batch do autor; `message` é a última mensagem dele (canal / reply / leitura)
+        start_sleep = time.time()
+        await asyncio.sleep(delay)
 
-                if quiet_for < self.base_window and not hard_hit:
-                    await asyncio.sleep(0.6)
-                    continue
+        # espera silêncio real: mensagem + typing + hold fragmento
+        while True:
+            now2 = time.time()
+            batch_age = now2 - self.batch_first_ts.get(author_id, now2)
+            hard_hit = batch_age >= self.max_wait_hard
 
-                if last_typing_ts and (now2 - last_typing_ts) <= self.typing_grace and not hard_hit:
-                    await asyncio.sleep(0.6)
-                    continue
+            last_msg_ts = self.batch_last_ts.get(author_id, now2)
+            last_typing_ts = self._last_typing_ts(author_id, channel_id)
+            last_activity = max(last_msg_ts, last_typing_ts or 0.0)
+            quiet_for = now2 - last_activity
 
-                hold_until2 = self.fragment_hold_until.get(author_id, 0.0)
-                if (now2 < hold_until2) and not hard_hit:
-                    await asyncio.sleep(0.6)
-                    continue
+            if quiet_for < self.base_window and not hard_hit:
+                await asyncio.sleep(0.6)
+                continue
 
-                break
+            if last_typing_ts and (now2 - last_typing_ts) <= self.typing_grace and not hard_hit:
+                await asyncio.sleep(0.6)
+                continue
 
-            if author_id not in self.pending_buffers:
-                return
+            hold_until2 = self.fragment_hold_until.get(author_id, 0.0)
+            if (now2 < hold_until2) and not hard_hit:
+                await asyncio.sleep(0.6)
+                continue
 
-            msgs = self.pending_buffers.get(author_id, [])
-            meta2 = self.pending_meta.get(author_id, {})
-            now3 = time.time()
-            batch_age = now3 - self.batch_first_ts.get(author_id, now3)
-            hard_hit = batch_age >= self.max_wait_hard
+            break
+
+        if author_id not in self.pending_buffers:
+            return
 
-            raw_full = " ".join([m for m in msgs if m and m.strip()]).strip()
-            clean_full = strip_mentions(raw_full)
-            frag_batch = looks_like_fragment_clean(clean_full)
+        msgs = self.pending_buffers.get(author_id, [])
+        meta2 = self.pending_meta.get(author_id, {})
+        now3 = time.time()
+        batch_age = now3 - self.batch_first_ts.get(author_id, now3)
+        hard_hit = batch_age >= self.max_wait_hard
 
-            # tentativa de atribuir/atualizar tópico pelo texto final do batch
-            self._topic_cleanup()
-            self._topic_assign(author_id, clean_full)
+        raw_full = " ".join([m for m in msgs if m and m.strip()]).strip()
+        clean_full = strip_mentions(raw_full)
+        frag_batch = looks_like_fragment_clean(clean_full)
 
-            if is_greeting_clean(clean_full):
-                frag_batch = False
-                decision = Decision("RESPOND", "greeting")
+        # tentativa de atribuir/atualizar tópico pelo texto final do batch
+        self._topic_cleanup()
+        self._topic_assign(author_id, clean_full)
+
+        if is_greeting_clean(clean_full):
+            frag_batch = False
+            decision = Decision("RESPOND", "greeting")
+        else:
+            decision = self.decision.decide(
+                content=raw_full,
+                direct=bool(meta2.get("direct_seen", False)),
+                policy_should_respond=True,
+                social_allowed=True,
+                conv_allowed=True,
+                max_wait_hit=hard_hit,
+            )
+
+            if self.block is not None and decision.action == "IGNORE" and decision.reason == "not_complete":
+                try:
+                    batch = BlockBatch(text_clean=clean_full, direct=bool(meta2.get("direct_seen", False)))
+                    bd = await self.block.classify(batch)
+                    if bd.outcome == "ENGAGED":
+                        decision = Decision("RESPOND", f"block:{bd.reason}")
+                    elif bd.outcome == "DEAD":
+                        decision = Decision("IGNORE", f"dead:{bd.reason}")
+                    else:
+                        decision = Decision("IGNORE", f"block_ignore:{bd.reason}")
+                except Exception:
+                    pass
+
+        # anti-loop WAIT
+        if decision.action == "WAIT":
+            loops = int(meta2.get("wait_loops", 0) or 0) + 1
+            meta2["wait_loops"] = loops
+            self.pending_meta[author_id] = meta2
+
+            if (loops >= 6) or (batch_age >= (self.max_wait_soft + 2.0)):
+                decision = Decision("RESPOND", "wait_cutoff")
             else:
-                decision = self.decision.decide(
-                    content=raw_full,
+                self._log_line(
+                    author_id=author_id,
                     direct=bool(meta2.get("direct_seen", False)),
-                    policy_should_respond=True,
-                    social_allowed=True,
-                    conv_allowed=True,
-                    max_wait_hit=hard_hit,
+                    social_reason=str(meta2.get("social_reason", "unknown")),
+                    state_reason=str(meta2.get("state_reason", "unknown")),
+                    conv_reason=str(meta2.get("conv_reason", "unknown")),
+                    decision_action="WAIT",
+                    decision_reason=decision.reason,
+                    age=batch_age,
+                    waited=(time.time() - start_sleep),
+                    frag=frag_batch,
+                    content=clean_full if clean_full else raw_full,
                 )
+                if not hard_hit:
+                    self._schedule_batch(message, author_id, channel_id, 0.8)
+                return
 
-                if self.block is not None and decision.action == "IGNORE" and decision.reason == "not_complete":
-                    try:
-                        batch = BlockBatch(text_clean=clean_full, direct=bool(meta2.get("direct_seen", False)))
-                        bd = await self.block.classify(batch)
-                        if bd.outcome == "ENGAGED":
-                            decision = Decision("RESPOND", f"block:{bd.reason}")
-                        elif bd.outcome == "DEAD":
-                            decision = Decision("IGNORE", f"dead:{bd.reason}")
-                        else:
-                            decision = Decision("IGNORE", f"block_ignore:{bd.reason}")
-                    except Exception:
-                        pass
-
-            # anti-loop WAIT
-            if decision.action == "WAIT":
-                loops = int(meta2.get("wait_loops", 0) or 0) + 1
-                meta2["wait_loops"] = loops
-                self.pending_meta[author_id] = meta2
-
-                if (loops >= 6) or (batch_age >= (self.max_wait_soft + 2.0)):
-                    decision = Decision("RESPOND", "wait_cutoff")
-                else:
-                    self._log_line(
-                        author_id=author_id,
-                        direct=bool(meta2.get("direct_seen", False)),
-                        social_reason=str(meta2.get("social_reason", "unknown")),
-                        state_reason=str(meta2.get("state_reason", "unknown")),
-                        conv_reason=str(meta2.get("conv_reason", "unknown")),
-                        decision_action="WAIT",
-                        decision_reason=decision.reason,
-                        age=batch_age,
-                        waited=(time.time() - start_sleep),
-                        frag=frag_batch,
-                        content=clean_full if clean_full else raw_full,
-                    )
-                    if not hard_hit:
-                        self._schedule(author_id, 0.8, delayed)
-                    return
+        self._log_line(
+            author_id=author_id,
+            direct=bool(meta2.get("direct_seen", False)),
+            social_reason=str(meta2.get("social_reason", "unknown")),
+            state_reason=str(meta2.get("state_reason", "unknown")),
+            conv_reason=str(meta2.get("conv_reason", "unknown")),
+            decision_action=decision.action,
+            decision_reason=decision.reason,
+            age=batch_age,
+            waited=(time.time() - start_sleep),
+            frag=frag_batch,
+            content=clean_full if clean_full else raw_full,
+        )
 
-            self._log_line(
+        # limpa batch
+        self._drop_batch(author_id)
+
+        if decision.action != "RESPOND":
+            return
+
+        # fallbacks curtos
+        if decision.reason in ("fragment_timeout", "wait_cutoff"):
+            cf = (clean_full or "").strip()
+            if is_greeting_clean(cf):
+                fallback = random.choice(["e aí", "fala", "salve"])
+            else:
+                fallback = random.choice(["continua", "tá, e aí?", "fala direito"])
+
+            is_reply_to_bot2 = bool(meta2.get("is_reply_to_bot", False))
+            tgt2 = int(meta2.get("last_message_id", 0) or 0)
+            txt2 = self._address(
+                message.channel,
+                response=fallback,
                 author_id=author_id,
-                direct=bool(meta2.get("direct_seen", False)),
-                social_reason=str(meta2.get("social_reason", "unknown")),
-                state_reason=str(meta2.get("state_reason", "unknown")),
-                conv_reason=str(meta2.get("conv_reason", "unknown")),
-                decision_action=decision.action,
-                decision_reason=decision.reason,
-                age=batch_age,
-                waited=(time.time() - start_sleep),
-                frag=frag_batch,
-                content=clean_full if clean_full else raw_full,
+                target_message_id=tgt2,
+                is_reply_to_bot=is_reply_to_bot2,
+                batch_age=float(batch_age),
             )
+            await message.channel.send(txt2)
 
-            # limpa batch
-            self.pending_buffers.pop(author_id, None)
-            self.pending_meta.pop(author_id, None)
-            self.pending_tasks.pop(author_id, None)
-            self.batch_first_ts.pop(author_id, None)
-            self.batch_last_ts.pop(author_id, None)
-            self.fragment_hold_until.pop(author_id, None)
+            mem = self._get_self_memory(author_id)
+            mem.append(fallback)
+            self.self_memory_by_author[author_id] = mem[-self.self_memory_limit:]
+            try:
+                self.chanmem.add(time.time(), fallback)
+            except Exception:
+                pass
+            return
 
-            if decision.action != "RESPOND":
-                return
+        # ----------------- READ MODE (best-effort, NÃO SEQUESTRA CONVERSA) -----------------
+        if bool(meta2.get("wants_read", False)):
+            inline_txt = (meta2.get("read_inline_text") or "").strip()
+            if inline_txt:
+                buf_r = self._get_buffer(author_id)
+                buf_r.add_user_message(
+                    author_id=author_id,
+                    author_name=str(meta2.get("author_name", "user")),
+                    channel_id=channel_id,
+                    content=f"(Pedido de leitura) Texto: {sanitize(strip_mentions(inline_txt))}",
+                )
+
+                tone_hint = self._tone_hint_with_self_memory(
+                    "Você vai ler o texto enviado e responder sobre ele. Curto, direto. "
+                    "Se for zoeira, responde seco. Se for sério, responde sério."
+                )
 
-            # fallbacks curtos
-            if decision.reason in ("fragment_timeout", "wait_cutoff"):
-                cf = (clean_full or "").strip()
-                if is_greeting_clean(cf):
-                    fallback = random.choice(["e aí", "fala", "salve"])
-                else:
-                    fallback = random.choice(["continua", "tá, e aí?", "fala direito"])
-
-                is_reply_to_bot2 = bool(meta2.get("is_reply_to_bot", False))
-                tgt2 = int(meta2.get("last_message_id", 0) or 0)
-                txt2 = self._address(
+                await self._reply(
                     message.channel,
-                    response=fallback,
                     author_id=author_id,
-                    target_message_id=tgt2,
-                    is_reply_to_bot=is_reply_to_bot2,
+                    target_message_id=int(meta2.get("last_message_id", 0) or 0),
+                    is_reply_to_bot=bool(meta2.get("is_reply_to_bot", False)),
                     batch_age=float(batch_age),
+                    tone_hint=tone_hint,
+                    topic_authors=None,
                 )
-                await message.channel.send(txt2)
-
-                mem = self._get_self_memory(author_id)
-                mem.append(fallback)
-                self.self_memory_by_author[author_id] = mem[-self.self_memory_limit:]
-                try:
-                    self.chanmem.add(time.time(), fallback)
-                except Exception:
-                    pass
                 return
 
-            # ----------------- READ MODE (best-effort, NÃO SEQUESTRA CONVERSA) -----------------
-            if bool(meta2.get("wants_read", False)):
-                inline_txt = (meta2.get("read_inline_text") or "").strip()
-                if inline_txt:
-                    buf_r = self._get_buffer(author_id)
-                    buf_r.add_user_message(
-                        author_id=author_id,
-                        author_name=str(meta2.get("author_name", "user")),
-                        content=f"(Pedido de leitura) Texto: {sanitize(strip_mentions(inline_txt))}",
-                    )
-
-                    tone_hint = self._tone_hint_with_self_memory(
-                        "Você vai ler o texto enviado e responder sobre ele. Curto, direto. "
-                        "Se for zoeira, responde seco. Se for sério, responde sério."
-                    )
-
-                    await self._reply(
-                        message.channel,
-                        author_id=author_id,
-                        target_message_id=int(meta2.get("last_message_id", 0) or 0),
-                        is_reply_to_bot=bool(meta2.get("is_reply_to_bot", False)),
-                        batch_age=float(batch_age),
-                        tone_hint=tone_hint,
-                        topic_authors=None,
-                    )
-                    return
-
-                refmsg = self._resolved_reference_message(message)
-                if refmsg and isinstance(refmsg, discord.Message):
-                    ref_txt = sanitize(strip_mentions(getattr(refmsg, "content", "") or ""))
-                    ref_author = getattr(getattr(refmsg, "author", None), "display_name", "alguém")
-
-                    buf_r = self._get_buffer(author_id)
-                    buf_r.add_user_message(
-                        author_id=author_id,
-                        author_name=str(meta2.get("author_name", "user")),
-                        content=f"(Pedido de leitura) {ref_author}: {ref_txt}",
-                    )
-
-                    tone_hint = self._tone_hint_with_self_memory(
-                        "Você vai ler a mensagem citada e responder sobre ela. Curto, direto. "
-                        "Se for fofoca/zoeira, pode responder seco. Se for sério, responde sério."
-                    )
-
-                    await self._reply(
-                        message.channel,
-                        author_id=author_id,
-                        target_message_id=int(meta2.get("last_message_id", 0) or 0),
-                        is_reply_to_bot=bool(meta2.get("is_reply_to_bot", False)),
-                        batch_age=float(batch_age),
-                        tone_hint=tone_hint,
-                        topic_authors=None,
-                    )
-                    return
+            refmsg = self._resolved_reference_message(message)
+            if refmsg and isinstance(refmsg, discord.Message):
+                ref_txt = sanitize(strip_mentions(getattr(refmsg, "content", "") or ""))
+                ref_author = getattr(getattr(refmsg, "author", None), "display_name", "alguém")
 
-                try:
-                    await message.channel.send("Faz reply na mensagem que você quer que eu leia.")
-                except Exception:
-                    pass
-                return
+                buf_r = self._get_buffer(author_id)
+                buf_r.add_user_message(
+                    author_id=author_id,
+                    author_name=str(meta2.get("author_name", "user")),
+                    channel_id=channel_id,
+                    content=f"(Pedido de leitura) {ref_author}: {ref_txt}",
+                )
 
-            # decide secondary/spontaneous/primary
-            d2 = self.interject.decide(
-                author_id=author_id,
-                text=clean_full,
-                now=now3,
-                direct=True,
-                conversation_engaged=bool(meta2.get("conv_engaged_before", False)),
-                active_author=meta2.get("conv_active_before", None),
-            )
+                tone_hint = self._tone_hint_with_self_memory(
+                    "Você vai ler a mensagem citada e responder sobre ela. Curto, direto. "
+                    "Se for fofoca/zoeira, pode responder seco. Se for sério, responde sério."
+                )
 
-            if d2.allow and d2.mode in ("secondary", "spontaneous"):
-                await self._send_interjection(
+                await self._reply(
                     message.channel,
                     author_id=author_id,
-                    author_name=str(meta2.get("author_name", "user")),
-                    content=clean_full,
                     target_message_id=int(meta2.get("last_message_id", 0) or 0),
-                    mode=d2.mode,
                     is_reply_to_bot=bool(meta2.get("is_reply_to_bot", False)),
                     batch_age=float(batch_age),
+                    tone_hint=tone_hint,
+                    topic_authors=None,
                 )
-                try:
-                    self.interject.mark_used(author_id, mode=d2.mode)
-                except Exception:
-                    pass
                 return
 
-            # ----------------- primary normal (com merge de assunto) -----------------
+            try:
+                await message.channel.send("Faz reply na mensagem que você quer que eu leia.")
+            except Exception:
+                pass
+            return
+
+        # decide secondary/spontaneous/primary
+        d2 = self.interject.decide(
+            author_id=author_id,
+            text=clean_full,
+            now=now3,
+            direct=True,
+            conversation_engaged=bool(meta2.get("conv_engaged_before", False)),
+            active_author=meta2.get("conv_active_before", None),
+        )
 
-            buf = self._get_buffer(author_id)
-            buf.add_user_message(
+        if d2.allow and d2.mode in ("secondary", "spontaneous"):
+            await self._send_interjection(
+                message.channel,
                 author_id=author_id,
                 author_name=str(meta2.get("author_name", "user")),
-                content=clean_full if clean_full else raw_full,
+                content=clean_full,
+                target_message_id=int(meta2.get("last_message_id", 0) or 0),
+                mode=d2.mode,
+                is_reply_to_bot=bool(meta2.get("is_reply_to_bot", False)),
+                batch_age=float(batch_age),
             )
-
-            soft_exit_hint = None
             try:
-                st_now2 = getattr(self._get_conv(author_id), "state", None)
-                if st_now2 == ConversationState.EXITING_SOFT:
-                    soft_exit_hint = (
-                        "Se for encerrar, encerra normal: 1 frase curta com desculpa leve "
-                        "(trampo/afazeres/tenho que ir). Sem ficar fofo e sem parecer IA."
-                    )
+                self.interject.mark_used(author_id, mode=d2.mode)
             except Exception:
-                soft_exit_hint = None
+                pass
+            return
+
+        # ----------------- primary normal (com merge de assunto) -----------------
+
+        buf = self._get_buffer(author_id)
+        buf.add_user_message(
+            author_id=author_id,
+            author_name=str(meta2.get("author_name", "user")),
+            channel_id=channel_id,
+            content=clean_full if clean_full else raw_full,
+        )
 
-            vibe_hint = None
-            if self._should_follow_vibe(author_id):
-                vibe_hint = (
-                    "Se o usuário puxou zoeira/sarcasmo/analítico, você pode acompanhar um pouco. "
-                    "Mas NÃO vire padrão: 1 resposta no máximo nessa vibe e volta ao normal depois."
+        soft_exit_hint = None
+        try:
+            st_now2 = getattr(self._get_conv(author_id), "state", None)
+            if st_now2 == ConversationState.EXITING_SOFT:
+                soft_exit_hint = (
+                    "Se for encerrar, encerra normal: 1 frase curta com desculpa leve "
+                    "(trampo/afazeres/tenho que ir). Sem ficar fofo e sem parecer IA."
                 )
+        except Exception:
+            soft_exit_hint = None
 
-            tone_hint = self._tone_hint_with_self_memory(
-                "\n".join([x for x in [soft_exit_hint, vibe_hint] if x])
+        vibe_hint = None
+        if self._should_follow_vibe(author_id):
+            vibe_hint = (
+                "Se o usuário puxou zoeira/sarcasmo/analítico, você pode acompanhar um pouco. "
+                "Mas NÃO vire padrão: 1 resposta no máximo nessa vibe e volta ao normal depois."
             )
 
-            topic_authors = self._topic_authors_for(author_id)
-            if len(topic_authors) <= 1:
-                topic_authors = None
+        tone_hint = self._tone_hint_with_self_memory(
+            "\n".join([x for x in [soft_exit_hint, vibe_hint] if x])
+        )
 
-            await self._reply(
-                message.channel,
-                author_id=author_id,
-                target_message_id=int(meta2.get("last_message_id", 0) or 0),
-                is_reply_to_bot=bool(meta2.get("is_reply_to_bot", False)),
-                batch_age=float(batch_age),
-                tone_hint=tone_hint,
-                topic_authors=topic_authors,
-            )
+        topic_authors = self._topic_authors_for(author_id)
+        if len(topic_authors) <= 1:
+            topic_authors = None
 
-        self._schedule(author_id, window, delayed)
+        await self._reply(
+            message.channel,
+            author_id=author_id,
+            target_message_id=int(meta2.get("last_message_id", 0) or 0),
+            is_reply_to_bot=bool(meta2.get("is_reply_to_bot", False)),
+            batch_age=float(batch_age),
+            tone_hint=tone_hint,
+            topic_authors=topic_authors,
+        )
 
     # ----------------- interjection -----------------
 
@@ -1332,6 +1510,11 @@ class ChatCore:
         if not entries:
             return
 
+        if not topic_authors or len(topic_authors) <= 1:
+            older_hint = await self._older_context_hint(buf, channel.id)
+            if older_hint:
+                tone_hint = ((tone_hint or "").strip() + "\n\n" + older_hint).strip()
+
         try:
             response = await self.engine.generate_response(entries, tone_hint=tone_hint)
         except TypeError:
@@ -1358,7 +1541,7 @@ class ChatCore:
         await channel.send(msg)
 
         try:
-            self._get_buffer(a).add_assistant_message(response)
+            self._get_buffer(a).add_assistant_message(response, channel_id=channel.id)
         except Exception:
             pass
 
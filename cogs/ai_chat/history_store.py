@@ -0,0 +1,204 @@
+# cogs/ai_chat/history_store.py
+"""
+Histórico durável das conversas do Override (SQLite em data/ai_chat_history.db).
+
+O MessageBuffer continua sendo a janela curta em RAM (per_author_buffer_limit);
+cada mensagem que entra nele também vem pra cá:
+  - append() é síncrono e barato: só enfileira
+  - um writer em background grava em lote (FLUSH_BATCH linhas ou FLUSH_EVERY s)
+  - load() lê mensagens mais antigas que a janela, indexado por
+    (channel_id, author_id, ts); só é chamado quando o prompt precisa de contexto
+  - linhas mais velhas que RETENTION_SEC são apagadas de tempos em tempos
+
+author_id é o dono da conversa (o buffer), não quem falou: respostas do
+Override ficam na conversa de quem ele respondeu.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+log = logging.getLogger("ai_chat.history")
+
+HISTORY_DB = "data/ai_chat_history.db"
+
+FLUSH_EVERY = 2.0
+FLUSH_BATCH = 64
+MAX_PENDING = 5000               # se o disco falhar, não cresce sem limite
+RETENTION_SEC = 30 * 24 * 3600
+PRUNE_EVERY = 3600.0
+
+_Row = Tuple[int, int, float, str, str, str]
+
+
+class HistoryStore:
+    def __init__(self, path: str = HISTORY_DB) -> None:
+        self.path = path
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()      # writer e load rodam em threads diferentes
+        self._pending: List[_Row] = []
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._writes: Set[asyncio.Future] = set()   # escritas em thread ainda rodando
+        self._closed = False
+        self._last_prune = 0.0
+        self.written = 0
+
+    # ---------- API ----------
+    def append(self, channel_id: int, author_id: int, msg: Dict[str, Any]) -> None:
+        if self._closed:
+            return
+        self._pending.append((
+            int(channel_id),
+            int(author_id),
+            float(msg.get("ts") or time.time()),
+            str(msg.get("role", "user")),
+            str(msg.get("author_name", "")),
+            str(msg.get("content", "")),
+        ))
+        if len(self._pending) > MAX_PENDING:
+            del self._pending[0:len(self._pending) - MAX_PENDING]
+        self._ensure_writer()
+        if self._wake and len(self._pending) >= FLUSH_BATCH:
+            self._wake.set()
+
+    async def load(
+        self,
+        channel_id: int,
+        author_id: int,
+        *,
+        before_ts: float,
+        limit: int,
+        since_ts: float = 0.0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Até `limit` mensagens com since_ts <= ts < before_ts, da mais velha pra mais nova.
+        """
+        await self.flush()
+        try:
+            rows = await asyncio.to_thread(
+                self._disk_load, int(channel_id), int(author_id), float(before_ts), float(since_ts), int(limit)
+            )
+        except Exception as e:
+            log.warning(f"[AI_HISTORY] leitura falhou: {e}")
+            return []
+        return [
+            {"role": role, "content": content, "author_id": int(author_id), "author_name": name, "ts": ts}
+            for ts, role, name, content in reversed(rows)
+        ]
+
+    async def flush(self) -> None:
+        rows, self._pending = self._pending, []
+        if not rows:
+            return
+        # a escrita continua na thread mesmo se quem chamou for cancelado:
+        # guarda o future pro close() esperar antes de fechar a conexão
+        write = asyncio.ensure_future(asyncio.to_thread(self._disk_write, rows))
+        self._writes.add(write)
+        write.add_done_callback(self._writes.discard)
+        try:
+            await asyncio.shield(write)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.warning(f"[AI_HISTORY] escrita falhou ({len(rows)} linhas): {e}")
+            # devolve pra fila; tenta de novo no próximo flush
+            self._pending[0:0] = rows[-MAX_PENDING:]
+
+    async def close(self) -> None:
+        """
+        Para o writer (no loop), espera escritas em voo e só então grava o
+        resto e fecha a conexão (em thread). Depois disso append() ignora.
+        """
+        self._closed = True
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+        rows, self._pending = self._pending, []
+        await asyncio.to_thread(self._final_write, rows)
+
+    def _final_write(self, rows: List[_Row]) -> None:
+        try:
+            if rows:
+                self._disk_write(rows)
+        except Exception as e:
+            log.warning(f"[AI_HISTORY] escrita final falhou ({len(rows)} linhas): {e}")
+        with self._db_lock:
+            if self._db is not None:
+                try:
+                    self._db.close()
+                except Exception:
+                    pass
+                self._db = None
+
+    # ---------- writer ----------
+    def _ensure_writer(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return  # sem loop: fica pendente até flush()/close()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._writer())
+
+    async def _writer(self) -> None:
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=FLUSH_EVERY)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                await self.flush()
+        except asyncio.CancelledError:
+            return
+
+    # ---------- disco ----------
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS messages ("
+                " id INTEGER PRIMARY KEY, channel_id INTEGER NOT NULL, author_id INTEGER NOT NULL,"
+                " ts REAL NOT NULL, role TEXT NOT NULL, author_name TEXT, content TEXT NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS messages_conv ON messages(channel_id, author_id, ts)")
+            db.execute("CREATE INDEX IF NOT EXISTS messages_ts ON messages(ts)")
+            self._db = db
+        return self._db
+
+    def _disk_write(self, rows: List[_Row]) -> None:
+        with self._db_lock:
+            db = self._conn()
+            db.executemany(
+                "INSERT INTO messages(channel_id, author_id, ts, role, author_name, content) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            now = time.time()
+            if now - self._last_prune >= PRUNE_EVERY:
+                self._last_prune = now
+                db.execute("DELETE FROM messages WHERE ts < ?", (now - RETENTION_SEC,))
+            db.commit()
+            self.written += len(rows)
+
+    def _disk_load(self, channel_id: int, author_id: int, before_ts: float, since_ts: float, limit: int):
+        with self._db_lock:
+            return self._conn().execute(
+                "SELECT ts, role, author_name, content FROM messages"
+                " WHERE channel_id=? AND author_id=? AND ts<? AND ts>=?"
+                " ORDER BY ts DESC LIMIT ?",
+                (channel_id, author_id, before_ts, since_ts, limit),
+            ).fetchall()
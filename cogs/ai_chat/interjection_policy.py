@@ -2,7 +2,7 @@
 import random
 import time
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Dict, Optional
 
 
 @dataclass
@@ -63,6 +63,26 @@ class InterjectionPolicy:
 
         return False
 
+    # -------- snapshot (reload/restart) --------
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "secondary": {str(a): dict(st) for a, st in self._secondary.items()},
+            "last_secondary_by_author": {str(a): t for a, t in self._last_secondary_by_author.items()},
+            "last_spontaneous_ts": self._last_spontaneous_ts,
+            "last_spontaneous_by_author": {str(a): t for a, t in self._last_spontaneous_by_author.items()},
+        }
+
+    def restore(self, data: Dict[str, Any]):
+        self._secondary = {
+            int(a): {"until": float(st.get("until", 0.0) or 0.0), "turns": int(st.get("turns", 0) or 0)}
+            for a, st in (data.get("secondary") or {}).items()
+            if isinstance(st, dict)
+        }
+        self._last_secondary_by_author = {int(a): float(t) for a, t in (data.get("last_secondary_by_author") or {}).items()}
+        self._last_spontaneous_ts = float(data.get("last_spontaneous_ts", 0.0) or 0.0)
+        self._last_spontaneous_by_author = {int(a): float(t) for a, t in (data.get("last_spontaneous_by_author") or {}).items()}
+
     def mark_used(self, author_id: int, *, mode: str):
         a = int(author_id)
         now = self._now()
@@ -13,25 +13,43 @@ class MessageBuffer:
     - montar prompt com nomes
     - debug básico (timestamps)
 
+    Com `store` (HistoryStore), a lista aqui é só a janela recente: toda
+    mensagem também vai pro disco e older() busca o que ficou pra trás.
+
     Formato de cada item:
       {
         "role": "user" | "assistant",
         "content": str,
         "author_id": int,              # sempre presente (0 = unknown)
         "author_name": str,            # sempre presente
-        "ts": float
+        "ts": float,
+        "channel_id": int              # canal onde a mensagem foi dita
       }
+
+    Um autor pode falar em mais de um canal: o canal vai em cada mensagem
+    (e é com ele que vai pro disco); self.channel_id é só o padrão pra quem
+    não informa.
     """
 
-    def __init__(self, max_messages: int = 8):
+    def __init__(self, max_messages: int = 8, *, store=None, channel_id: int = 0, owner_id: int = 0):
         self.max_messages = int(max_messages)
         self.messages: List[Dict[str, Any]] = []
 
+        # histórico em disco (opcional); owner_id = dono da conversa
+        self.store = store
+        self.channel_id = int(channel_id)
+        self.owner_id = int(owner_id)
+
+    def _channel(self, channel_id: Optional[int]) -> int:
+        return int(channel_id) if channel_id else self.channel_id
+
     def _push(self, msg: Dict[str, Any]):
         self.messages.append(msg)
         overflow = len(self.messages) - self.max_messages
         if overflow > 0:
             del self.messages[0:overflow]
+        if self.store is not None:
+            self.store.append(msg["channel_id"], self.owner_id, msg)
 
     def add_user_message(
         self,
@@ -40,6 +58,7 @@ class MessageBuffer:
         author_id: Optional[int] = None,
         author_name: Optional[str] = None,
         ts: Optional[float] = None,
+        channel_id: Optional[int] = None,
     ):
         """Compatível com:
         - add_user_message("texto")
@@ -60,9 +79,10 @@ class MessageBuffer:
             "author_id": int(author_id),
             "author_name": str(author_name),
             "ts": float(ts) if ts is not None else time.time(),
+            "channel_id": self._channel(channel_id),
         })
 
-    def add_assistant_message(self, content: str, ts: Optional[float] = None):
+    def add_assistant_message(self, content: str, ts: Optional[float] = None, *, channel_id: Optional[int] = None):
         if not str(content).strip():
             return  # evita entupir buffer com vazio
 
@@ -72,10 +92,51 @@ class MessageBuffer:
             "author_id": 0,
             "author_name": "Override",
             "ts": float(ts) if ts is not None else time.time(),
+            "channel_id": self._channel(channel_id),
         })
 
-    def get_messages(self) -> List[Dict[str, Any]]:
-        return list(self.messages)
+    def get_messages(self, channel_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Janela recente; com channel_id, só o que foi dito naquele canal."""
+        if not channel_id:
+            return list(self.messages)
+        return [m for m in self.messages if m.get("channel_id") == int(channel_id)]
+
+    async def older(self, limit: int, *, max_age: float, channel_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Mensagens do canal anteriores à janela (do disco, sob demanda). Sem store: []."""
+        if self.store is None or limit <= 0:
+            return []
+        ch = self._channel(channel_id)
+        window = self.get_messages(ch)
+        now = time.time()
+        before = float(window[0].get("ts", now)) if window else now
+        return await self.store.load(
+            ch,
+            self.owner_id,
+            before_ts=before,
+            limit=int(limit),
+            since_ts=now - float(max_age),
+        )
 
     def clear(self):
-        self.messages.clear()
\ No newline at end of file
+        self.messages.clear()
+
+    # -------- snapshot (reload/restart) --------
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"channel_id": self.channel_id, "messages": [dict(m) for m in self.messages]}
+
+    def restore(self, data: Dict[str, Any]):
+        self.channel_id = int(data.get("channel_id", self.channel_id) or self.channel_id)
+        self.messages = [
+            {
+                "role": str(m.get("role", "user")),
+                "content": str(m.get("content", "")),
+                "author_id": int(m.get("author_id", 0) or 0),
+                "author_name": str(m.get("author_name", "unknown")),
+                "ts": float(m.get("ts", 0.0) or 0.0),
+                # snapshots antigos não tinham canal por mensagem
+                "channel_id": int(m.get("channel_id", 0) or self.channel_id),
+            }
+            for m in (data.get("messages") or [])
+            if isinstance(m, dict) and str(m.get("content", "")).strip()
+        ][-self.max_messages:]
\ No newline at end of file
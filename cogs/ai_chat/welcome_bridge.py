@@ -6,7 +6,8 @@ Objetivos (acordados):
 - NÃO virar autor principal
 - NÃO quebrar cooldown
 - NÃO interferir no ConversationManager
-- Agregar múltiplas entradas (join spam)
+- Agregar múltiplas entradas (join spam) -> feito pelo join_pipeline (1 batch por janela)
+- Raid (batch.raid): não fala nada
 - Delay humano e levemente aleatório
 - Aparição rara, seca, sem educação automática
 
@@ -14,17 +15,31 @@ Agora:
 - Sempre fala NO CHANNEL_MAIN (e em mais nenhum)
 - Pode usar Gemini (via AIEngine) para variar o texto
 - Pode desligar por .env
+
+Pool de frases:
+- O join NUNCA espera o provider: a frase sai de um pool de templates prontos
+  ("{u} chegou...", "{a} e {b}..."), com as mentions entrando no format()
+- Um loop em background gera templates novos com a IA só quando o bot está
+  ocioso (sem join recente) e o pool está abaixo da meta
+- Template só entra no pool se passar na validação (placeholders certos, 1 linha,
+  sem pergunta, sem @ cru, cabe no limite)
+- Pool persiste em data/welcome_pool.json (sobrevive a restart)
+- Pool vazio -> _static_variations (como antes)
 """
 
 import asyncio
+import json
 import os
 import random
 import re
+import string
 import time
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import discord
 
+from join_pipeline import JoinBatch
+
 # Canal principal (regra: o ai_chat do Override só fala no channel_main)
 try:
     from utils import CHANNEL_MAIN as _CHANNEL_MAIN
@@ -49,6 +64,64 @@ def _one_line(text: str) -> str:
     return t
 
 
+POOL_PATH = "data/welcome_pool.json"
+
+# placeholders por tamanho do grupo (mesmos nomes do _static_variations)
+_BUCKET_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "1": ("u",),
+    "2": ("a", "b"),
+    "3": ("a", "b", "c"),
+    "many": ("a", "b", "n"),
+}
+# meta de templates guardados por bucket (1 pessoa é o caso comum)
+POOL_TARGET: Dict[str, int] = {"1": 16, "2": 8, "3": 6, "many": 6}
+
+REFILL_START_DELAY = 60.0     # espera o boot assentar antes de gastar provider
+REFILL_IDLE_AFTER = 120.0     # só gera se não teve join nesse tempo
+REFILL_SPACING = 20.0         # entre uma geração e outra
+REFILL_CHECK = 30.0           # pool cheio / não ocioso: checa de novo depois
+REFILL_MAX_BACKOFF = 30 * 60.0
+
+_MENTION_LEN = 22             # "<@" + snowflake + ">" (estimativa pro limite)
+
+
+def _bucket_for(count: int) -> str:
+    if count <= 1:
+        return "1"
+    if count == 2:
+        return "2"
+    if count == 3:
+        return "3"
+    return "many"
+
+
+def _validate_template(text: str, bucket: str, max_chars: int) -> Optional[str]:
+    """
+    Template gerado pela IA -> versão limpa, ou None se não serve.
+    Exige exatamente os placeholders do bucket (cada um uma vez, sem
+    format_spec/conversão tipo {u:>200} ou {u!r}) e nada de mention crua / pergunta.
+    """
+    t = _one_line(text).strip(" \"'`")
+    if not t or "?" in t or "@" in t or "<" in t or "http" in t.lower():
+        return None
+
+    try:
+        parsed = [(f, spec, conv) for _, f, spec, conv in string.Formatter().parse(t) if f is not None]
+    except ValueError:
+        return None
+    if any(spec or conv for _, spec, conv in parsed):
+        return None
+    fields = [f for f, _, _ in parsed]
+    if sorted(fields) != sorted(_BUCKET_FIELDS[bucket]):
+        return None
+
+    # {n} vira número, o resto vira mention
+    mentions = sum(1 for f in fields if f != "n")
+    if len(t) + mentions * _MENTION_LEN > max_chars:
+        return None
+    return t
+
+
 def _clip(text: str, max_chars: int) -> str:
     t = _one_line(text)
     if not t:
@@ -65,11 +138,9 @@ class WelcomeBridge:
         # delays humanos
         min_delay: float = 6.0,
         max_delay: float = 14.0,
-        aggregate_window: float = 18.0,
 
-        # travas
+        # travas (cooldown por usuário é o REJOIN_COOLDOWN do join_pipeline)
         global_cooldown: float = 180.0,
-        per_user_cooldown: float = 600.0,
         chance: float = 0.45,
 
         # IA / controle
@@ -88,20 +159,19 @@ class WelcomeBridge:
         self.min_delay = float(min_delay)
         self.max_delay = float(max_delay)
 
-        # agrega joins próximos
-        self.aggregate_window = float(aggregate_window)
-
         # travas
         self.global_cooldown = float(global_cooldown)
-        self.per_user_cooldown = float(per_user_cooldown)
         self.chance = float(chance)
 
         # estado interno
-        self._pending: Dict[int, List[discord.Member]] = {}
-        self._pending_tasks: Dict[int, asyncio.Task] = {}
-
         self._last_global_ts: float = 0.0
-        self._last_by_user: Dict[int, float] = {}
+        self._speaking = False
+
+        # pool de templates (bucket -> [template, ...])
+        self._pool: Dict[str, List[str]] = {b: [] for b in _BUCKET_FIELDS}
+        self._pool_loaded = False
+        self._last_join_ts: float = 0.0
+        self._refill_task: Optional[asyncio.Task] = None
 
         # engine (lazy)
         self._engine = None
@@ -113,31 +183,37 @@ class WelcomeBridge:
 
     # -------- API pública --------
 
-    def notify_join(self, member: discord.Member):
+    def start(self):
         """
-        Chamado pelo evento on_member_join
+        Carrega o pool do disco e sobe o loop de reabastecimento.
+        Precisa de loop rodando (main.py chama no setup_hook).
         """
-        if not self.enabled:
-            return
-        if not member or not member.guild:
+        self._load_pool()
+        if not (self.enabled and self.use_ai):
             return
-        if getattr(member, "bot", False):
+        if self._refill_task and not self._refill_task.done():
             return
+        self._refill_task = asyncio.create_task(self._refill_loop())
 
-        gid = int(member.guild.id)
-        self._pending.setdefault(gid, []).append(member)
+    def stop(self):
+        if self._refill_task:
+            self._refill_task.cancel()
+        self._refill_task = None
+        self._save_pool()
 
-        if gid not in self._pending_tasks:
-            self._pending_tasks[gid] = asyncio.create_task(self._flush_after(gid))
+    def pool_status(self) -> Dict[str, int]:
+        return {b: len(v) for b, v in self._pool.items()}
 
-    # -------- interno --------
-
-    async def _flush_after(self, guild_id: int):
-        await asyncio.sleep(self.aggregate_window)
+    async def on_join_batch(self, batch: JoinBatch):
+        """
+        Assinante do join_pipeline (main.py registra). Um batch = uma janela de joins.
+        """
+        self._last_join_ts = time.time()
+        if not self.enabled or batch.raid or self._speaking:
+            return
 
-        members = self._pending.pop(guild_id, [])
-        self._pending_tasks.pop(guild_id, None)
-        if not members:
+        final = batch.fresh
+        if not final:
             return
 
         now = time.time()
@@ -150,28 +226,25 @@ class WelcomeBridge:
         if random.random() > self.chance:
             return
 
-        # filtra quem já recebeu welcome recentemente
-        final: List[discord.Member] = []
-        for m in members:
-            last = float(self._last_by_user.get(int(m.id), 0.0) or 0.0)
-            if (now - last) >= self.per_user_cooldown:
-                final.append(m)
+        self._speaking = True
+        try:
+            await self._speak(batch.guild, final)
+        finally:
+            self._speaking = False
 
-        if not final:
-            return
+    # -------- interno --------
 
+    async def _speak(self, guild: discord.Guild, final: List[discord.Member]):
         # delay humano antes de falar
         await asyncio.sleep(random.uniform(self.min_delay, self.max_delay))
 
-        guild = final[0].guild
-
         # Canal: SOMENTE CHANNEL_MAIN
         channel = self._pick_channel_main_only(guild)
         if not channel:
             return
 
-        # monta mensagem
-        msg = await self._build_message(final)
+        # monta mensagem (pool pronto, sem chamar provider aqui)
+        msg = self._build_message(final)
 
         msg = _clip(msg, self.max_chars)
         if not msg:
@@ -185,10 +258,8 @@ class WelcomeBridge:
         except Exception:
             return
 
-        # atualiza cooldowns
+        # atualiza cooldown
         self._last_global_ts = time.time()
-        for m in final:
-            self._last_by_user[int(m.id)] = self._last_global_ts
 
     # -------- helpers --------
 
@@ -264,68 +335,149 @@ class WelcomeBridge:
 
         # Cria engine só para welcome (leve e barato)
         try:
-            self._engine = AIEngine(models=list(self._model_preference))
+            self._engine = AIEngine(primary_models=list(self._model_preference))
         except Exception:
             self._engine = None
 
-    async def _build_message(self, members: List[discord.Member]) -> str:
+    def _build_message(self, members: List[discord.Member]) -> str:
         mentions = [m.mention for m in members[:3]]
         if not mentions:
             return ""
 
-        # Sem IA -> fallback variado
-        if not self.use_ai:
-            return self._static_variations(mentions)
-
-        self._ensure_engine()
-        if not self._engine:
+        bucket = _bucket_for(len(members))
+        pool = self._pool.get(bucket) or []
+        if not pool:
             return self._static_variations(mentions)
 
-        # Prompt curto, mantendo a essência sem “puxar conversa”
-        # (1 linha, sem pergunta, seco, torto, menciona os caras)
-        if len(members) == 1:
-            target = f"O membro {mentions[0]} acabou de entrar."
-        elif len(members) == 2:
-            target = f"Os membros {mentions[0]} e {mentions[1]} acabaram de entrar."
-        elif len(members) == 3:
-            target = f"Os membros {mentions[0]}, {mentions[1]} e {mentions[2]} acabaram de entrar."
+        # tira do pool (não repete); o refill repõe depois
+        tpl = pool.pop(random.randrange(len(pool)))
+        self._save_pool()
+
+        if bucket == "1":
+            return tpl.format(u=mentions[0])
+        if bucket == "2":
+            return tpl.format(a=mentions[0], b=mentions[1])
+        if bucket == "3":
+            return tpl.format(a=mentions[0], b=mentions[1], c=mentions[2])
+        return tpl.format(a=mentions[0], b=mentions[1], n=(len(members) - 2))
+
+    # -------- pool / refill --------
+
+    def _next_bucket_to_fill(self) -> Optional[str]:
+        # o mais vazio em proporção à meta
+        best, best_ratio = None, 1.0
+        for b, target in POOL_TARGET.items():
+            ratio = len(self._pool[b]) / float(target)
+            if ratio < best_ratio:
+                best, best_ratio = b, ratio
+        return best
+
+    def _is_idle(self) -> bool:
+        if self._speaking:
+            return False
+        return (time.time() - self._last_join_ts) >= REFILL_IDLE_AFTER
+
+    def _template_prompt(self, bucket: str) -> str:
+        if bucket == "1":
+            ctx = "uma pessoa entrou. Use {u} no lugar da menção dela."
+        elif bucket == "2":
+            ctx = "duas pessoas entraram. Use {a} e {b} no lugar das menções."
+        elif bucket == "3":
+            ctx = "três pessoas entraram. Use {a}, {b} e {c} no lugar das menções."
         else:
-            target = f"Entrou um grupo: {mentions[0]}, {mentions[1]} e mais {len(members)-2}."
+            ctx = "um grupo entrou. Use {a} e {b} pras duas primeiras menções e {n} pro número de outros."
 
-        prompt = (
+        avoid = self._pool[bucket][-5:]
+        avoid_txt = "".join(f"- {t}\n" for t in avoid)
+
+        return (
             "Você é Override, um bot do Discord.\n"
-            "Tarefa: mandar UMA mensagem de boas-vindas curta e seca.\n"
+            "Tarefa: escrever UM modelo de mensagem de boas-vindas curta e seca.\n"
             "Regras:\n"
             "- 1 linha só (sem quebras)\n"
             "- sem perguntas\n"
             "- sem discurso bonitinho\n"
-            "- mencione exatamente os @ que eu citar\n"
+            "- escreva os marcadores entre chaves exatamente como pedido, cada um UMA vez\n"
+            "- nada de @ nem nomes inventados\n"
             "- tom: humano, preguiçoso, meio torto, às vezes levemente engraçado\n"
-            f"- limite: até {self.max_chars} caracteres\n"
+            f"- limite: até {self.max_chars - 3 * _MENTION_LEN} caracteres\n"
             "\n"
-            f"Contexto: {target}\n"
-            "Saída: apenas a mensagem final.\n"
+            f"Contexto: {ctx}\n"
+            + (f"Não repita estas:\n{avoid_txt}" if avoid_txt else "")
+            + "Saída: apenas o modelo.\n"
         )
 
+    async def _generate_template(self, bucket: str) -> Optional[str]:
         try:
             out = await self._engine.generate_raw_text(
-                prompt,
+                self._template_prompt(bucket),
                 max_output_tokens=90,
                 temperature=0.95,
             )
         except Exception:
-            return self._static_variations(mentions)
+            return None
 
-        msg = _one_line(out)
+        tpl = _validate_template(out, bucket, self.max_chars)
+        if not tpl:
+            return None
+        if tpl.lower() in {t.lower() for t in self._pool[bucket]}:
+            return None
+        return tpl
 
-        # “segurança” contra o modelo inventar pergunta ou quebrar regra
-        msg = msg.replace("?", "").strip()
-        if not msg:
-            return self._static_variations(mentions)
+    async def _refill_loop(self):
+        failures = 0
+        try:
+            await asyncio.sleep(REFILL_START_DELAY)
+            while True:
+                bucket = self._next_bucket_to_fill()
+                if bucket is None or not self._is_idle():
+                    await asyncio.sleep(REFILL_CHECK)
+                    continue
+
+                self._ensure_engine()
+                if not self._engine:
+                    return
+
+                tpl = await self._generate_template(bucket)
+                if tpl:
+                    failures = 0
+                    self._pool[bucket].append(tpl)
+                    self._save_pool()
+                    await asyncio.sleep(REFILL_SPACING)
+                else:
+                    # provider fora / saída ruim: espaça cada vez mais
+                    failures += 1
+                    await asyncio.sleep(min(REFILL_MAX_BACKOFF, REFILL_SPACING * (2 ** min(failures, 7))))
+        except asyncio.CancelledError:
+            return
 
-        # garante que pelo menos 1 mention apareceu
-        if mentions[0] not in msg:
-            # se o modelo “esqueceu”, injeta no começo
-            msg = f"{mentions[0]} {msg}".strip()
+    def _load_pool(self):
+        if self._pool_loaded:
+            return
+        try:
+            if os.path.isfile(POOL_PATH):
+                with open(POOL_PATH, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                for b, items in (data.get("pool") or {}).items():
+                    if b not in self._pool or not isinstance(items, list):
+                        continue
+                    # revalida: regra pode ter mudado desde que foi salvo
+                    ok = [t for t in (_validate_template(str(x), b, self.max_chars) for x in items) if t]
+                    self._pool[b] = ok[: POOL_TARGET[b]]
+        except Exception as e:
+            print(f"[WelcomeBridge] pool ilegível, começando vazio: {e}")
+            return
+        self._pool_loaded = True
 
-        return msg
\ No newline at end of file
+    def _save_pool(self):
+        if not self._pool_loaded:
+            # nunca leu o arquivo (ou estava ilegível): não sobrescreve
+            return
+        try:
+            os.makedirs(os.path.dirname(POOL_PATH), exist_ok=True)
+            tmp = POOL_PATH + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"pool": self._pool}, f, ensure_ascii=False)
+            os.replace(tmp, POOL_PATH)
+        except Exception as e:
+            print(f"[WelcomeBridge] falha salvando pool: {e}")
\ No newline at end of file
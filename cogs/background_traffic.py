@@ -2,11 +2,12 @@
 import os
 import asyncio
 import random
-import aiohttp
 import logging
 
 from discord.ext import commands
 
+from http_clients import http_clients
+
 _log = logging.getLogger("bg_traffic")
 
 class BackgroundTrafficCog(commands.Cog):
@@ -33,18 +34,18 @@ class BackgroundTrafficCog(commands.Cog):
     async def _loop(self):
         _log.info("Background traffic loop started.")
         try:
-            async with aiohttp.ClientSession() as sess:
-                while True:
-                    delay = random.randint(self.min_delay, self.max_delay)
-                    _log.info(f"bg sleep {delay}s")
-                    await asyncio.sleep(delay)
-                    url = random.choice(self.endpoints)
-                    try:
-                        async with sess.get(url, headers=self.headers, timeout=15) as r:
-                            text = await r.text()
-                            _log.info(f"bg ping -> {url} status={r.status} len={len(text) if text else 0}")
-                    except Exception as e:
-                        _log.warning(f"bg ping failed {e}")
+            sess = http_clients.session("bg_traffic", timeout=15)
+            while True:
+                delay = random.randint(self.min_delay, self.max_delay)
+                _log.info(f"bg sleep {delay}s")
+                await asyncio.sleep(delay)
+                url = random.choice(self.endpoints)
+                try:
+                    async with sess.get(url, headers=self.headers) as r:
+                        text = await r.text()
+                        _log.info(f"bg ping -> {url} status={r.status} len={len(text) if text else 0}")
+                except Exception as e:
+                    _log.warning(f"bg ping failed {e}")
         except asyncio.CancelledError:
             _log.info("Background traffic loop cancelled.")
         except Exception as e:
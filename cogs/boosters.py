@@ -11,6 +11,7 @@ from discord.ui import View, button
 DATA_FILE = os.environ.get("BOOSTERS_DATA_FILE", "boosters_data.json")
 META_FILE = os.environ.get("BOOSTERS_META_FILE", "boosters_meta.json")
 from utils import GUILD_ID, BOOSTER_ROLE_ID, CUSTOM_BOOSTER_ROLE_ID, BOOSTER_RANK_CHANNEL_ID
+from rest_queue import rest_queue, PRIORITY_USER, PRIORITY_BACKGROUND
 # ------------------ Helpers de arquivo ------------------
 def load_json_file(path):
     try:
@@ -218,6 +219,16 @@ class BoosterCog(commands.Cog):
         self.meta["fixed_channel_id"] = self.fixed_channel_id
         save_meta(self.meta)
 
+    # edit da mensagem fixa via rest_queue (edits pendentes da mesma msg são coalescidos)
+    async def _queue_fixed_edit(self, msg, *, priority=PRIORITY_BACKGROUND, **fields):
+        return await rest_queue.run(
+            "message_edit",
+            msg.channel.id,
+            lambda: msg.edit(**fields),
+            coalesce_key=("edit", msg.id),
+            priority=priority,
+        )
+
     def _get_rank_channel(self):
         ch = self.bot.get_channel(BOOSTER_RANK_CHANNEL_ID)
         return ch
@@ -369,7 +380,7 @@ class BoosterCog(commands.Cog):
                     ch = self.bot.get_channel(self.fixed_channel_id)
                     if ch:
                         msg = await ch.fetch_message(self.fixed_message_id)
-                        await msg.edit(embeds=embeds, view=view)
+                        await self._queue_fixed_edit(msg, priority=PRIORITY_USER, embeds=embeds, view=view)
                         self.fixed_message_id = msg.id
                         self.fixed_channel_id = ch.id
                         self._save_state()
@@ -552,7 +563,7 @@ class BoosterCog(commands.Cog):
 
         if not boosters:
             try:
-                await msg.edit(content="❌ Nenhum booster encontrado.", embeds=[], view=None)
+                await self._queue_fixed_edit(msg, content="❌ Nenhum booster encontrado.", embeds=[], view=None)
             except Exception:
                 pass
             return
@@ -561,7 +572,7 @@ class BoosterCog(commands.Cog):
         view.cog_data = self.data
         embeds = build_embeds_for_page(boosters, page=0, per_page=view.per_page)
         try:
-            await msg.edit(embeds=embeds, view=view)
+            await self._queue_fixed_edit(msg, embeds=embeds, view=view)
         except Exception:
             # if editing fails (deleted or permissions), try recreate
             try:
@@ -1,12 +1,15 @@
 import asyncio
+import json
+import os
 import discord
 from discord.ext import commands
-import aiohttp
 import re
-from bs4 import BeautifulSoup
-from collections import deque
+import html as html_lib
+from collections import OrderedDict
 from urllib.parse import urlsplit, urlunsplit
 
+from http_clients import http_clients
+from page_meta import element_inner, fetch_head, html_text, parse_meta
 from utils import (
     FREESTUFF_TEST_GUILD_ID,       # Servidor A (onde tem FreeStuff + Override)
     FREESTUFF_TEST_CHANNEL_ID,     # Canal A (onde o FreeStuff posta) - pode ser canal "pai"
@@ -20,28 +23,106 @@ EPIC_REGEX  = r"https?://store\.epicgames\.com/[^\s<>\]]+"
 GOG_REGEX   = r"https?://www\.gog\.com/en/game/[^\s<>\]]+"
 GENERIC_URL = r"https?://[^\s<>\]]+"
 
-MAX_CACHE = 200
+MAX_CACHE = 2000               # quantos anúncios já enviados ficam lembrados (persistido)
+SEEN_PATH = "data/freestuff_seen.json"
+SEEN_FLUSH_SEC = 5.0           # write-behind: junta vários posts numa escrita só (fora do loop)
+QUEUE_MAX = 50                 # anúncios esperando worker; cheio = descarta (não marca como visto)
+WORKERS = 2
 DEBUG = True  # desligue quando estabilizar
 
+_GENRE_LINE = re.compile(r"(?:Genre|Gênero|Género):\s*(?:</b>)?(.*?)<br", re.I | re.S)
+
+
+# ─────────────────────────────
+# EXTRAÇÃO (sem árvore; roda numa thread)
+# ─────────────────────────────
+def extract_steam_genres(details_html):
+    if not details_html:
+        return "Indisponível"
+    m = _GENRE_LINE.search(details_html)
+    if not m:
+        return "Indisponível"
+    genres = html_lib.unescape(re.sub(r"<[^>]+>", "", m.group(1)))
+    genres = " ".join(genres.split())
+    return genres or "Indisponível"
+
+
+def extract_game_info(platform, html):
+    if platform == "Steam":
+        desc = html_text(element_inner(html, "div", id="game_area_description"))
+        return {
+            "desc": desc[:900] if desc else "Indisponível",
+            "genres": extract_steam_genres(element_inner(html, "div", cls="details_block")),
+            "end_date": "Não informado",
+        }
+
+    meta = parse_meta(html).get("description")
+    return {
+        "desc": meta[:900] if meta else "Indisponível",
+        "genres": "Indisponível",
+        "end_date": "Não informado",
+    }
+
+
+def _load_seen() -> list:
+    try:
+        if os.path.isfile(SEEN_PATH):
+            with open(SEEN_PATH, "r", encoding="utf-8") as f:
+                data = json.load(f)
+                if isinstance(data, list):
+                    return [k for k in data if isinstance(k, str)]
+    except Exception as e:
+        print(f"[FreeStuff] seen ilegível, ignorando: {e}")
+    return []
+
+
+def _save_seen(keys: list) -> None:
+    os.makedirs(os.path.dirname(SEEN_PATH), exist_ok=True)
+    tmp = SEEN_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(keys, f, ensure_ascii=False)
+    os.replace(tmp, SEEN_PATH)
+
 
 class FreeStuffMonitor(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
-        self.sent_cache = set()
-        self.sent_order = deque(maxlen=MAX_CACHE)
+        # "plataforma:url" já enviados (ordem de chegada; sobrevive a restart)
+        self.sent_cache = OrderedDict((k, None) for k in _load_seen()[-MAX_CACHE:])
+        # "plataforma:url" na fila ou em processamento (anúncio repetido não gera 2º fetch/post)
+        self._inflight = set()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_MAX)
+        self._workers = []
+        self._seen_dirty = False
+        self._seen_task = None
+
+        self.session = None
 
-        self.session = aiohttp.ClientSession(
+    async def cog_load(self):
+        self.session = http_clients.session(
+            "freestuff",
             headers={
                 "User-Agent": "Mozilla/5.0 (FreeStuffRelay/1.0)",
                 "Accept-Language": "pt-BR,pt;q=0.9,en;q=0.8",
-            }
+            },
         )
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(WORKERS)]
 
     def cog_unload(self):
-        # bot.loop é depreciado; use asyncio.create_task
-        if not self.session.closed:
-            asyncio.create_task(self.session.close())
+        for t in self._workers:
+            t.cancel()
+        self._workers = []
+        if self._seen_task and not self._seen_task.done():
+            self._seen_task.cancel()
+        if self._seen_dirty:
+            # última escrita (uma vez, no unload)
+            try:
+                _save_seen(list(self.sent_cache))
+                self._seen_dirty = False
+            except Exception as e:
+                print(f"[FreeStuff] Falha salvando seen: {e}")
+        # sessão é do http_clients (fecha no shutdown do processo)
 
     # ─────────────────────────────
     # LISTENER
@@ -108,13 +189,41 @@ class FreeStuffMonitor(commands.Cog):
                 print(self.debug_embed_dump(embed))
             return
 
-        key = f"{platform}:{url}"
-        if key in self.sent_cache:
+        self._enqueue(platform, url, embed)
+
+    def _enqueue(self, platform, url, embed):
+        # chave sem querystring (?snr=, utm_...) pra o mesmo jogo não passar 2x
+        parts = urlsplit(url)
+        key = f"{platform}:{parts.netloc.lower()}{parts.path.rstrip('/')}"
+        if key in self.sent_cache or key in self._inflight:
             if DEBUG:
-                print("[FreeStuff][DEBUG] Duplicado no cache:", key)
+                print("[FreeStuff][DEBUG] Duplicado:", key)
+            return
+        try:
+            self._queue.put_nowait((key, platform, url, embed))
+        except asyncio.QueueFull:
+            print(f"[FreeStuff] Fila cheia ({QUEUE_MAX}), descartado: {key}")
             return
-        self._cache_add(key)
+        self._inflight.add(key)
 
+    # ─────────────────────────────
+    # WORKERS
+    # ─────────────────────────────
+    async def _worker(self, n):
+        while True:
+            key, platform, url, embed = await self._queue.get()
+            try:
+                if await self._relay(platform, url, embed):
+                    self._cache_add(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[FreeStuff] worker {n} falhou em {key}: {e}")
+            finally:
+                self._inflight.discard(key)
+                self._queue.task_done()
+
+    async def _relay(self, platform, url, embed) -> bool:
         info = await self.fetch_game_info(platform, url) if platform in ("Steam", "Epic Games", "GOG") else self.empty_info()
         final_embed = self.build_final_embed(platform or "Promo", embed, url, info)
 
@@ -125,7 +234,7 @@ class FreeStuffMonitor(commands.Cog):
                 channel = await self.bot.fetch_channel(FREESTUFF_MAIN_CHANNEL_ID)
             except Exception as e:
                 print(f"[FreeStuff] Não consegui fetch_channel do destino: {e}")
-                return
+                return False
 
         content = "🎮 **Novo jogo gratuito disponível!**"
         if FREESTUFF_PING_ROLE_ID and FREESTUFF_PING_ROLE_ID != 0:
@@ -139,8 +248,10 @@ class FreeStuffMonitor(commands.Cog):
             )
             if DEBUG:
                 print(f"[FreeStuff][DEBUG] Enviado para destino: {platform} - {url}")
+            return True
         except Exception as e:
             print(f"[FreeStuff] Erro ao enviar mensagem: {e}")
+            return False
 
     # ─────────────────────────────
     # HELPERS
@@ -215,55 +326,47 @@ class FreeStuffMonitor(commands.Cog):
         return " | ".join(out)
 
     def _cache_add(self, key: str):
-        self.sent_cache.add(key)
-        self.sent_order.append(key)
+        self.sent_cache[key] = None
         while len(self.sent_cache) > MAX_CACHE:
-            old = self.sent_order.popleft()
-            self.sent_cache.discard(old)
+            self.sent_cache.popitem(last=False)
+        self._seen_dirty = True
+        if self._seen_task and not self._seen_task.done():
+            return
+        self._seen_task = asyncio.create_task(self._flush_seen_later())
+
+    async def _flush_seen_later(self):
+        try:
+            await asyncio.sleep(SEEN_FLUSH_SEC)
+        except asyncio.CancelledError:
+            return
+        if not self._seen_dirty:
+            return
+        self._seen_dirty = False
+        try:
+            await asyncio.to_thread(_save_seen, list(self.sent_cache))
+        except Exception as e:
+            self._seen_dirty = True
+            print(f"[FreeStuff] Falha salvando seen: {e}")
 
     # ─────────────────────────────
     # SCRAPING
     # ─────────────────────────────
     async def fetch_game_info(self, platform, url):
-        try:
-            async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=12), allow_redirects=True) as resp:
-                html = await resp.text()
-        except Exception:
+        # lê só até ter o que precisa (Steam: descrição + details_block; resto: <head>)
+        # mesma página promovida de novo = sai do cache (TTL + revalidação)
+        until = (b"game_area_description", b"details_block") if platform == "Steam" else ()
+        html = await fetch_head(self.session, url, until=until, timeout=12)
+        if not html:
             return self.empty_info()
 
-        soup = BeautifulSoup(html, "html.parser")
-
         try:
-            if platform == "Steam":
-                desc = soup.find("div", id="game_area_description")
-                details = soup.select_one(".details_block")
-                return {
-                    "desc": desc.get_text("\n", strip=True)[:900] if desc else "Indisponível",
-                    "genres": self.extract_steam_genres(details),
-                    "end_date": "Não informado",
-                }
-
-            meta = soup.find("meta", {"name": "description"})
-            return {
-                "desc": meta["content"][:900] if meta and meta.get("content") else "Indisponível",
-                "genres": "Indisponível",
-                "end_date": "Não informado",
-            }
+            return await asyncio.to_thread(extract_game_info, platform, html)
         except Exception:
             return self.empty_info()
 
     def empty_info(self):
         return {"desc": "Indisponível", "genres": "Indisponível", "end_date": "Indisponível"}
 
-    def extract_steam_genres(self, block):
-        if not block:
-            return "Indisponível"
-        text = block.get_text("\n", strip=True)
-        for token in ("Genre:", "Gênero:", "Género:"):
-            if token in text:
-                return text.split(token, 1)[1].split("\n", 1)[0].strip()
-        return "Indisponível"
-
     # ─────────────────────────────
     # EMBED FINAL
     # ─────────────────────────────
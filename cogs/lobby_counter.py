@@ -3,18 +3,19 @@ import json
 import os
 import re
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
 
 import discord
 from discord.ext import commands, tasks
 
+from rest_queue import rest_queue, PRIORITY_BACKGROUND
+
 
 CONFIG_PATH = "data/multi_counters.json"
 
 # ========== Anti-rate-limit ==========
-# intervalo mínimo entre renomes do MESMO canal (segundos)
-MIN_RENAME_INTERVAL_SEC = 60
+# o limite de renome por canal (2 a cada 10 min) fica no rest_queue
 
 # intervalo do loop periódico (segundos)
 UPDATE_LOOP_SEC = 60
@@ -22,6 +23,9 @@ UPDATE_LOOP_SEC = 60
 # debounce para juntar vários eventos
 EVENT_DEBOUNCE_SEC = 8
 
+# recontagem completa (reconcilia os contadores incrementais com o cache)
+FULL_RECOUNT_SEC = 30 * 60
+
 
 def _load_config() -> dict:
     if not os.path.exists(CONFIG_PATH):
@@ -51,6 +55,15 @@ class CounterSpec:
     role_id: int = 0  # only for mode=role
 
 
+@dataclass
+class GuildTally:
+    """Contagem incremental por guild (mantida pelos eventos de membro)."""
+    humans: int = 0
+    bots: int = 0
+    roles: Dict[int, int] = field(default_factory=dict)  # role_id -> membros
+    recounted_at: float = 0.0
+
+
 def _is_counter_channel(ch: Optional[discord.abc.GuildChannel]) -> bool:
     return isinstance(ch, (discord.VoiceChannel, discord.StageChannel))
 
@@ -91,12 +104,12 @@ class MultiCounters(commands.Cog):
         self._pending_event_update = False
         self._event_task: Optional[asyncio.Task] = None
 
-        # por-canal: último rename (anti 429)
-        self._last_rename_at: Dict[int, float] = {}
-
         # por-canal: último nome aplicado (extra proteção)
         self._last_applied_name: Dict[int, str] = {}
 
+        # por-guild: humans/bots/cargos mantidos por delta (O(1) por update)
+        self._tallies: Dict[int, GuildTally] = {}
+
         self.update_loop.start()
 
     def cog_unload(self):
@@ -184,21 +197,60 @@ class MultiCounters(commands.Cog):
     def _count_all(self, guild: discord.Guild) -> int:
         return guild.member_count or 0
 
-    def _count_humans_bots(self, guild: discord.Guild) -> Tuple[int, int]:
-        humans = 0
-        bots = 0
+    def _recount(self, guild: discord.Guild) -> GuildTally:
+        """
+        Recontagem completa (O(membros)). Só roda na primeira vez e a cada
+        FULL_RECOUNT_SEC pra corrigir qualquer delta perdido.
+        """
+        tally = GuildTally(recounted_at=time.time())
+        roles = tally.roles
         for m in guild.members:
             if m.bot:
-                bots += 1
+                tally.bots += 1
             else:
-                humans += 1
-        return humans, bots
+                tally.humans += 1
+            for r in m.roles:
+                roles[r.id] = roles.get(r.id, 0) + 1
+        self._tallies[guild.id] = tally
+        return tally
+
+    def _get_tally(self, guild: discord.Guild) -> GuildTally:
+        tally = self._tallies.get(guild.id)
+        if tally is None or time.time() - tally.recounted_at >= FULL_RECOUNT_SEC:
+            tally = self._recount(guild)
+        return tally
+
+    def _apply_member_delta(self, member: discord.Member, sign: int) -> None:
+        tally = self._tallies.get(member.guild.id)
+        if tally is None:
+            # ainda não contou essa guild: a recontagem lazy cobre
+            return
+        if member.bot:
+            tally.bots = max(0, tally.bots + sign)
+        else:
+            tally.humans = max(0, tally.humans + sign)
+        for r in member.roles:
+            tally.roles[r.id] = max(0, tally.roles.get(r.id, 0) + sign)
+
+    def _apply_roles_delta(self, before: discord.Member, after: discord.Member) -> None:
+        tally = self._tallies.get(after.guild.id)
+        if tally is None:
+            return
+        old_ids = {r.id for r in before.roles}
+        new_ids = {r.id for r in after.roles}
+        for rid in new_ids - old_ids:
+            tally.roles[rid] = tally.roles.get(rid, 0) + 1
+        for rid in old_ids - new_ids:
+            tally.roles[rid] = max(0, tally.roles.get(rid, 0) - 1)
+
+    def _count_humans_bots(self, guild: discord.Guild) -> Tuple[int, int]:
+        tally = self._get_tally(guild)
+        return tally.humans, tally.bots
 
     def _count_role(self, guild: discord.Guild, role_id: int) -> int:
-        role = guild.get_role(role_id)
-        if not role:
+        if guild.get_role(role_id) is None:
             return 0
-        return len(role.members)
+        return self._get_tally(guild).roles.get(role_id, 0)
 
     async def _compute_count(self, guild: discord.Guild, spec: CounterSpec) -> int:
         mode = spec.mode.lower().strip()
@@ -216,24 +268,32 @@ class MultiCounters(commands.Cog):
 
         return 0
 
-    async def _safe_rename(self, channel: discord.abc.GuildChannel, new_name: str) -> bool:
+    def _safe_rename(self, channel: discord.abc.GuildChannel, new_name: str) -> bool:
         """
         Protege contra 429:
-        - não renomeia se foi há pouco tempo
-        - não renomeia se já aplicou o mesmo nome recentemente
+        - o rename vai pro rest_queue (bucket de 2 renomes / 10 min por canal)
+        - renomes pendentes do mesmo canal são coalescidos (só o último nome sai)
+        - não repete se já aplicou o mesmo nome
         """
-        now = time.time()
-        last = self._last_rename_at.get(channel.id, 0.0)
-        if now - last < MIN_RENAME_INTERVAL_SEC:
-            return False
-
-        # extra: se já aplicou esse nome, não repete
         if self._last_applied_name.get(channel.id) == new_name:
             return False
 
-        self._last_rename_at[channel.id] = now
         self._last_applied_name[channel.id] = new_name
-        await channel.edit(name=new_name, reason="Counters: update")
+
+        def _done(fut: "asyncio.Future") -> None:
+            # falhou (Forbidden etc.) -> permite tentar de novo no próximo update
+            if fut.cancelled() or fut.exception() is not None:
+                if self._last_applied_name.get(channel.id) == new_name:
+                    self._last_applied_name.pop(channel.id, None)
+
+        fut = rest_queue.submit(
+            "channel_rename",
+            channel.id,
+            lambda: channel.edit(name=new_name, reason="Counters: update"),
+            coalesce_key=("rename", channel.id),
+            priority=PRIORITY_BACKGROUND,
+        )
+        fut.add_done_callback(_done)
         return True
 
     async def _update_one(self, guild: discord.Guild, spec: CounterSpec, *, force: bool = False) -> None:
@@ -259,15 +319,8 @@ class MultiCounters(commands.Cog):
         except discord.Forbidden:
             pass
 
-        # rename com proteção
-        try:
-            if force:
-                # force ainda respeita o intervalo mínimo (pra não tomar 429)
-                await self._safe_rename(channel, new_name)
-            else:
-                await self._safe_rename(channel, new_name)
-        except discord.Forbidden:
-            pass
+        # rename com proteção (force ainda respeita o bucket, pra não tomar 429)
+        self._safe_rename(channel, new_name)
 
     async def update_all(self, *, force: bool = False) -> None:
         async with self._update_lock:
@@ -294,16 +347,19 @@ class MultiCounters(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
+        self._apply_member_delta(member, +1)
         self._schedule_event_update()
 
     @commands.Cog.listener()
     async def on_member_remove(self, member: discord.Member):
+        self._apply_member_delta(member, -1)
         self._schedule_event_update()
 
     @commands.Cog.listener()
     async def on_member_update(self, before: discord.Member, after: discord.Member):
         # Só dispara se cargos mudaram (seu Lobby depende disso)
         if before.roles != after.roles:
+            self._apply_roles_delta(before, after)
             self._schedule_event_update()
 
     # ---------------- Periodic loop (main updater) ----------------
@@ -380,7 +436,7 @@ class MultiCounters(commands.Cog):
 
         # força 1 update (mas ainda respeita anti-429)
         await self._update_one(ctx.guild, new_spec, force=True)
-        await ctx.reply("✅ Editado. Se não mudar na hora por 429, espera ~1 minuto e ele atualiza sozinho.")
+        await ctx.reply("✅ Editado. Se não mudar na hora (limite de 2 renomes a cada 10 min), ele atualiza sozinho quando liberar.")
 
     @commands.has_permissions(administrator=True)
     @commands.command(name="counter_now")
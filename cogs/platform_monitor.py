@@ -1,16 +1,37 @@
 import asyncio
+import json
 import logging
+import os
 import time
+from dataclasses import dataclass, asdict
 from typing import Optional, Dict, Tuple, Any
 
 import discord
 from discord.ext import commands
 
 from webhook_server import webhook_queue, ensure_webhook_server
-from utils import PLATFORM_LIVE_CHANNEL_ID, PLATFORM_PING_ROLE_ID
+from utils import PLATFORM_LIVE_CHANNEL_ID, PLATFORM_PING_ROLE_ID, PLATFORM_POLL_CHANNELS
+from rest_queue import rest_queue
+from platforms.poller import LivePoller
 
 log = logging.getLogger("platform_monitor")
 
+STATE_PATH = "data/platform_lives.json"
+
+# anúncio salvo mais velho que isso é de outra live (bot estava fora quando ela acabou)
+SESSION_MAX_AGE = 12 * 3600
+# chaves de dedupe de evento mais velhas que isso são jogadas fora
+DEDUPE_TTL = 60.0
+# quantos payloads do webhook o consumer pega por vez
+WEBHOOK_BATCH = 32
+
+# plataforma -> (nome, url padrão da live)
+PLATFORMS: Dict[str, Tuple[str, str]] = {
+    "tiktok": ("TikTok", "https://www.tiktok.com/@{}/live"),
+    "twitch": ("Twitch", "https://www.twitch.tv/{}"),
+    "youtube": ("YouTube", "https://www.youtube.com/@{}/live"),
+}
+
 
 def _norm(x: Any) -> Optional[str]:
     if x is None:
@@ -25,58 +46,114 @@ def _empty(v: Any) -> bool:
     return v in (None, "", [], {}, ())
 
 
-def _get(payload: dict, *keys: str):
-    for k in keys:
-        if k in payload and not _empty(payload[k]):
-            return payload[k]
-    return None
-
-
-def _deep_get(obj: Any, keys: set[str]) -> Any:
+# ---------- extração de campos do payload ----------
+# campo -> aliases em ordem de preferência (nível de cima, já com "data" mesclado)
+_TOP_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "event": ("event", "type", "action", "name"),
+    "username": ("username", "unique_id", "uniqueId", "user"),
+    "title": ("title", "live_title", "liveTitle", "room_title", "roomTitle", "roomTitleText"),
+    "game": ("game", "gameName", "game_name", "category", "category_name", "categoryName", "partitionName"),
+    "thumb": ("thumb", "thumbnail", "thumb_url", "thumbUrl", "cover", "coverUrl", "cover_url", "coverURL", "coverImageUrl"),
+    "live_url": ("live_url", "liveUrl", "shareUrl", "share_url", "url", "link"),
+}
+# fallback aninhado (qualquer profundidade; vale o primeiro na ordem do payload)
+_DEEP_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "title": _TOP_ALIASES["title"] + ("roomName",),
+    "game": _TOP_ALIASES["game"] + ("subCategoryName",),
+    "thumb": _TOP_ALIASES["thumb"] + ("roomCover",),
+    "live_url": _TOP_ALIASES["live_url"],
+}
+
+_FIELDS = tuple(_TOP_ALIASES)
+_N = len(_FIELDS)
+# alias -> (índice do campo, prioridade)
+_TOP_TABLE: Dict[str, Tuple[int, int]] = {
+    a: (_FIELDS.index(f), p) for f, aliases in _TOP_ALIASES.items() for p, a in enumerate(aliases)
+}
+# alias -> índice do campo
+_DEEP_TABLE: Dict[str, int] = {a: _FIELDS.index(f) for f, aliases in _DEEP_ALIASES.items() for a in aliases}
+_DEEP_MASK = sum(1 << _FIELDS.index(f) for f in _DEEP_ALIASES)
+
+
+def _deep_fill(obj: Any, out: list, missing: int) -> int:
+    """
+    Uma varredura só pra todos os campos ainda vazios (bitmask `missing`):
+    em cada dict olha as próprias chaves antes de descer. Para quando completa.
+    """
     if isinstance(obj, dict):
         for k, v in obj.items():
-            if k in keys and not _empty(v):
-                return v
+            i = _DEEP_TABLE.get(k)
+            if i is not None and missing >> i & 1 and not _empty(v):
+                out[i] = v
+                missing &= ~(1 << i)
+                if not missing:
+                    return 0
         for v in obj.values():
-            found = _deep_get(v, keys)
-            if not _empty(found):
-                return found
+            if isinstance(v, (dict, list)):
+                missing = _deep_fill(v, out, missing)
+                if not missing:
+                    return 0
     elif isinstance(obj, list):
         for item in obj:
-            found = _deep_get(item, keys)
-            if not _empty(found):
-                return found
-    return None
+            if isinstance(item, (dict, list)):
+                missing = _deep_fill(item, out, missing)
+                if not missing:
+                    return 0
+    return missing
 
 
 def _extract(payload: dict):
-    base = payload
     data = payload.get("data") if isinstance(payload.get("data"), dict) else None
-    if data:
-        merged = dict(data)
-        merged.update({k: v for k, v in base.items() if k != "data"})
-        payload = merged
 
-    event = _norm(_get(payload, "event", "type", "action", "name"))
-    username = _norm(_get(payload, "username", "unique_id", "uniqueId", "user"))
+    vals: list = [None] * _N
+    prio = [len(_TOP_TABLE)] * _N
+    nested = False
+
+    # nível de cima: payload vence "data" na mesma chave (igual ao merge)
+    for k, v in payload.items():
+        if k == "data" and data:
+            continue
+        if not nested and isinstance(v, (dict, list)):
+            nested = True
+        hit = _TOP_TABLE.get(k)
+        if hit is not None and hit[1] < prio[hit[0]] and not _empty(v):
+            vals[hit[0]] = v
+            prio[hit[0]] = hit[1]
+    if data:
+        for k, v in data.items():
+            if k in payload:
+                continue
+            if not nested and isinstance(v, (dict, list)):
+                nested = True
+            hit = _TOP_TABLE.get(k)
+            if hit is not None and hit[1] < prio[hit[0]] and not _empty(v):
+                vals[hit[0]] = v
+                prio[hit[0]] = hit[1]
+
+    vals = [_norm(v) for v in vals]
+    missing = 0
+    for i in range(_N):
+        if vals[i] is None and _DEEP_MASK >> i & 1:
+            missing |= 1 << i
+    if missing:
+        todo = missing
+        if nested or data:
+            _deep_fill(payload, vals, missing)
+        else:
+            # TikFinity manda payload plano: o fallback é só a 1ª chave extra no próprio nível
+            for k, v in payload.items():
+                i = _DEEP_TABLE.get(k)
+                if i is not None and missing >> i & 1 and not _empty(v):
+                    vals[i] = v
+                    missing &= ~(1 << i)
+
+        for i in range(_N):
+            if todo >> i & 1:
+                vals[i] = _norm(vals[i])
+
+    event, username, title, game, thumb, live_url = vals
     if username:
         username = username.lstrip("@")
-
-    title = _norm(_get(payload, "title", "live_title", "liveTitle", "room_title", "roomTitle", "roomTitleText"))
-    game = _norm(_get(payload, "game", "gameName", "game_name", "category", "category_name", "categoryName", "partitionName"))
-    thumb = _norm(_get(payload, "thumb", "thumbnail", "thumb_url", "thumbUrl", "cover", "coverUrl", "cover_url", "coverURL", "coverImageUrl"))
-    live_url = _norm(_get(payload, "live_url", "liveUrl", "shareUrl", "share_url", "url", "link"))
-
-    # deep fallback (quando vier aninhado)
-    if not title:
-        title = _norm(_deep_get(base, {"title", "live_title", "liveTitle", "room_title", "roomTitle", "roomTitleText", "roomName"}))
-    if not game:
-        game = _norm(_deep_get(base, {"game", "gameName", "game_name", "category", "category_name", "categoryName", "partitionName", "subCategoryName"}))
-    if not thumb:
-        thumb = _norm(_deep_get(base, {"thumb", "thumbnail", "thumb_url", "thumbUrl", "cover", "coverUrl", "cover_url", "coverURL", "coverImageUrl", "roomCover"}))
-    if not live_url:
-        live_url = _norm(_deep_get(base, {"live_url", "liveUrl", "shareUrl", "share_url", "url", "link"}))
-
     return event.lower() if event else None, username, title, game, thumb, live_url
 
 
@@ -86,11 +163,13 @@ def _build_live_embed(
     game: Optional[str],
     thumb: Optional[str],
     live_url: Optional[str],
+    platform: str = "tiktok",
 ) -> discord.Embed:
-    url = live_url or f"https://www.tiktok.com/@{username}/live"
+    label, url_fmt = PLATFORMS.get(platform, PLATFORMS["tiktok"])
+    url = live_url or url_fmt.format(username)
 
     embed = discord.Embed(
-        title=title or "🔴 AO VIVO NO TIKTOK",
+        title=title or f"🔴 AO VIVO NO {label.upper()}",
         url=url,
         description=f'🎮 Jogo: {game or "Sem informação"}',
         color=discord.Color.red(),
@@ -103,74 +182,192 @@ def _build_live_embed(
     return embed
 
 
+def _poll_username(channel: Optional[str]) -> Optional[str]:
+    # "@nome", "nome" ou URL do canal -> nome (mesma chave que os checkers devolvem)
+    c = (channel or "").strip()
+    if c.startswith("http"):
+        c = [p for p in c.split("?")[0].split("/") if p][-1]
+    return c.lstrip("@") or None
+
+
+@dataclass
+class _LiveSession:
+    platform: str
+    username: str
+    channel_id: int
+    message_id: int
+    started_at: float
+
+
+def _load_sessions() -> Dict[Tuple[str, str], _LiveSession]:
+    out: Dict[Tuple[str, str], _LiveSession] = {}
+    try:
+        if os.path.isfile(STATE_PATH):
+            with open(STATE_PATH, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            now = time.time()
+            for item in data if isinstance(data, list) else []:
+                sess = _LiveSession(**item)
+                if now - sess.started_at < SESSION_MAX_AGE:
+                    out[(sess.platform, sess.username.lower())] = sess
+    except Exception as e:
+        log.warning(f"[PlatformMonitor] estado ilegível, ignorando: {e}")
+    return out
+
+
+def _save_sessions(sessions: Dict[Tuple[str, str], _LiveSession]) -> None:
+    os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+    tmp = STATE_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump([asdict(s) for s in sessions.values()], f, ensure_ascii=False)
+    os.replace(tmp, STATE_PATH)
+
+
 class PlatformMonitor(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
-        self.live_active: bool = False
-        self.live_username: Optional[str] = None
-        self.live_message: Optional[discord.Message] = None
+        # (platform, username minúsculo) -> live anunciada (sobrevive a restart)
+        self.sessions: Dict[Tuple[str, str], _LiveSession] = _load_sessions()
+        # um lock por live: eventos da mesma live em ordem, lives diferentes em paralelo
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        self._handlers: set = set()
 
-        self._last_event_ts: Dict[Tuple[str, str], float] = {}
+        self._last_event_ts: Dict[Tuple[str, str, str], float] = {}
         self.task: Optional[asyncio.Task] = None
 
+        # polling (twitch/youtube/tiktok) cai nos mesmos handle_live_start/end do webhook
+        self.poller = LivePoller(self._on_poll_start, self._on_poll_end)
+        self._poll_names: Dict[Tuple[str, str], str] = {}
+
     async def cog_load(self):
         await ensure_webhook_server()
         self.task = asyncio.create_task(self.webhook_consumer())
+        if PLATFORM_POLL_CHANNELS:
+            self.poller.set_channels(PLATFORM_POLL_CHANNELS)
+            self._seed_poll_sessions()
+            self.poller.start()
 
     async def cog_unload(self):
+        webhook_queue.accepting = False
         if self.task:
             self.task.cancel()
+        self.poller.stop()
+        for t in list(self._handlers):
+            t.cancel()
+
+    def _seed_poll_sessions(self):
+        # live anunciada antes do restart: o poller começa sabendo que está no ar,
+        # então se ela acabou com o bot fora o END_CONFIRM normal encerra a mensagem
+        for platform, channel in PLATFORM_POLL_CHANNELS:
+            platform = (platform or "").strip().lower()
+            username = _poll_username(channel)
+            sess = self.sessions.get((platform, username.lower())) if username else None
+            if sess is None:
+                continue
+            self._poll_names[(platform, (channel or "").strip())] = sess.username
+            self.poller.seed_live(platform, channel)
+
+    async def _on_poll_start(self, platform: str, channel: str, info: dict):
+        username = _norm(info.get("channel")) or channel.lstrip("@")
+        self._poll_names[(platform, channel)] = username
+        await self.handle_live_start(
+            username,
+            _norm(info.get("title")),
+            _norm(info.get("game")),
+            _norm(info.get("thumbnail")),
+            _norm(info.get("url")),
+            platform=platform,
+        )
+
+    async def _on_poll_end(self, platform: str, channel: str):
+        username = self._poll_names.pop((platform, channel), None) or channel.lstrip("@")
+        await self.handle_live_end(username, platform=platform)
+
+    def _is_duplicate(self, platform: str, event: str, username: str) -> bool:
+        now = time.time()
+        if len(self._last_event_ts) > 256:
+            self._last_event_ts = {k: ts for k, ts in self._last_event_ts.items() if now - ts < DEDUPE_TTL}
+        key = (platform, event, username.lower())
+        window = 10 if event == "live_end" else 15
+        if now - self._last_event_ts.get(key, 0.0) < window:
+            return True
+        self._last_event_ts[key] = now
+        return False
+
+    def _spawn(self, coro) -> None:
+        t = asyncio.create_task(coro)
+        self._handlers.add(t)
+        t.add_done_callback(self._handler_done)
+
+    def _handler_done(self, t: asyncio.Task) -> None:
+        self._handlers.discard(t)
+        if not t.cancelled() and t.exception():
+            log.error("[PlatformMonitor] Erro tratando evento", exc_info=t.exception())
+
+    def _lock(self, key: Tuple[str, str]) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    def _persist(self) -> None:
+        try:
+            _save_sessions(self.sessions)
+        except Exception as e:
+            log.warning(f"[PlatformMonitor] falha salvando lives: {e}")
+
+    @staticmethod
+    def _coalesce_key(payload: dict):
+        # vários live_info do mesmo usuário na fila: só o último importa
+        event, username, *_ = _extract(payload)
+        if event in ("live_info", "stream_info", "update") and username:
+            return ("info", username.lower())
+        return None
 
     async def webhook_consumer(self):
         await self.bot.wait_until_ready()
+        webhook_queue.coalesce_key = self._coalesce_key
+        webhook_queue.accepting = True
         log.info("[PlatformMonitor] Consumer ativo")
 
-        while not self.bot.is_closed():
-            got_item = False
-            try:
-                payload = await asyncio.wait_for(webhook_queue.get(), timeout=5.0)
-                got_item = True
-
-                event, username, title, game, thumb, live_url = _extract(payload)
-                src = payload.get("source_event") if isinstance(payload, dict) else None
-                log.info(
-                    f"[Webhook] event={event} src={src} username={username} "
-                    f"title={bool(title)} game={bool(game)} thumb={bool(thumb)}"
-                )
-
-                if not event or not username:
-                    log.warning(f"[Webhook] Payload inválido (faltando event/username): {payload}")
-                    continue
-
-                now = time.time()
-                key = (event, username)
-                window = 10 if event == "live_end" else 15
-                if now - self._last_event_ts.get(key, 0.0) < window:
-                    continue
-                self._last_event_ts[key] = now
-
-                if event in ("live_start", "stream_start", "online"):
-                    await self.handle_live_start(username, title, game, thumb, live_url)
-                elif event in ("live_info", "stream_info", "update"):
-                    await self.handle_live_info(username, title, game, thumb, live_url)
-                elif event in ("live_end", "stream_end", "offline"):
-                    await self.handle_live_end(username)
-                else:
-                    log.info(f"[Webhook] Evento ignorado: {event}")
-
-            except asyncio.TimeoutError:
-                continue
-            except asyncio.CancelledError:
-                break
-            except Exception:
-                log.exception("[PlatformMonitor] Erro no consumer")
-            finally:
-                if got_item:
+        try:
+            while not self.bot.is_closed():
+                batch = await webhook_queue.get_batch(WEBHOOK_BATCH, timeout=5.0)
+                for payload in batch:
                     try:
-                        webhook_queue.task_done()
+                        self._handle_payload(payload)
                     except Exception:
-                        pass
+                        log.exception("[PlatformMonitor] Erro no consumer")
+        except asyncio.CancelledError:
+            pass
+        finally:
+            webhook_queue.accepting = False
+
+    def _handle_payload(self, payload: dict):
+        event, username, title, game, thumb, live_url = _extract(payload)
+        src = payload.get("source_event") if isinstance(payload, dict) else None
+        log.info(
+            f"[Webhook] event={event} src={src} username={username} "
+            f"title={bool(title)} game={bool(game)} thumb={bool(thumb)}"
+        )
+
+        if not event or not username:
+            log.warning(f"[Webhook] Payload inválido (faltando event/username): {payload}")
+            return
+
+        # webhook vem do TikFinity (TikTok)
+        if self._is_duplicate("tiktok", event, username):
+            return
+
+        if event in ("live_start", "stream_start", "online"):
+            self._spawn(self.handle_live_start(username, title, game, thumb, live_url))
+        elif event in ("live_info", "stream_info", "update"):
+            self._spawn(self.handle_live_info(username, title, game, thumb, live_url))
+        elif event in ("live_end", "stream_end", "offline"):
+            self._spawn(self.handle_live_end(username))
+        else:
+            log.info(f"[Webhook] Evento ignorado: {event}")
 
     async def _get_channel(self) -> discord.abc.Messageable:
         channel = self.bot.get_channel(PLATFORM_LIVE_CHANNEL_ID)
@@ -178,6 +375,20 @@ class PlatformMonitor(commands.Cog):
             channel = await self.bot.fetch_channel(PLATFORM_LIVE_CHANNEL_ID)
         return channel
 
+    async def _edit_live_message(self, message: discord.PartialMessage, embed: discord.Embed):
+        # updates seguidos da mesma live: só o embed mais novo é enviado
+        await rest_queue.run(
+            "message_edit",
+            message.channel.id,
+            lambda: message.edit(embed=embed),
+            coalesce_key=("edit", message.id),
+        )
+
+    def _message_of(self, sess: _LiveSession) -> discord.PartialMessage:
+        # PartialMessage: edita pelo id salvo, sem fetch (funciona depois de restart)
+        channel = self.bot.get_partial_messageable(sess.channel_id)
+        return channel.get_partial_message(sess.message_id)
+
     async def handle_live_start(
         self,
         username: str,
@@ -185,23 +396,29 @@ class PlatformMonitor(commands.Cog):
         game: Optional[str],
         thumb: Optional[str],
         live_url: Optional[str],
+        platform: str = "tiktok",
     ):
-        if self.live_active and self.live_username == username:
-            return
-
-        channel = await self._get_channel()
-
-        self.live_active = True
-        self.live_username = username
-
-        embed = _build_live_embed(username, title, game, thumb, live_url)
-
-        allowed = discord.AllowedMentions(roles=True)
-        self.live_message = await channel.send(
-            content=f"<@&{PLATFORM_PING_ROLE_ID}>",
-            embed=embed,
-            allowed_mentions=allowed,
-        )
+        key = (platform, username.lower())
+        async with self._lock(key):
+            embed = _build_live_embed(username, title, game, thumb, live_url, platform)
+            sess = self.sessions.get(key)
+            if sess is not None:
+                if time.time() - sess.started_at < SESSION_MAX_AGE:
+                    # já anunciada (ex.: start repetido depois de restart): só atualiza, sem pingar
+                    if title or game or thumb:
+                        await self._edit_live_message(self._message_of(sess), embed)
+                    return
+                self.sessions.pop(key, None)
+
+            channel = await self._get_channel()
+            allowed = discord.AllowedMentions(roles=True)
+            msg = await channel.send(
+                content=f"<@&{PLATFORM_PING_ROLE_ID}>",
+                embed=embed,
+                allowed_mentions=allowed,
+            )
+            self.sessions[key] = _LiveSession(platform, username, msg.channel.id, msg.id, time.time())
+            self._persist()
 
     async def handle_live_info(
         self,
@@ -210,33 +427,36 @@ class PlatformMonitor(commands.Cog):
         game: Optional[str],
         thumb: Optional[str],
         live_url: Optional[str],
+        platform: str = "tiktok",
     ):
+        key = (platform, username.lower())
+        sess = self.sessions.get(key)
         # se ainda não anunciou, o primeiro info vira start (pinga uma vez)
-        if (not self.live_active) or (not self.live_message) or (self.live_username != username):
-            await self.handle_live_start(username, title, game, thumb, live_url)
+        if sess is None:
+            await self.handle_live_start(username, title, game, thumb, live_url, platform)
             return
 
-        embed = _build_live_embed(username, title, game, thumb, live_url)
-        await self.live_message.edit(embed=embed)
-
-    async def handle_live_end(self, username: str):
-        if not self.live_active or self.live_username != username:
-            return
+        async with self._lock(key):
+            embed = _build_live_embed(username, title, game, thumb, live_url, platform)
+            await self._edit_live_message(self._message_of(sess), embed)
 
-        self.live_active = False
-        self.live_username = None
+    async def handle_live_end(self, username: str, platform: str = "tiktok"):
+        key = (platform, username.lower())
+        async with self._lock(key):
+            sess = self.sessions.pop(key, None)
+            if sess is None:
+                return
+            self._persist()
 
-        if self.live_message:
             embed = discord.Embed(
                 title="⚫ LIVE ENCERRADA",
                 color=discord.Color.dark_grey(),
             )
             try:
-                await self.live_message.edit(embed=embed)
+                await self._edit_live_message(self._message_of(sess), embed)
             except Exception:
                 pass
-            self.live_message = None
 
 
 async def setup(bot):
-    await bot.add_cog(PlatformMonitor(bot))
\ No newline at end of file
+    await bot.add_cog(PlatformMonitor(bot))
@@ -4,7 +4,11 @@ import re
 import html
 import asyncio
 import os
-import json
+import time
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Optional, Dict, List, Tuple, Any
 from difflib import SequenceMatcher
@@ -14,6 +18,10 @@ from discord import app_commands
 from discord.ext import commands
 import aiohttp
 
+from http_cache import http_cache
+from http_clients import http_clients
+from page_meta import fetch_head, parse_jsonld, parse_meta
+from steam_catalog import SteamCatalog
 from utils import (
     GUILD_ID,
     PROMO_CHANNEL_ID,
@@ -28,7 +36,10 @@ from utils import (
 TEST_GUILD = discord.Object(id=GUILD_ID)
 
 HTTP_TIMEOUT = 20
+FETCH_DEADLINE_SEC = 15.0  # prazo total do /promo pra buscar metadata (o que não chegar fica de fora)
 MAX_DESC_CHARS = 320
+# preço na página da loja: lê até um JSON-LD com um desses (Organization/Breadcrumb não serve)
+_PRICE_JSONLD_MARKERS = (b'"offers"', b'"price"')
 MAX_GENRES = 3
 
 # /home/adryan/Override
@@ -393,12 +404,229 @@ class StoreRegistry:
 # --------------------
 # Apertium Manager (subprocess)
 # --------------------
+# workers fixos (apertium -z) pra não pagar o start do pipeline a cada string
+APERTIUM_WORKERS = 2
+APERTIUM_TIMEOUT = 40.0
+
+# memória de tradução (por frase): LRU em RAM na frente de um SQLite em disco
+TM_DB_PATH = os.path.join(BASE_DIR, "data", "translation_memory.db")
+TM_LRU_SIZE = 512
+TM_MAX_ROWS = 20000
+
+# quebra em frases mantendo o separador (pra remontar igual)
+_SENTENCE_SPLIT_RE = re.compile(r"((?<=[.!?])\s+|\n+)")
+
+
+def _split_sentences(text: str) -> List[str]:
+    """Lista alternada [frase, sep, frase, sep, ...]."""
+    return _SENTENCE_SPLIT_RE.split(text)
+
+
+class TranslationMemory:
+    """
+    Cache de traduções que sobrevive a restart.
+    - chave: sha1(par + texto)
+    - RAM: LRU com TM_LRU_SIZE entradas
+    - disco: SQLite com no máximo TM_MAX_ROWS (apaga as menos usadas)
+    """
+
+    def __init__(self, path: str = TM_DB_PATH) -> None:
+        self.path = path
+        self._lru: "OrderedDict[str, str]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()      # get/put rodam em threads (to_thread) que se sobrepõem
+        self.hits_mem = 0
+        self.hits_disk = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(pair: str, text: str) -> str:
+        return hashlib.sha1(f"{pair}\0{text}".encode("utf-8")).hexdigest()
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS tm ("
+                " key TEXT PRIMARY KEY, pair TEXT NOT NULL, out TEXT NOT NULL, used_at REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS tm_used ON tm(used_at)")
+            self._db = db
+        return self._db
+
+    def _lru_put(self, key: str, out: str) -> None:
+        self._lru[key] = out
+        self._lru.move_to_end(key)
+        while len(self._lru) > TM_LRU_SIZE:
+            self._lru.popitem(last=False)
+
+    def _disk_get(self, keys: List[str]) -> Dict[str, str]:
+        with self._db_lock:
+            db = self._conn()
+            found: Dict[str, str] = {}
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                q = f"SELECT key, out FROM tm WHERE key IN ({','.join('?' * len(chunk))})"
+                for k, out in db.execute(q, chunk):
+                    found[k] = out
+            if found:
+                now = time.time()
+                db.executemany("UPDATE tm SET used_at=? WHERE key=?", [(now, k) for k in found])
+                db.commit()
+            return found
+
+    def _disk_put(self, pair: str, items: List[Tuple[str, str]]) -> None:
+        with self._db_lock:
+            db = self._conn()
+            now = time.time()
+            db.executemany(
+                "INSERT OR REPLACE INTO tm(key, pair, out, used_at) VALUES (?, ?, ?, ?)",
+                [(k, pair, out, now) for k, out in items],
+            )
+            (count,) = db.execute("SELECT COUNT(*) FROM tm").fetchone()
+            if count > TM_MAX_ROWS:
+                db.execute(
+                    "DELETE FROM tm WHERE key IN (SELECT key FROM tm ORDER BY used_at ASC LIMIT ?)",
+                    (count - TM_MAX_ROWS,),
+                )
+            db.commit()
+
+    async def get_many(self, pair: str, texts: List[str]) -> Dict[str, str]:
+        out: Dict[str, str] = {}
+        missing: Dict[str, str] = {}  # key -> texto
+        for t in texts:
+            k = self._key(pair, t)
+            if k in self._lru:
+                self._lru.move_to_end(k)
+                out[t] = self._lru[k]
+                self.hits_mem += 1
+            else:
+                missing[k] = t
+
+        if missing:
+            try:
+                found = await asyncio.to_thread(self._disk_get, list(missing))
+            except Exception as e:
+                print(f"[promo_embed] memória de tradução indisponível: {e}")
+                found = {}
+            for k, t in missing.items():
+                if k in found:
+                    out[t] = found[k]
+                    self._lru_put(k, found[k])
+                    self.hits_disk += 1
+                else:
+                    self.misses += 1
+        return out
+
+    async def put_many(self, pair: str, items: Dict[str, str]) -> None:
+        rows = []
+        for t, tr in items.items():
+            k = self._key(pair, t)
+            self._lru_put(k, tr)
+            rows.append((k, tr))
+        if not rows:
+            return
+        try:
+            await asyncio.to_thread(self._disk_put, pair, rows)
+        except Exception as e:
+            print(f"[promo_embed] falha ao gravar memória de tradução: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits_mem + self.hits_disk + self.misses
+        return {
+            "hits_mem": self.hits_mem,
+            "hits_disk": self.hits_disk,
+            "misses": self.misses,
+            "hit_rate": ((self.hits_mem + self.hits_disk) / total) if total else 0.0,
+            "lru_size": len(self._lru),
+        }
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._db is not None:
+                try:
+                    self._db.close()
+                except Exception:
+                    pass
+                self._db = None
+
+
+class _ApertiumWorker:
+    """
+    Um `apertium -z -f txt <par>` vivo. No modo -z cada bloco terminado em
+    NUL é traduzido e devolvido também terminado em NUL, então dá pra mandar
+    várias strings de uma vez e ler uma resposta por string.
+    """
+
+    def __init__(self, pair: str, env: dict) -> None:
+        self.pair = pair
+        self.env = env
+        self.proc: Optional[asyncio.subprocess.Process] = None
+
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.returncode is None
+
+    async def start(self) -> None:
+        self.proc = await asyncio.create_subprocess_exec(
+            "apertium", "-z", "-f", "txt", self.pair,
+            cwd=BASE_DIR,
+            env=self.env,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+
+    async def translate_many(self, texts: List[str], timeout: float) -> List[str]:
+        if not self.alive():
+            await self.start()
+        assert self.proc and self.proc.stdin and self.proc.stdout
+
+        payload = b"".join(t.replace("\0", "").encode("utf-8") + b"\0" for t in texts)
+
+        async def _write() -> None:
+            self.proc.stdin.write(payload)
+            await self.proc.stdin.drain()
+
+        # escreve em paralelo com a leitura (evita travar com pipe cheio)
+        writer = asyncio.create_task(_write())
+        try:
+            out: List[str] = []
+            for _ in texts:
+                chunk = await asyncio.wait_for(self.proc.stdout.readuntil(b"\0"), timeout=timeout)
+                out.append(chunk[:-1].decode("utf-8", errors="ignore"))
+            await writer
+            return out
+        finally:
+            if not writer.done():
+                writer.cancel()
+
+    async def close(self) -> None:
+        proc, self.proc = self.proc, None
+        if proc is None or proc.returncode is not None:
+            return
+        try:
+            if proc.stdin:
+                proc.stdin.close()
+            await asyncio.wait_for(proc.wait(), timeout=2.0)
+        except Exception:
+            try:
+                proc.kill()
+            except Exception:
+                pass
+
+
 class ApertiumManager:
     def __init__(self) -> None:
         self.ready = False
         self.err: Optional[str] = None
         self._lock = asyncio.Lock()
-        self._cache: Dict[Tuple[str, str], str] = {}  # (pair, text)->out
+        self.memory = TranslationMemory()  # frase -> tradução (RAM + disco)
+
+        # pool de workers ociosos (criados sob demanda até APERTIUM_WORKERS)
+        self._idle: Optional[asyncio.Queue] = None
+        self._spawned = 0
 
     def _env(self) -> dict:
         env = os.environ.copy()
@@ -461,34 +689,154 @@ class ApertiumManager:
             self.err = None
             return True
 
-    async def translate_text(self, text: str) -> Optional[str]:
-        t = _clean_text(text)
-        if not t:
-            return ""
-
-        pair = (APERTIUM_PAIR or "").strip()
-        key = (pair, t)
-        if key in self._cache:
-            return self._cache[key]
-
-        ok = await self.ensure_ready()
-        if not ok:
-            return None
+    # ---- pool de workers ----
+    async def _acquire_worker(self, pair: str) -> _ApertiumWorker:
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+        if self._idle.empty() and self._spawned < APERTIUM_WORKERS:
+            self._spawned += 1
+            return _ApertiumWorker(pair, self._env())
+        w = await self._idle.get()
+        if w.pair != pair:
+            # par mudou (reload do utils): recicla
+            await w.close()
+            w = _ApertiumWorker(pair, self._env())
+        return w
+
+    def _release_worker(self, w: _ApertiumWorker) -> None:
+        if self._idle is not None:
+            self._idle.put_nowait(w)
+
+    async def close(self) -> None:
+        self.memory.close()
+        if self._idle is None:
+            return
+        while not self._idle.empty():
+            await self._idle.get_nowait().close()
 
+    async def _translate_spawn(self, pair: str, text: str) -> Optional[str]:
+        """Caminho antigo: 1 processo por string (fallback e benchmark)."""
         rc, out, err = await self._run(
             ["apertium", "-f", "txt", pair],
-            inp=t,
-            timeout=40.0,
+            inp=text,
+            timeout=APERTIUM_TIMEOUT,
         )
         if rc != 0:
             self.ready = False
             self.err = (err.strip() or f"apertium rc={rc}")
             return None
-
-        out = _clean_text(out)
-        self._cache[key] = out
         return out
 
+    async def _translate_worker(self, pair: str, texts: List[str]) -> Optional[List[str]]:
+        w = await self._acquire_worker(pair)
+        try:
+            # 2 tentativas: se o processo morreu/travou, reinicia e tenta de novo
+            for attempt in range(2):
+                try:
+                    return await w.translate_many(texts, timeout=APERTIUM_TIMEOUT)
+                except asyncio.CancelledError:
+                    await w.close()
+                    raise
+                except Exception as e:
+                    await w.close()
+                    if attempt == 1:
+                        print(f"[promo_embed] worker Apertium falhou: {type(e).__name__}: {e}")
+            return None
+        finally:
+            self._release_worker(w)
+
+    async def translate_many(self, texts: List[str]) -> List[Optional[str]]:
+        """
+        Traduz várias strings numa ida só ao worker. O cache é por frase:
+        descrições que repetem frases prontas reaproveitam o que já foi traduzido.
+        """
+        pair = (APERTIUM_PAIR or "").strip()
+        cleaned = [_clean_text(t) for t in texts]
+        parts = [_split_sentences(t) if t else [] for t in cleaned]
+
+        # frases = posições pares; separadores = ímpares
+        sentences = list(dict.fromkeys(
+            seg.strip() for p in parts for seg in p[0::2] if seg.strip()
+        ))
+        known = await self.memory.get_many(pair, sentences) if sentences else {}
+        missing = [x for x in sentences if x not in known]
+
+        if missing:
+            ok = await self.ensure_ready()
+            if ok:
+                outs = await self._translate_worker(pair, missing)
+                if outs is None:
+                    # worker não subiu: cai pro spawn por frase
+                    outs = []
+                    for t in missing:
+                        outs.append(await self._translate_spawn(pair, t))
+                fresh = {t: _clean_text(o) for t, o in zip(missing, outs) if o is not None}
+                await self.memory.put_many(pair, fresh)
+                known.update(fresh)
+
+        result: List[Optional[str]] = []
+        for p in parts:
+            out: List[str] = []
+            for i, seg in enumerate(p):
+                if i % 2 == 1:
+                    out.append(seg)  # separador original
+                    continue
+                key = seg.strip()
+                if not key:
+                    out.append(seg)
+                    continue
+                tr = known.get(key)
+                if tr is None:
+                    out = None
+                    break
+                out.append(tr)
+            result.append("".join(out).strip() if out is not None else None)
+        return result
+
+    async def translate_text(self, text: str) -> Optional[str]:
+        return (await self.translate_many([text]))[0]
+
+
+# --------------------
+# Plano de fetch (concorrente + prazo global)
+# --------------------
+class _FetchPlan:
+    """
+    Cada request vira UMA task por chave (mesma URL/appdetails não é buscada
+    duas vezes) e todo await respeita o prazo global: estourou, volta o default
+    e o embed sai com o que já chegou.
+    """
+
+    def __init__(self, deadline_sec: float) -> None:
+        self.deadline = time.monotonic() + deadline_sec
+        self._tasks: Dict[Any, asyncio.Task] = {}
+
+    def start(self, key: Any, factory) -> asyncio.Task:
+        t = self._tasks.get(key)
+        if t is None:
+            t = asyncio.create_task(factory())
+            self._tasks[key] = t
+        return t
+
+    async def get(self, key: Any, factory, default: Any = None) -> Any:
+        t = self.start(key, factory)
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0 and not t.done():
+            return default
+        try:
+            return await asyncio.wait_for(asyncio.shield(t), timeout=max(0.0, remaining))
+        except asyncio.TimeoutError:
+            return default
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            return default
+
+    def cancel_pending(self) -> None:
+        for t in self._tasks.values():
+            if not t.done():
+                t.cancel()
+
 
 # --------------------
 # Cog
@@ -501,14 +849,31 @@ class PromoEmbed(commands.Cog):
         self._lock = asyncio.Lock()
         self._stores_loaded_once = False
         self.translator = ApertiumManager()
+        self.catalog = SteamCatalog()
+        self._catalog_task: Optional[asyncio.Task] = None
 
     async def cog_load(self) -> None:
-        timeout = aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
-        self.session = aiohttp.ClientSession(timeout=timeout)
+        self.session = http_clients.session("promo", timeout=HTTP_TIMEOUT)
+        self._reload_catalog_bg()
+
+    def _reload_catalog_bg(self) -> None:
+        # índice é montado numa thread; enquanto isso busca por título usa a API
+        if self._catalog_task and not self._catalog_task.done():
+            return
+
+        async def _load():
+            n = await asyncio.to_thread(self.catalog.reload)
+            if n:
+                print(f"[promo_embed] Catálogo Steam: {n} apps")
+            elif self.catalog.err:
+                print(f"[promo_embed] Catálogo Steam indisponível: {self.catalog.err}")
+
+        self._catalog_task = asyncio.create_task(_load())
 
     async def cog_unload(self) -> None:
-        if self.session and not self.session.closed:
-            await self.session.close()
+        # sessão é do http_clients (fecha no shutdown do processo)
+        self.session = None
+        await self.translator.close()
 
     async def _reload_stores(self) -> int:
         async with self._lock:
@@ -555,7 +920,26 @@ class PromoEmbed(commands.Cog):
 
         tr = _restore_phrases(tr, mp)
         tr = _apertium_postprocess(tr)
-        await interaction.followup.send(f"✅ Apertium OK ({APERTIUM_PAIR})\nEN: {sample}\nPT: {tr}", ephemeral=True)
+        st = self.translator.memory.stats()
+        await interaction.followup.send(
+            f"✅ Apertium OK ({APERTIUM_PAIR})\nEN: {sample}\nPT: {tr}\n"
+            f"📚 Memória: {st['hit_rate']:.0%} acertos "
+            f"(RAM {st['hits_mem']} | disco {st['hits_disk']} | novas {st['misses']})",
+            ephemeral=True,
+        )
+
+    @app_commands.guilds(TEST_GUILD)
+    @app_commands.command(name="steam_catalog_reload", description="Recarrega o catálogo offline da Steam (data/steam_applist.json).")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def steam_catalog_reload(self, interaction: discord.Interaction):
+        if not interaction.response.is_done():
+            await interaction.response.defer(ephemeral=True, thinking=True)
+
+        n = await asyncio.to_thread(self.catalog.reload)
+        if n:
+            await interaction.followup.send(f"✅ Catálogo Steam: **{n}** apps.", ephemeral=True)
+        else:
+            await interaction.followup.send(f"❌ {self.catalog.err} (segue usando a API)", ephemeral=True)
 
     @app_commands.guilds(TEST_GUILD)
     @app_commands.command(name="logos_reload", description="Recarrega logos/cores/cargos lendo os pins do canal de config.")
@@ -708,12 +1092,8 @@ class PromoEmbed(commands.Cog):
             "cc": "us",
         }
         headers = {"User-Agent": "Mozilla/5.0"}
-        try:
-            async with self.session.get(api, params=params, headers=headers) as r:
-                if r.status != 200:
-                    return []
-                j = await r.json()
-        except Exception:
+        j = await http_cache.get_json(self.session, api, params=params, headers=headers)
+        if not isinstance(j, dict):
             return []
 
         items = j.get("items")
@@ -727,19 +1107,29 @@ class PromoEmbed(commands.Cog):
         if len(t) < 2:
             return None
 
+        # 1) catálogo local (sem rede); dump novo no disco = recarrega em background
+        if self.catalog.loaded:
+            if self.catalog.stale():
+                self._reload_catalog_bg()
+            hits = self.catalog.search(t, limit=10)
+            best_id = self._best_title_match(t, [(appid, name) for appid, name, _ in hits])
+            if best_id:
+                return best_id
+
+        # 2) API storesearch só pro que o catálogo não resolveu
         items = await self._steam_storesearch(t)
         if not items:
             return None
+        return self._best_title_match(t, [(it.get("id"), (it.get("name") or "").strip()) for it in items[:10]])
 
+    def _best_title_match(self, title: str, candidates: List[Tuple[Any, str]]) -> Optional[int]:
         # pega top N e escolhe por similaridade
         best_id = None
         best_score = 0.0
-        for it in items[:10]:
-            name = (it.get("name") or "").strip()
-            appid = it.get("id")
+        for appid, name in candidates:
             if not name or not isinstance(appid, int):
                 continue
-            score = self._similarity(t, name)
+            score = self._similarity(title, name)
             if score > best_score:
                 best_score = score
                 best_id = appid
@@ -753,16 +1143,48 @@ class PromoEmbed(commands.Cog):
         """
         - Sempre tenta Steam metadata, mesmo se o link for Nuuvem/etc.
         - Preço vem do link (store_key), exceto se manual_price foi dado (cupom).
+        - Requests independentes rodam em paralelo; a página do link é baixada
+          uma vez só (OpenGraph + preço) e tudo respeita FETCH_DEADLINE_SEC.
         """
-        og_title, og_desc, og_img = await self._fetch_opengraph(url)
+        plan = _FetchPlan(FETCH_DEADLINE_SEC)
+        try:
+            return await self._fetch_game_info_planned(plan, url, store_key, manual_price)
+        finally:
+            plan.cancel_pending()
 
+    async def _fetch_game_info_planned(self, plan: _FetchPlan, url: str, store_key: str, manual_price: Optional[str]) -> GameInfo:
         steam_appid = _extract_steam_appid(url)
-        if not steam_appid and og_title:
-            steam_appid = await self._steam_find_appid_by_title(og_title)
+        price_from_page = not manual_price and store_key != "steam"
+
+        def fetch_page():
+            return self._fetch_page(url, for_price=price_from_page)
+
+        def page():
+            return plan.get(("page", url), fetch_page)
+
+        # dispara já o que não depende de nada
+        if not steam_appid or price_from_page:
+            plan.start(("page", url), fetch_page)
+        if steam_appid:
+            self._start_steam_fetches(plan, steam_appid)
+            if store_key == "steam" and not manual_price and self.session:
+                plan.start(("steam_price", steam_appid), lambda: self._steam_price_overview(steam_appid))
+
+        og_title = og_desc = og_img = None
+        if not steam_appid:
+            og_title, og_desc, og_img = self._parse_opengraph(await page())
+            if og_title:
+                steam_appid = await plan.get(("search", og_title), lambda: self._steam_find_appid_by_title(og_title))
+                if steam_appid:
+                    self._start_steam_fetches(plan, steam_appid)
 
         steam_meta: Optional[GameInfo] = None
         if steam_appid and self.session:
-            steam_meta = await self._fetch_steam_metadata(steam_appid, original_url=url, dest_store_key=store_key)
+            steam_meta = await self._fetch_steam_metadata(steam_appid, original_url=url, dest_store_key=store_key, plan=plan)
+
+        if not steam_meta and og_title is None:
+            # Steam não rolou: OpenGraph do link (mesmo download, se já foi feito)
+            og_title, og_desc, og_img = self._parse_opengraph(await page())
 
         # Metadata final (preferência Steam)
         title = (steam_meta.title if steam_meta else (og_title or "Jogo"))
@@ -777,18 +1199,16 @@ class PromoEmbed(commands.Cog):
         if manual_price:
             price_text = manual_price
         else:
-            # se for link steam e temos meta steam, aproveita preço da própria steam
+            # link steam: preço vem do appdetails só com price_overview (cache curto,
+            # ver HTTP_CACHE_RULES); is_free sai do appdetails de metadata
             if store_key == "steam" and steam_appid and self.session:
-                # puxa em PT primeiro (mesma lógica do meta)
-                data_pt = (
-                    await self._steam_appdetails(steam_appid, lang="brazilian", cc="br")
-                    or await self._steam_appdetails(steam_appid, lang="portuguese", cc="br")
-                )
-                data_en = await self._steam_appdetails(steam_appid, lang="english", cc="us")
-                data = data_pt or data_en or {}
-                price_text = self._steam_price_text(data) if data else None
+                po = await plan.get(("steam_price", steam_appid), lambda: self._steam_price_overview(steam_appid))
+                data_pt, data_en = await self._steam_appdetails_pt_en(plan, steam_appid)
+                data = dict(data_pt or data_en or {})
+                data["price_overview"] = po
+                price_text = self._steam_price_text(data)
             else:
-                price_text = await self._fetch_store_price_text(url)
+                price_text = self._parse_store_price(await page())
 
         return GameInfo(
             store_key=store_key,
@@ -800,18 +1220,32 @@ class PromoEmbed(commands.Cog):
             genres=genres[:MAX_GENRES],
         )
 
-    async def _fetch_steam_metadata(self, appid: int, original_url: str, dest_store_key: str) -> Optional[GameInfo]:
+    def _start_steam_fetches(self, plan: _FetchPlan, appid: int) -> None:
+        if not self.session:
+            return
+        plan.start(("appdetails", appid, "brazilian"), lambda: self._steam_appdetails(appid, lang="brazilian", cc="br"))
+        plan.start(("appdetails", appid, "english"), lambda: self._steam_appdetails(appid, lang="english", cc="us"))
+        if USE_STEAMSPY_TAGS:
+            plan.start(("steamspy", appid), lambda: self._fetch_steamspy_tags(appid))
+
+    async def _steam_appdetails_pt_en(self, plan: _FetchPlan, appid: int) -> Tuple[Optional[dict], Optional[dict]]:
+        self._start_steam_fetches(plan, appid)
+        data_pt = await plan.get(("appdetails", appid, "brazilian"), lambda: self._steam_appdetails(appid, lang="brazilian", cc="br"))
+        if not data_pt:
+            data_pt = await plan.get(("appdetails", appid, "portuguese"), lambda: self._steam_appdetails(appid, lang="portuguese", cc="br"))
+        data_en = await plan.get(("appdetails", appid, "english"), lambda: self._steam_appdetails(appid, lang="english", cc="us"))
+        return data_pt, data_en
+
+    async def _fetch_steam_metadata(self, appid: int, original_url: str, dest_store_key: str, plan: Optional[_FetchPlan] = None) -> Optional[GameInfo]:
         """
         Busca title/desc/genres/image na Steam.
         NÃO define preço aqui (porque o preço vem da loja do link, a não ser que o link seja Steam).
         """
         assert self.session is not None
+        if plan is None:
+            plan = _FetchPlan(FETCH_DEADLINE_SEC)
 
-        data_pt = (
-            await self._steam_appdetails(appid, lang="brazilian", cc="br")
-            or await self._steam_appdetails(appid, lang="portuguese", cc="br")
-        )
-        data_en = await self._steam_appdetails(appid, lang="english", cc="us")
+        data_pt, data_en = await self._steam_appdetails_pt_en(plan, appid)
 
         data = data_pt or data_en
         if not data:
@@ -837,7 +1271,7 @@ class PromoEmbed(commands.Cog):
                 phrases.append(m.group(0))
 
             protected, mp = _protect_phrases(desc, phrases)
-            tr = await self.translator.translate_text(protected)
+            tr = await plan.get(("translate", protected), lambda: self.translator.translate_text(protected))
             if tr:
                 tr = _restore_phrases(tr, mp)
                 tr = _apertium_postprocess(tr)
@@ -866,7 +1300,7 @@ class PromoEmbed(commands.Cog):
                 break
 
         if USE_STEAMSPY_TAGS and len(genres_final) < MAX_GENRES:
-            tags = await self._fetch_steamspy_tags(appid)
+            tags = await plan.get(("steamspy", appid), lambda: self._fetch_steamspy_tags(appid), default=[])
             tags = [t for t in tags if t not in MAIN_TAGS_EN]
             for t in tags:
                 t2 = translate_genre_fast(t)
@@ -879,12 +1313,10 @@ class PromoEmbed(commands.Cog):
 
         if USE_APERTIUM_TRANSLATE and AUTO_TRANSLATE_GENRES:
             if any(looks_english(x) for x in genres_final):
-                blob = "\n".join(genres_final[:MAX_GENRES])
-                tr = await self.translator.translate_text(blob)
-                if tr:
-                    lines = [_apertium_postprocess(l.strip()) for l in tr.split("\n") if l.strip()]
-                    if lines:
-                        genres_final = lines[:MAX_GENRES]
+                trs = await self.translator.translate_many(genres_final[:MAX_GENRES])
+                lines = [_apertium_postprocess(l.strip()) for l in trs if l and l.strip()]
+                if lines:
+                    genres_final = lines[:MAX_GENRES]
 
         return GameInfo(
             store_key=dest_store_key,    # loja do link (não "steam")
@@ -900,19 +1332,31 @@ class PromoEmbed(commands.Cog):
         assert self.session is not None
         api = f"https://store.steampowered.com/api/appdetails?appids={appid}&l={lang}&cc={cc}"
         headers = {"User-Agent": "Mozilla/5.0"}
-        try:
-            async with self.session.get(api, headers=headers) as r:
-                if r.status != 200:
-                    return None
-                j = await r.json()
-        except Exception:
+        j = await http_cache.get_json(self.session, api, headers=headers)
+        if not isinstance(j, dict):
             return None
 
-        root = j.get(str(appid), {})
+        root = j.get(str(appid)) or {}
         if not root.get("success"):
             return None
         return root.get("data") or {}
 
+    async def _steam_price_overview(self, appid: int, cc: str = "br") -> Optional[dict]:
+        """
+        Só o price_overview (resposta pequena). URL separada do appdetails de
+        metadata pra ter TTL de preço (promo começa/acaba) e não o de 6h.
+        """
+        assert self.session is not None
+        api = f"https://store.steampowered.com/api/appdetails?appids={appid}&cc={cc}&filters=price_overview"
+        headers = {"User-Agent": "Mozilla/5.0"}
+        j = await http_cache.get_json(self.session, api, headers=headers)
+        if not isinstance(j, dict):
+            return None
+        root = j.get(str(appid)) or {}
+        data = root.get("data") if root.get("success") else None
+        # jogo grátis vem com data = [] (sem price_overview)
+        return data.get("price_overview") if isinstance(data, dict) else None
+
     def _steam_price_text(self, data: dict) -> Optional[str]:
         po = data.get("price_overview")
         if isinstance(po, dict):
@@ -931,12 +1375,8 @@ class PromoEmbed(commands.Cog):
             return []
         url = f"https://steamspy.com/api.php?request=appdetails&appid={appid}"
         headers = {"User-Agent": "Mozilla/5.0"}
-        try:
-            async with self.session.get(url, headers=headers) as r:
-                if r.status != 200:
-                    return []
-                j = await r.json()
-        except Exception:
+        j = await http_cache.get_json(self.session, url, headers=headers)
+        if not isinstance(j, dict):
             return []
 
         tags = j.get("tags")
@@ -946,28 +1386,37 @@ class PromoEmbed(commands.Cog):
         return [k for k, _ in ordered]
 
     # --------------------
-    # OpenGraph (fallback)
+    # Página do link (baixada 1x, usada pelo OpenGraph e pelo preço)
     # --------------------
-    async def _fetch_opengraph(self, url: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    async def _fetch_page(self, url: str, for_price: bool = False) -> Optional[str]:
+        """
+        Só o começo da página: <head> (OpenGraph) e, se for_price, até fechar
+        um JSON-LD com offers/price. Sem ele, lê até MAX_PAGE_BYTES pro
+        fallback por regex do _parse_store_price ter o corpo da página.
+        """
         if not self.session:
-            return None, None, None
+            return None
 
         headers = {"User-Agent": "Mozilla/5.0"}
-        try:
-            async with self.session.get(url, headers=headers, allow_redirects=True) as r:
-                if r.status != 200:
-                    return None, None, None
-                html_text = await r.text(errors="ignore")
-        except Exception:
+        return await fetch_head(
+            self.session,
+            url,
+            headers=headers,
+            jsonld_with=_PRICE_JSONLD_MARKERS if for_price else (),
+        )
+
+    # --------------------
+    # OpenGraph (fallback)
+    # --------------------
+    def _parse_opengraph(self, html_text: Optional[str]) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        if not html_text:
             return None, None, None
 
+        metas = parse_meta(html_text)
+
         def meta(prop: str) -> Optional[str]:
-            m = re.search(
-                rf'<meta[^>]+(?:property|name)=["\']{re.escape(prop)}["\'][^>]+content=["\']([^"\']+)["\']',
-                html_text,
-                re.I,
-            )
-            return _clean_text(m.group(1)) if m else None
+            v = metas.get(prop)
+            return _clean_text(v) if v else None
 
         title = meta("og:title") or meta("twitter:title")
         desc = meta("og:description") or meta("description") or meta("twitter:description")
@@ -977,38 +1426,20 @@ class PromoEmbed(commands.Cog):
     # --------------------
     # Preço: loja do LINK
     # --------------------
-    async def _fetch_store_price_text(self, url: str) -> Optional[str]:
+    def _parse_store_price(self, html_text: Optional[str]) -> Optional[str]:
         """
         Extrator genérico (bem mais robusto que regex puro):
         1) JSON-LD (offers->price/currency)
         2) meta product:price / og:price
         3) fallback regex de valores (R$, US$, €, £)
         """
-        if not self.session:
-            return None
-
-        headers = {"User-Agent": "Mozilla/5.0"}
-        try:
-            async with self.session.get(url, headers=headers, allow_redirects=True) as r:
-                if r.status != 200:
-                    return None
-                html_text = await r.text(errors="ignore")
-        except Exception:
+        if not html_text:
             return None
 
         txt = html_text
 
         # ---- 1) JSON-LD ----
-        for m in re.finditer(r'<script[^>]+type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', txt, flags=re.I | re.S):
-            blob = (m.group(1) or "").strip()
-            if not blob:
-                continue
-            blob = blob.strip()
-            try:
-                data = json.loads(blob)
-            except Exception:
-                continue
-
+        for data in parse_jsonld(txt):
             price, currency = self._jsonld_find_price(data)
             if price:
                 if currency:
@@ -1017,17 +1448,19 @@ class PromoEmbed(commands.Cog):
                 return str(price).strip()
 
         # ---- 2) meta tags ----
-        def meta_content(pattern: str) -> Optional[str]:
-            mm = re.search(pattern, txt, flags=re.I)
-            return _clean_text(mm.group(1)) if mm else None
+        metas = parse_meta(txt)
+
+        def meta_content(prop: str) -> Optional[str]:
+            v = metas.get(prop)
+            return _clean_text(v) if v else None
 
-        amount = meta_content(r'<meta[^>]+property=["\']product:price:amount["\'][^>]+content=["\']([^"\']+)["\']')
-        curr = meta_content(r'<meta[^>]+property=["\']product:price:currency["\'][^>]+content=["\']([^"\']+)["\']')
+        amount = meta_content("product:price:amount")
+        curr = meta_content("product:price:currency")
         if amount:
             return self._format_price_from_components(amount, curr or "")
 
-        amount = meta_content(r'<meta[^>]+property=["\']og:price:amount["\'][^>]+content=["\']([^"\']+)["\']')
-        curr = meta_content(r'<meta[^>]+property=["\']og:price:currency["\'][^>]+content=["\']([^"\']+)["\']')
+        amount = meta_content("og:price:amount")
+        curr = meta_content("og:price:currency")
         if amount:
             return self._format_price_from_components(amount, curr or "")
 
@@ -3,9 +3,13 @@ from discord.ext import commands
 
 log = logging.getLogger("cog_loader")
 
-PROTECTED_COGS = {
-    "cogs.ai_chat.ai_chat",
-}
+# ai_chat saiu daqui: o estado do ChatCore vai num snapshot no cog_unload e
+# volta no cog_load (cogs/ai_chat/ai_chat.py), então reload não perde conversa
+PROTECTED_COGS = set()
+
+# módulos que o main.py importa direto e guarda instância própria: reload do
+# pacote não troca o objeto que já está rodando (precisa reiniciar o bot)
+PINNED_MODULES = {"cogs.ai_chat.welcome_bridge"}
 
 
 class AdminReload(commands.Cog):
@@ -13,10 +17,24 @@ class AdminReload(commands.Cog):
         self.bot = bot
         log.info("[ADMIN] Cog AdminReload carregado")
 
+    def _owning_extension(self, ext: str) -> str:
+        """
+        "cogs.ai_chat.core" não é extension: quem está carregado é o pacote
+        "cogs.ai_chat". Recarregar o pacote tira TODOS os cogs.ai_chat.* do
+        sys.modules (o discord.py faz isso), então core/buffers/etc. voltam
+        com o código novo.
+        """
+        parts = ext.split(".")
+        for i in range(len(parts), 1, -1):
+            cand = ".".join(parts[:i])
+            if cand in self.bot.extensions:
+                return cand
+        return ext
+
     @commands.command(name="reload")
     @commands.has_permissions(administrator=True)
     async def reload(self, ctx: commands.Context, cog: str):
-        ext = f"cogs.{cog}"
+        ext = self._owning_extension(f"cogs.{cog}")
 
         if ext in PROTECTED_COGS:
             log.warning(f"[ADMIN] Tentativa de reload bloqueada: {ext}")
@@ -28,7 +46,13 @@ class AdminReload(commands.Cog):
             await self.bot.reload_extension(ext)
 
             log.info(f"[ADMIN] Cog recarregado com sucesso: {ext}")
-            await ctx.send(f"`{cog}` recarregado.")
+            msg = f"`{ext.removeprefix('cogs.')}` recarregado."
+            if hasattr(self.bot.extensions.get(ext), "__path__"):
+                msg += " (pacote inteiro: submódulos recarregados juntos)"
+            pinned = sorted(m for m in PINNED_MODULES if m.startswith(ext + "."))
+            if pinned:
+                msg += "\n⚠️ Importados pelo main.py, continuam com o código antigo até reiniciar: " + ", ".join(f"`{m}`" for m in pinned)
+            await ctx.send(msg)
 
         except Exception as e:
             log.exception(f"[ADMIN] Erro ao recarregar {ext}")
@@ -1,17 +1,48 @@
 # cogs/voice_rooms.py
 import asyncio
+import heapq
+import json
+import os
 import time
 from typing import Optional  # ✅ FIX: faltava isso
 
 import discord
 from discord.ext import commands
-from utils import CANAL_FIXO_CONFIG
+from utils import CANAL_FIXO_CONFIG, VOICE_WARM_POOL_SIZE
+from rest_queue import rest_queue, PRIORITY_USER, PRIORITY_BACKGROUND
+
+# nome das salas ocultas pré-criadas (depois do prefixo do gatilho)
+POOL_ROOM_SUFFIX = "livre"
+
+# dono das salas + pool sobrevivem a restart/deploy
+STATE_PATH = "data/voice_rooms.json"
+STATE_FLUSH_SEC = 5.0  # write-behind: junta várias mudanças numa escrita só
+
+
+def _load_state() -> dict:
+    try:
+        if os.path.isfile(STATE_PATH):
+            with open(STATE_PATH, "r", encoding="utf-8") as f:
+                data = json.load(f)
+                if isinstance(data, dict):
+                    return data
+    except Exception as e:
+        print(f"[VoiceRooms] estado ilegível, ignorando: {e}")
+    return {}
+
+
+def _save_state(data: dict) -> None:
+    os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+    tmp = STATE_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, STATE_PATH)
 
 class VoiceRoomsCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
-        # {channel_id: {"owner": int, "fixo": int, "created_at": float}}
+        # {channel_id: {"owner": int, "fixo": int, "guild": int, "created_at": float}}
         self.created = {}
 
         # ✅ AGORA: (guild_id, fixo_id, user_id) -> channel_id  (1 sala por pessoa POR FIXO)
@@ -23,7 +54,11 @@ class VoiceRoomsCog(commands.Cog):
         # debounce agora serve só para evitar DUPLA CRIAÇÃO, mas NÃO pode impedir redirecionar
         self._debounce_seconds = 1.2
 
-        self._delete_tasks = {}       # channel_id -> Task
+        # reaper único: heap de (prazo, channel_id) + prazo vigente por canal
+        self._reap_heap = []
+        self._reap_due = {}           # channel_id -> prazo (monotonic)
+        self._reap_wake = asyncio.Event()
+        self._reaper_task = None
         self._delete_delay = 6.0      # aumentado p/ evitar corrida (entrar no fix e voltar)
 
         self._cat_cache = {}          # (guild_id, category_id) -> CategoryChannel|None
@@ -32,32 +67,160 @@ class VoiceRoomsCog(commands.Cog):
         self._allowed_category_ids = {cfg["categoria_id"] for cfg in CANAL_FIXO_CONFIG.values()}
         self._prefixes = tuple({cfg["prefixo_nome"] for cfg in CANAL_FIXO_CONFIG.values()})
 
+        # varredura agora é só reconciliação (salas de antes do boot / eventos perdidos)
         self._cleanup_task = None
-        self._cleanup_interval = 60.0
+        self._cleanup_interval = 30 * 60.0
 
         # lock por usuário (evita corrida se o Discord mandar múltiplos eventos)
         self._user_locks = {}         # (guild_id, user_id) -> asyncio.Lock
 
+        # salas quentes: fixo_id -> [channel_id] (ocultas, vazias, prontas pra entregar)
+        self._pool = {}
+        self._pool_ids = set()
+        self._pool_tasks = {}         # fixo_id -> Task de reposição
+
+        # persistência (write-behind)
+        self._state_dirty = False
+        self._state_task = None
+        self._load_persisted()
+
     # ---------- background ----------
     def start_background(self):
         if self._cleanup_task and not self._cleanup_task.done():
             return
         self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+        self._reaper_task = asyncio.create_task(self._reaper_loop())
+        asyncio.create_task(self._restore_after_ready())
 
     def cog_unload(self):
-        try:
-            if self._cleanup_task and not self._cleanup_task.done():
-                self._cleanup_task.cancel()
-        except Exception:
-            pass
-
-        for t in list(self._delete_tasks.values()):
+        for t in [self._cleanup_task, self._reaper_task] + list(self._pool_tasks.values()):
             try:
                 if t and not t.done():
                     t.cancel()
             except Exception:
                 pass
-        self._delete_tasks.clear()
+        self._pool_tasks.clear()
+        self._reap_heap.clear()
+        self._reap_due.clear()
+
+        # garante que nada pendente do write-behind se perca no reload
+        if self._state_task and not self._state_task.done():
+            self._state_task.cancel()
+        if self._state_dirty:
+            self._flush_state()
+
+    # ---------- persistência ----------
+    def _load_persisted(self):
+        data = _load_state()
+
+        for cid, info in (data.get("rooms") or {}).items():
+            try:
+                cid = int(cid)
+                entry = {
+                    "owner": int(info["owner"]),
+                    "fixo": int(info["fixo"]),
+                    "guild": int(info["guild"]),
+                    "created_at": float(info.get("created_at", 0.0) or 0.0),
+                }
+            except Exception:
+                continue
+            self.created[cid] = entry
+
+        self._rebuild_owner_map()
+
+        for fixo_id, ids in (data.get("pool") or {}).items():
+            try:
+                fixo_id = int(fixo_id)
+            except Exception:
+                continue
+            if fixo_id not in CANAL_FIXO_CONFIG:
+                continue
+            for cid in ids or []:
+                self._pool.setdefault(fixo_id, []).append(int(cid))
+                self._pool_ids.add(int(cid))
+
+    def _rebuild_owner_map(self):
+        # sala mais recente de cada (guild, fixo, dono)
+        self._owner_room = {}
+        for cid, info in sorted(self.created.items(), key=lambda kv: kv[1].get("created_at", 0.0)):
+            if not info.get("guild"):
+                continue
+            key = self._session_key(info["guild"], info["fixo"], info["owner"])
+            self._owner_room[key] = cid
+
+    def _snapshot(self) -> dict:
+        return {
+            "rooms": {str(cid): info for cid, info in self.created.items()},
+            "pool": {str(fixo_id): list(ids) for fixo_id, ids in self._pool.items() if ids},
+        }
+
+    def _flush_state(self):
+        self._state_dirty = False
+        try:
+            _save_state(self._snapshot())
+        except Exception as e:
+            self._state_dirty = True
+            print(f"[VoiceRooms] falha ao salvar estado: {e}")
+
+    def _mark_dirty(self):
+        self._state_dirty = True
+        if self._state_task and not self._state_task.done():
+            return
+        try:
+            self._state_task = asyncio.create_task(self._flush_later())
+        except RuntimeError:
+            # sem loop rodando (ex.: durante o __init__): salva direto
+            self._flush_state()
+
+    async def _flush_later(self):
+        try:
+            await asyncio.sleep(STATE_FLUSH_SEC)
+        except asyncio.CancelledError:
+            return
+        if self._state_dirty:
+            self._flush_state()
+
+    async def _restore_after_ready(self):
+        """
+        Uma passada só contra o cache do gateway: descarta o que sumiu,
+        manda pro reaper as salas vazias e repõe a pool.
+        """
+        try:
+            await self.bot.wait_until_ready()
+        except Exception:
+            return
+
+        changed = False
+        for cid in list(self.created.keys()):
+            ch = self.bot.get_channel(cid)
+            if not isinstance(ch, discord.VoiceChannel):
+                self.created.pop(cid, None)
+                changed = True
+                continue
+            if len(ch.members) == 0:
+                self._schedule_reap(cid, self._delete_delay)
+
+        for fixo_id, ids in list(self._pool.items()):
+            keep = []
+            for cid in ids:
+                ch = self.bot.get_channel(cid)
+                if isinstance(ch, discord.VoiceChannel) and len(ch.members) == 0:
+                    keep.append(cid)
+                else:
+                    self._pool_ids.discard(cid)
+                    changed = True
+            self._pool[fixo_id] = keep
+
+        if changed:
+            self._rebuild_owner_map()
+            self._mark_dirty()
+
+        self._trim_pool()
+
+        for guild in list(self.bot.guilds):
+            for fixo_id in CANAL_FIXO_CONFIG:
+                if guild.get_channel(fixo_id) is not None:
+                    self._schedule_refill(guild, fixo_id)
 
     # ---------- utils ----------
     def _get_lock(self, guild_id: int, user_id: int) -> asyncio.Lock:
@@ -81,10 +244,26 @@ class VoiceRoomsCog(commands.Cog):
         return cat
 
     def _cancel_delete_if_any(self, channel_id: int):
-        t = self._delete_tasks.get(channel_id)
-        if t and not t.done():
-            t.cancel()
-        self._delete_tasks.pop(channel_id, None)
+        # a entrada no heap fica lá e é descartada quando vencer (prazo não bate mais)
+        self._reap_due.pop(channel_id, None)
+
+    def _schedule_reap(self, channel_id: int, delay: float):
+        due = time.monotonic() + delay
+        self._reap_due[channel_id] = due
+        heapq.heappush(self._reap_heap, (due, channel_id))
+        self._reap_wake.set()
+
+    def _track_room(self, session_key, channel_id: int):
+        guild_id, fixo_id, user_id = session_key
+        self.created[channel_id] = {"owner": user_id, "fixo": fixo_id, "guild": guild_id, "created_at": time.time()}
+        self._owner_room[session_key] = channel_id
+        self._mark_dirty()
+
+    def _forget_room(self, channel_id: int):
+        self.created.pop(channel_id, None)
+        self._reap_due.pop(channel_id, None)
+        self._remove_owner_mapping_for_channel(channel_id)
+        self._mark_dirty()
 
     def _remove_owner_mapping_for_channel(self, channel_id: int):
         # ✅ agora _owner_room é (guild, fixo, user) -> channel
@@ -93,29 +272,89 @@ class VoiceRoomsCog(commands.Cog):
                 self._owner_room.pop(key, None)
 
     async def _move_with_retry(self, member: discord.Member, channel: Optional[discord.VoiceChannel], reason: str, tries: int = 3):
-        for i in range(tries):
-            try:
-                await member.move_to(channel, reason=reason)  # channel=None desconecta
-                return True
-            except Exception as e:
-                if i == tries - 1:
-                    print(f"[VoiceRooms] move falhou ({reason}): {e}")
-                await asyncio.sleep(0.25 + 0.20 * i)
-        return False
+        # retry/backoff ficam no rest_queue
+        try:
+            await rest_queue.run(
+                "member_move",
+                member.guild.id,
+                lambda: member.move_to(channel, reason=reason),  # channel=None desconecta
+                priority=PRIORITY_USER,
+                retries=tries - 1,
+            )
+            return True
+        except Exception as e:
+            print(f"[VoiceRooms] move falhou ({reason}): {e}")
+            return False
+
+    def _queue_delete(self, channel: discord.VoiceChannel, reason: str) -> asyncio.Future:
+        async def _do():
+            # confere de novo na hora de executar (pode ter entrado alguém enquanto estava na fila)
+            if len(channel.members) != 0:
+                return False
+            await channel.delete(reason=reason)
+            return True
+
+        return rest_queue.submit(
+            "channel_delete",
+            channel.guild.id,
+            _do,
+            coalesce_key=("delete", channel.id),
+            priority=PRIORITY_BACKGROUND,
+        )
 
-    async def _schedule_delete_if_empty(self, channel: discord.VoiceChannel):
-        await asyncio.sleep(self._delete_delay)
-        ch_id = getattr(channel, "id", 0)
+    async def _delete_if_empty(self, channel: discord.VoiceChannel, reason: str) -> bool:
+        return await self._queue_delete(channel, reason)
 
-        try:
-            if channel and len(channel.members) == 0:
-                await channel.delete(reason="Sala dinâmica vazia (auto)")
-        except Exception:
-            pass
-        finally:
-            self.created.pop(ch_id, None)
-            self._delete_tasks.pop(ch_id, None)
-            self._remove_owner_mapping_for_channel(ch_id)
+    def _reap(self, channel_id: int):
+        if channel_id in self._pool_ids:
+            return
+        ch = self.bot.get_channel(channel_id)
+        if not isinstance(ch, discord.VoiceChannel):
+            # já sumiu (apagado na mão etc.)
+            self._forget_room(channel_id)
+            return
+        if len(ch.members) != 0:
+            return
+
+        def _done(fut: asyncio.Future):
+            if fut.cancelled():
+                return
+            e = fut.exception()
+            if e is None and fut.result():
+                self._forget_room(channel_id)
+            elif isinstance(e, discord.NotFound):
+                self._forget_room(channel_id)
+
+        self._queue_delete(ch, "Sala dinâmica vazia (auto)").add_done_callback(_done)
+
+    async def _reaper_loop(self):
+        """
+        Um único loop pra todas as salas vazias: dorme até o próximo prazo
+        do heap (ou até chegar um novo agendamento).
+        """
+        while True:
+            try:
+                now = time.monotonic()
+                while self._reap_heap and self._reap_heap[0][0] <= now:
+                    due, cid = heapq.heappop(self._reap_heap)
+                    if self._reap_due.get(cid) != due:
+                        continue  # cancelado ou reagendado
+                    self._reap_due.pop(cid, None)
+                    try:
+                        self._reap(cid)
+                    except Exception as e:
+                        print(f"[VoiceRooms] reaper falhou em {cid}: {e}")
+
+                timeout = (self._reap_heap[0][0] - now) if self._reap_heap else None
+                self._reap_wake.clear()
+                try:
+                    await asyncio.wait_for(self._reap_wake.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                return
+            except Exception:
+                await asyncio.sleep(1.0)
 
     async def _cleanup_loop(self):
         try:
@@ -125,59 +364,185 @@ class VoiceRoomsCog(commands.Cog):
 
         while not self.bot.is_closed():
             try:
+                # roda 1x logo após o boot e depois raramente
+                self._reconcile()
                 await asyncio.sleep(self._cleanup_interval)
-
-                for guild in list(self.bot.guilds):
-                    me = guild.me
-                    if not me:
-                        continue
-
-                    for vc in list(guild.voice_channels):
-                        try:
-                            if vc.id in self._trigger_ids:
-                                continue
-                            if not vc.category or vc.category.id not in self._allowed_category_ids:
-                                continue
-                            if not vc.name.startswith(self._prefixes):
-                                continue
-                            if len(vc.members) != 0:
-                                continue
-                            if not vc.permissions_for(me).manage_channels:
-                                continue
-
-                            await vc.delete(reason="Limpeza de sobras (auto)")
-                            self.created.pop(vc.id, None)
-                            self._delete_tasks.pop(vc.id, None)
-                            self._remove_owner_mapping_for_channel(vc.id)
-                        except Exception:
-                            continue
-
             except asyncio.CancelledError:
                 return
             except Exception:
+                await asyncio.sleep(60.0)
+
+    def _reconcile(self):
+        """
+        Reconciliação: só olha as categorias dos gatilhos e joga no reaper
+        salas vazias que escaparam (sobras de antes do boot, evento perdido).
+        """
+        self._trim_pool()
+
+        for guild in list(self.bot.guilds):
+            me = guild.me
+            if not me:
                 continue
 
-    async def _create_room(self, guild: discord.Guild, base_vc: discord.VoiceChannel, categoria: Optional[discord.CategoryChannel], prefixo: str, member: discord.Member):
+            for cat_id in self._allowed_category_ids:
+                cat = self._get_category_cached(guild, cat_id)
+                if cat is None:
+                    continue
+                for vc in cat.voice_channels:
+                    if vc.id in self._trigger_ids or vc.id in self._pool_ids or vc.id in self._reap_due:
+                        continue
+                    if vc.id not in self.created and not vc.name.startswith(self._prefixes):
+                        continue
+                    if len(vc.members) != 0:
+                        continue
+                    if not vc.permissions_for(me).manage_channels:
+                        continue
+                    self._schedule_reap(vc.id, 0.0)
+
+    def _room_overwrites(self, base_vc: discord.VoiceChannel, member: Optional[discord.Member] = None):
         # copia perms do fixo e garante dono
         overwrites = dict(base_vc.overwrites)
-        ow = overwrites.get(member)
-        if ow is None:
-            ow = discord.PermissionOverwrite()
-        ow.view_channel = True
-        ow.connect = True
-        ow.speak = True
-        overwrites[member] = ow
-
-        novo = await guild.create_voice_channel(
-            name=f"{prefixo}{member.display_name}",
-            category=(categoria or base_vc.category),
-            overwrites=overwrites,
-            bitrate=getattr(base_vc, "bitrate", None),
-            user_limit=getattr(base_vc, "user_limit", 0),
-            reason="Sala dinâmica criada (gatilho)",
+        if member is not None:
+            ow = overwrites.get(member)
+            if ow is None:
+                ow = discord.PermissionOverwrite()
+            ow.view_channel = True
+            ow.connect = True
+            ow.speak = True
+            overwrites[member] = ow
+        return overwrites
+
+    def _hidden_overwrites(self, guild: discord.Guild):
+        # sala da pool: ninguém vê, só o bot
+        overwrites = {guild.default_role: discord.PermissionOverwrite(view_channel=False, connect=False)}
+        if guild.me:
+            overwrites[guild.me] = discord.PermissionOverwrite(view_channel=True, connect=True, manage_channels=True, move_members=True)
+        return overwrites
+
+    async def _create_room(self, guild: discord.Guild, base_vc: discord.VoiceChannel, categoria: Optional[discord.CategoryChannel], prefixo: str, member: discord.Member):
+        overwrites = self._room_overwrites(base_vc, member)
+
+        novo = await rest_queue.run(
+            "channel_create",
+            guild.id,
+            lambda: guild.create_voice_channel(
+                name=f"{prefixo}{member.display_name}",
+                category=(categoria or base_vc.category),
+                overwrites=overwrites,
+                bitrate=getattr(base_vc, "bitrate", None),
+                user_limit=getattr(base_vc, "user_limit", 0),
+                reason="Sala dinâmica criada (gatilho)",
+            ),
+            priority=PRIORITY_USER,
         )
         return novo
 
+    # ---------- salas quentes (pool) ----------
+    def _pool_size(self, fixo_id: int) -> int:
+        cfg = CANAL_FIXO_CONFIG.get(int(fixo_id)) or {}
+        try:
+            return max(0, int(cfg.get("pool", VOICE_WARM_POOL_SIZE) or 0))
+        except Exception:
+            return 0
+
+    def _trim_pool(self):
+        # tamanho configurado diminuiu (ou virou 0): sobras vão pro reaper
+        for fixo_id, ids in list(self._pool.items()):
+            extra = len(ids) - self._pool_size(fixo_id)
+            if extra <= 0:
+                continue
+            for cid in ids[:extra]:
+                self._pool_ids.discard(cid)
+                self._schedule_reap(cid, 0.0)
+            del ids[:extra]
+            self._mark_dirty()
+
+    def _take_pooled(self, guild: discord.Guild, fixo_id: int) -> Optional[discord.VoiceChannel]:
+        ids = self._pool.get(int(fixo_id)) or []
+        while ids:
+            cid = ids.pop()
+            self._pool_ids.discard(cid)
+            self._mark_dirty()
+            ch = guild.get_channel(cid)
+            if isinstance(ch, discord.VoiceChannel) and len(ch.members) == 0:
+                return ch
+        return None
+
+    def _return_to_pool(self, fixo_id: int, channel: discord.VoiceChannel):
+        self._cancel_delete_if_any(channel.id)
+        self._pool.setdefault(int(fixo_id), []).append(channel.id)
+        self._pool_ids.add(channel.id)
+        self._mark_dirty()
+
+    def _schedule_refill(self, guild: discord.Guild, fixo_id: int):
+        fixo_id = int(fixo_id)
+        if self._pool_size(fixo_id) <= 0:
+            return
+        t = self._pool_tasks.get(fixo_id)
+        if t and not t.done():
+            return
+        self._pool_tasks[fixo_id] = asyncio.create_task(self._refill_pool(guild, fixo_id))
+
+    async def _refill_pool(self, guild: discord.Guild, fixo_id: int):
+        base_vc = guild.get_channel(fixo_id)
+        if not isinstance(base_vc, discord.VoiceChannel):
+            return
+        cfg = CANAL_FIXO_CONFIG[fixo_id]
+        categoria = self._get_category_cached(guild, cfg["categoria_id"]) or base_vc.category
+        target = self._pool_size(fixo_id)
+
+        while len(self._pool.get(fixo_id) or []) < target:
+            try:
+                # prioridade baixa: o rest_queue segura isso quando tem usuário esperando
+                ch = await rest_queue.run(
+                    "channel_create",
+                    guild.id,
+                    lambda: guild.create_voice_channel(
+                        name=f"{cfg['prefixo_nome']}{POOL_ROOM_SUFFIX}",
+                        category=categoria,
+                        overwrites=self._hidden_overwrites(guild),
+                        bitrate=getattr(base_vc, "bitrate", None),
+                        user_limit=getattr(base_vc, "user_limit", 0),
+                        reason="Sala quente (pool)",
+                    ),
+                    priority=PRIORITY_BACKGROUND,
+                )
+            except asyncio.CancelledError:
+                return
+            except Exception as e:
+                print(f"[VoiceRooms] falha ao repor pool do fixo {fixo_id}: {e}")
+                return
+            self._return_to_pool(fixo_id, ch)
+
+    async def _acquire_room(self, guild: discord.Guild, base_vc: discord.VoiceChannel, categoria: Optional[discord.CategoryChannel], prefixo: str, member: discord.Member):
+        """
+        Retorna (canal, veio_da_pool). Da pool sai na hora (sem create);
+        senão cria do jeito normal.
+        """
+        pooled = self._take_pooled(guild, base_vc.id)
+        self._schedule_refill(guild, base_vc.id)
+        if pooled is not None:
+            return pooled, True
+        return await self._create_room(guild, base_vc, categoria, prefixo, member), False
+
+    def _activate_pooled(self, channel: discord.VoiceChannel, base_vc: discord.VoiceChannel, prefixo: str, member: discord.Member):
+        # depois do move: renomeia e aplica as perms do fixo + dono (fora do caminho crítico)
+        overwrites = self._room_overwrites(base_vc, member)
+        fut = rest_queue.submit(
+            "channel_edit",
+            channel.id,
+            lambda: channel.edit(name=f"{prefixo}{member.display_name}", overwrites=overwrites, reason="Sala quente entregue"),
+            coalesce_key=("edit", channel.id),
+            priority=PRIORITY_USER,
+            retries=2,
+        )
+
+        def _done(f):
+            if not f.cancelled() and f.exception() is not None:
+                print(f"[VoiceRooms] falha ao ativar sala da pool: {f.exception()}")
+
+        fut.add_done_callback(_done)
+
     # ---------- main listener ----------
     @commands.Cog.listener()
     async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
@@ -233,6 +598,7 @@ class VoiceRoomsCog(commands.Cog):
                     existing = guild.get_channel(int(existing_id)) if existing_id else None
 
                     dest = None
+                    from_pool = False
 
                     if isinstance(existing, discord.VoiceChannel) and existing.id in self.created:
                         info = self.created.get(existing.id) or {}
@@ -247,23 +613,29 @@ class VoiceRoomsCog(commands.Cog):
                                 if too_soon:
                                     dest = existing
                                 else:
-                                    novo = await self._create_room(guild, base_vc, categoria, prefixo, member)
-                                    self.created[novo.id] = {"owner": member.id, "fixo": base_vc.id, "created_at": time.time()}
-                                    self._owner_room[session_key] = novo.id
+                                    novo, from_pool = await self._acquire_room(guild, base_vc, categoria, prefixo, member)
+                                    self._track_room(session_key, novo.id)
                                     dest = novo
                         else:
                             # mapeamento velho/errado
                             self._owner_room.pop(session_key, None)
 
                     if dest is None:
-                        # cria do zero (para este fixo)
-                        novo = await self._create_room(guild, base_vc, categoria, prefixo, member)
-                        self.created[novo.id] = {"owner": member.id, "fixo": base_vc.id, "created_at": time.time()}
-                        self._owner_room[session_key] = novo.id
+                        # cria do zero (para este fixo) — ou pega uma sala quente
+                        novo, from_pool = await self._acquire_room(guild, base_vc, categoria, prefixo, member)
+                        self._track_room(session_key, novo.id)
                         dest = novo
 
                     # move para o destino (não deixa ficar no fixo)
                     moved = await self._move_with_retry(member, dest, reason="Mover para sala dinâmica")
+                    if moved and from_pool:
+                        self._activate_pooled(dest, base_vc, prefixo, member)
+                    if not moved and from_pool and isinstance(dest, discord.VoiceChannel):
+                        # sala da pool continua oculta: devolve em vez de apagar
+                        self._forget_room(dest.id)
+                        if len(dest.members) == 0:
+                            self._return_to_pool(base_vc.id, dest)
+                            dest = None
                     if not moved:
                         # fallback seguro: se ele veio de uma sala dele (dinâmica), tenta voltar; senão desconecta
                         if before.channel and before.channel.id in self.created:
@@ -279,13 +651,12 @@ class VoiceRoomsCog(commands.Cog):
                         try:
                             await asyncio.sleep(0.4)
                             if isinstance(dest, discord.VoiceChannel) and len(dest.members) == 0:
-                                await dest.delete(reason="Falha ao mover, limpando sala vazia")
+                                await self._delete_if_empty(dest, "Falha ao mover, limpando sala vazia")
                         except Exception:
                             pass
                         finally:
                             if isinstance(dest, discord.VoiceChannel):
-                                self.created.pop(dest.id, None)
-                                self._remove_owner_mapping_for_channel(dest.id)
+                                self._forget_room(dest.id)
 
                 return
 
@@ -293,8 +664,7 @@ class VoiceRoomsCog(commands.Cog):
             if before.channel and before.channel.id in self.created:
                 canal = before.channel
                 if len(canal.members) == 0:
-                    self._cancel_delete_if_any(canal.id)
-                    self._delete_tasks[canal.id] = asyncio.create_task(self._schedule_delete_if_empty(canal))
+                    self._schedule_reap(canal.id, self._delete_delay)
 
         except Exception as e:
             print(f"[VoiceRooms] erro no on_voice_state_update: {e}")
@@ -1,8 +1,12 @@
 # cogs/welcome.py
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from typing import Dict, Optional
 import discord
 from discord.ext import commands
 
+from join_pipeline import join_pipeline, JoinBatch, RAID_WINDOW
+from rest_queue import rest_queue, PRIORITY_BACKGROUND
 from utils import (
     WELCOME_CHANNEL_ID,
     WELCOME_LOG_CHANNEL_ID,
@@ -14,6 +18,10 @@ from utils import (
 _WELCOME_COLOR_RAW = -2342853
 _WELCOME_COLOR = _WELCOME_COLOR_RAW & 0xFFFFFF
 
+# Discord aceita até 10 embeds por mensagem; mais que isso vira resumo
+_MAX_EMBEDS = 10
+_SUMMARY_MAX_NAMES = 30
+
 def _find_welcome_channel(guild: discord.Guild) -> discord.TextChannel:
     if WELCOME_CHANNEL_ID:
         ch = guild.get_channel(WELCOME_CHANNEL_ID)
@@ -25,15 +33,10 @@ def _find_welcome_channel(guild: discord.Guild) -> discord.TextChannel:
             return c
     return None
 
-def _build_welcome_embed(member: discord.Member) -> discord.Embed:
-    title = f"``` {member.display_name} | 𝘽𝙚𝙢-𝙫𝙞𝙣𝙙𝙤(𝙖)! ao Spawnpoint```"
+def _build_template_embed() -> discord.Embed:
+    # parte fixa do embed (cor, descrição, campo); por membro só muda título e thumbnail
     description = f"```Espero que goste do lobby do Spawnpoint.```"
-    embed = discord.Embed(title=title, description=description, color=discord.Color(_WELCOME_COLOR))
-    try:
-        avatar_url = member.display_avatar.url
-        embed.set_thumbnail(url=avatar_url)
-    except Exception:
-        pass
+    embed = discord.Embed(description=description, color=discord.Color(_WELCOME_COLOR))
     embed.add_field(
         name="📢│𝙁𝙞𝙦𝙪𝙚 𝙖𝙩𝙚𝙣𝙩𝙤!",
         value="Leias as <#1213332268618096690>\nDuvidas e sugestões no canal: <#1259311950958170205>",
@@ -41,64 +44,187 @@ def _build_welcome_embed(member: discord.Member) -> discord.Embed:
     )
     return embed
 
+_WELCOME_TEMPLATE = _build_template_embed()
+
+def _build_welcome_embed(member: discord.Member) -> discord.Embed:
+    embed = _WELCOME_TEMPLATE.copy()
+    embed.title = f"``` {member.display_name} | 𝘽𝙚𝙢-𝙫𝙞𝙣𝙙𝙤(𝙖)! ao Spawnpoint```"
+    try:
+        avatar_url = member.display_avatar.url
+        embed.set_thumbnail(url=avatar_url)
+    except Exception:
+        pass
+    return embed
+
+def _build_summary_embed(batch: JoinBatch) -> discord.Embed:
+    # raid / muita gente de uma vez: uma mensagem só, sem mention
+    secs = max(1, int(round(batch.window)))
+    embed = _WELCOME_TEMPLATE.copy()
+    embed.title = f"``` {batch.total} pessoas entraram no Spawnpoint```"
+    embed.description = f"```Chegada em massa nos últimos {secs}s. Boas-vindas coletivas!```"
+    return embed
+
+def _build_summary_log(batch: JoinBatch) -> str:
+    names = [f"{m} ({m.id})" for m in batch.members[:_SUMMARY_MAX_NAMES]]
+    extra = batch.total - len(names)
+    head = "🚨 Modo raid" if batch.raid else "👥 Entrada em massa"
+    lines = [f"{head}: {batch.total} joins em {int(round(batch.window))}s (janela de {int(RAID_WINDOW)}s)"]
+    lines += names
+    if extra > 0:
+        lines.append(f"... e mais {extra}")
+    return "\n".join(lines)[:1900]
+
+def _find_member_role(guild: discord.Guild):
+    role = None
+    if MEMBER_ROLE_ID:
+        try:
+            role = guild.get_role(MEMBER_ROLE_ID)
+        except Exception:
+            role = None
+    if role is None:
+        candidate_names = {"membro", "member", "user", "usuario", "usuário", "participante"}
+        role = next((r for r in guild.roles if r.name.lower() in candidate_names), None)
+    return role
+
+@dataclass
+class _GuildConfig:
+    # resolvido uma vez por servidor; invalidado nos eventos de canal/cargo
+    welcome_channel: Optional[discord.TextChannel]
+    log_channel: Optional[discord.TextChannel]
+    member_role: Optional[discord.Role]
+
+def _resolve_config(guild: discord.Guild) -> _GuildConfig:
+    log_ch = guild.get_channel(WELCOME_LOG_CHANNEL_ID) if WELCOME_LOG_CHANNEL_ID else None
+    return _GuildConfig(
+        welcome_channel=_find_welcome_channel(guild),
+        log_channel=log_ch if isinstance(log_ch, discord.TextChannel) else None,
+        member_role=_find_member_role(guild),
+    )
+
 class WelcomeCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self._configs: Dict[int, _GuildConfig] = {}
+
+    def _config(self, guild: discord.Guild) -> _GuildConfig:
+        cfg = self._configs.get(guild.id)
+        if cfg is None:
+            cfg = self._configs[guild.id] = _resolve_config(guild)
+        return cfg
+
+    def _invalidate(self, guild: Optional[discord.Guild]):
+        if guild is not None:
+            self._configs.pop(guild.id, None)
 
+    # ---------- invalidação do cache ----------
     @commands.Cog.listener()
-    async def on_member_join(self, member: discord.Member):
+    async def on_guild_channel_create(self, channel):
+        self._invalidate(getattr(channel, "guild", None))
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self._invalidate(getattr(channel, "guild", None))
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        # só nome/tipo importam pra resolução
+        if before.name != after.name or type(before) is not type(after):
+            self._invalidate(getattr(after, "guild", None))
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        self._invalidate(role.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        self._invalidate(role.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        if before.name != after.name:
+            self._invalidate(after.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self._invalidate(guild)
+
+    async def cog_load(self):
+        # joins chegam agregados pelo join_pipeline (listener único no main.py)
+        join_pipeline.subscribe("welcome", self.on_join_batch)
+
+    async def cog_unload(self):
+        join_pipeline.unsubscribe("welcome")
+
+    async def on_join_batch(self, batch: JoinBatch):
+        guild = batch.guild
         try:
-            if member.bot:
-                return
-            guild = member.guild
-            if not guild:
-                return
-            channel = _find_welcome_channel(guild)
-            if channel is None and WELCOME_CHANNEL_ID:
-                try:
-                    ch = guild.get_channel(WELCOME_CHANNEL_ID)
-                    if isinstance(ch, discord.TextChannel):
-                        channel = ch
-                except Exception:
-                    channel = None
+            await self._send_welcome(guild, batch)
+        except Exception:
+            pass
+        self._queue_roles(guild, batch.members)
+
+    async def _send_welcome(self, guild: discord.Guild, batch: JoinBatch):
+        members = batch.fresh
+        if not members:
+            return
+        cfg = self._config(guild)
+        channel = cfg.welcome_channel
+        log_ch = cfg.log_channel
+
+        if batch.raid or len(members) > _MAX_EMBEDS:
             if channel:
-                embed = _build_welcome_embed(member)
                 try:
-                    await channel.send(content=member.mention, embed=embed, allowed_mentions=discord.AllowedMentions(users=True))
+                    await channel.send(embed=_build_summary_embed(batch), allowed_mentions=discord.AllowedMentions.none())
                 except Exception:
                     pass
-                if WELCOME_LOG_CHANNEL_ID:
-                    try:
-                        log_ch = guild.get_channel(WELCOME_LOG_CHANNEL_ID)
-                        if isinstance(log_ch, discord.TextChannel):
-                            await log_ch.send(embed=embed)
-                    except Exception:
-                        pass
-
-            # auto-role
-            role = None
-            if MEMBER_ROLE_ID:
+            if log_ch:
                 try:
-                    role = guild.get_role(MEMBER_ROLE_ID)
-                except Exception:
-                    role = None
-            if role is None:
-                candidate_names = {"membro", "member", "user", "usuario", "usuário", "participante"}
-                role = next((r for r in guild.roles if r.name.lower() in candidate_names), None)
-            if role:
-                try:
-                    me = guild.me
-                    if me is None:
-                        return
-                    if not guild.me.guild_permissions.manage_roles:
-                        return
-                    if me.top_role.position <= role.position:
-                        return
-                    await member.add_roles(role, reason="Auto-role: atribuído ao entrar no servidor")
+                    await log_ch.send(_build_summary_log(batch), allowed_mentions=discord.AllowedMentions.none())
                 except Exception:
                     pass
-        except Exception:
-            pass
+            return
+
+        # poucos: uma mensagem com as mentions e um embed por pessoa
+        embeds = [_build_welcome_embed(m) for m in members]
+        if channel:
+            try:
+                await channel.send(
+                    content=" ".join(m.mention for m in members),
+                    embeds=embeds,
+                    allowed_mentions=discord.AllowedMentions(users=True),
+                )
+            except Exception:
+                pass
+        if log_ch:
+            try:
+                await log_ch.send(embeds=embeds)
+            except Exception:
+                pass
+
+    def _queue_roles(self, guild: discord.Guild, members):
+        # auto-role: checa permissão uma vez por batch; os add_roles vão pro
+        # rest_queue (rota role_add, limitada por servidor) em vez de rajada
+        role = self._config(guild).member_role
+        if not role:
+            return
+        me = guild.me
+        if me is None:
+            return
+        if not me.guild_permissions.manage_roles:
+            return
+        if me.top_role.position <= role.position:
+            return
+        for member in members:
+            if role in getattr(member, "roles", ()):
+                continue
+            rest_queue.submit(
+                "role_add",
+                guild.id,
+                lambda m=member: m.add_roles(role, reason="Auto-role: atribuído ao entrar no servidor"),
+                coalesce_key=("role_add", guild.id, member.id, role.id),
+                priority=PRIORITY_BACKGROUND,
+                retries=1,
+            )
 
     @commands.Cog.listener()
     async def on_member_remove(self, member: discord.Member):
@@ -106,18 +232,16 @@ class WelcomeCog(commands.Cog):
             guild = member.guild
             if not guild:
                 return
-            channel = _find_welcome_channel(guild)
+            cfg = self._config(guild)
             content = f"{member.mention} Iniciou uma partida e saiu do lobby. (Saiu do servidor)"
-            if channel:
+            if cfg.welcome_channel:
                 try:
-                    await channel.send(content, allowed_mentions=discord.AllowedMentions(users=True))
+                    await cfg.welcome_channel.send(content, allowed_mentions=discord.AllowedMentions(users=True))
                 except Exception:
                     pass
-            if WELCOME_LOG_CHANNEL_ID:
+            if cfg.log_channel:
                 try:
-                    log_ch = guild.get_channel(WELCOME_LOG_CHANNEL_ID)
-                    if isinstance(log_ch, discord.TextChannel):
-                        await log_ch.send(content, allowed_mentions=discord.AllowedMentions(users=True))
+                    await cfg.log_channel.send(content, allowed_mentions=discord.AllowedMentions(users=True))
                 except Exception:
                     pass
         except Exception:
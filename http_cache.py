@@ -0,0 +1,275 @@
+# http_cache.py
+"""
+Cache HTTP compartilhado (Steam appdetails, SteamSpy, storesearch, páginas de loja).
+
+- TTL por endpoint (HTTP_CACHE_RULES); dentro do TTL = zero request
+- passou do TTL: revalida com If-None-Match / If-Modified-Since (304 = reaproveita)
+- 404 / erro também ficam em cache (negativo) por pouco tempo
+- erro de rede com cópia velha em mãos: devolve a velha (stale-if-error)
+- disco: SQLite em data/http_cache.db (sobrevive a restart) + LRU pequeno em RAM
+- requests idênticos ao mesmo tempo viram um só
+
+Uso:
+    from http_cache import http_cache
+
+    status, body = await http_cache.get_text(session, url, headers=...)
+    data = await http_cache.get_json(session, url, params={...})
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+import aiohttp
+
+log = logging.getLogger("http_cache")
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+HTTP_CACHE_DB = os.path.join(BASE_DIR, "data", "http_cache.db")
+
+PRICE_TTL = 10 * 60            # preço (promo começa/acaba a qualquer hora)
+
+# (regex da URL, ttl em segundos) — primeira que bater vale
+HTTP_CACHE_RULES: List[Tuple[re.Pattern, float]] = [
+    (re.compile(r"store\.steampowered\.com/api/appdetails\?[^#]*\bfilters=price_overview", re.I), PRICE_TTL),
+    (re.compile(r"store\.steampowered\.com/api/appdetails", re.I), 6 * 3600),   # metadata (nome, descrição, gêneros)
+    (re.compile(r"store\.steampowered\.com/api/storesearch", re.I), 24 * 3600),
+    (re.compile(r"steamspy\.com/api\.php", re.I), 24 * 3600),
+]
+DEFAULT_TTL = 30 * 60          # páginas de loja (preço muda)
+NEGATIVE_TTL = 10 * 60         # 404 / status ruim
+ERROR_TTL = 2 * 60             # falha de rede / timeout
+
+MAX_BODY_CHARS = 3 * 1024 * 1024  # não guarda páginas gigantes
+LRU_SIZE = 128
+MAX_ROWS = 5000
+
+_Entry = Dict[str, Any]  # status, body, etag, last_modified, expires_at
+# lê o corpo de uma resposta 200 (padrão: r.text inteiro)
+Reader = Callable[[aiohttp.ClientResponse], Awaitable[str]]
+
+
+def _ttl_for(url: str) -> float:
+    for pat, ttl in HTTP_CACHE_RULES:
+        if pat.search(url):
+            return ttl
+    return DEFAULT_TTL
+
+
+def _full_url(url: str, params: Optional[dict]) -> str:
+    if not params:
+        return url
+    sep = "&" if "?" in url else "?"
+    return url + sep + urlencode(sorted((str(k), str(v)) for k, v in params.items()))
+
+
+class HttpCache:
+    def __init__(self, path: str = HTTP_CACHE_DB) -> None:
+        self.path = path
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()      # to_thread de lookups/escritas se sobrepõem
+        self._lru: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    # ---------- disco ----------
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS http_cache ("
+                " url TEXT PRIMARY KEY, status INTEGER, body TEXT, etag TEXT,"
+                " last_modified TEXT, expires_at REAL NOT NULL, stored_at REAL NOT NULL)"
+            )
+            self._db = db
+        return self._db
+
+    def _disk_load(self, key: str) -> Optional[_Entry]:
+        with self._db_lock:
+            row = self._conn().execute(
+                "SELECT status, body, etag, last_modified, expires_at FROM http_cache WHERE url=?", (key,)
+            ).fetchone()
+        if not row:
+            return None
+        return {"status": row[0], "body": row[1], "etag": row[2], "last_modified": row[3], "expires_at": row[4]}
+
+    def _disk_store(self, key: str, e: _Entry) -> None:
+        with self._db_lock:
+            db = self._conn()
+            db.execute(
+                "INSERT OR REPLACE INTO http_cache(url, status, body, etag, last_modified, expires_at, stored_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, e["status"], e["body"], e["etag"], e["last_modified"], e["expires_at"], time.time()),
+            )
+            (count,) = db.execute("SELECT COUNT(*) FROM http_cache").fetchone()
+            if count > MAX_ROWS:
+                db.execute(
+                    "DELETE FROM http_cache WHERE url IN (SELECT url FROM http_cache ORDER BY stored_at ASC LIMIT ?)",
+                    (count - MAX_ROWS,),
+                )
+            db.commit()
+
+    async def _load(self, key: str) -> Optional[_Entry]:
+        e = self._lru.get(key)
+        if e is not None:
+            self._lru.move_to_end(key)
+            return e
+        try:
+            e = await asyncio.to_thread(self._disk_load, key)
+        except Exception as ex:
+            log.warning(f"[http_cache] leitura falhou: {ex}")
+            return None
+        if e is not None:
+            self._remember(key, e)
+        return e
+
+    async def _store(self, key: str, e: _Entry) -> None:
+        if e["body"] is not None and len(e["body"]) > MAX_BODY_CHARS:
+            # grande demais: nem disco nem RAM (tira cópia antiga, se tinha)
+            self._lru.pop(key, None)
+            return
+        self._remember(key, e)
+        try:
+            await asyncio.to_thread(self._disk_store, key, e)
+        except Exception as ex:
+            log.warning(f"[http_cache] escrita falhou: {ex}")
+
+    def _remember(self, key: str, e: _Entry) -> None:
+        self._lru[key] = e
+        self._lru.move_to_end(key)
+        while len(self._lru) > LRU_SIZE:
+            self._lru.popitem(last=False)
+
+    # ---------- API ----------
+    async def get_text(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        *,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        ttl: Optional[float] = None,
+        timeout: Optional[float] = None,
+        reader: Optional[Reader] = None,
+        variant: str = "",
+    ) -> Tuple[Optional[int], Optional[str]]:
+        """
+        Retorna (status, body). status None = falha de rede sem cópia em cache.
+        reader/variant: leitura parcial (ex.: só o <head>) fica guardada numa
+        entrada separada ("url#variant") pra não misturar com o corpo inteiro.
+        """
+        req_url = _full_url(url, params)
+        key = f"{req_url}#{variant}" if variant else req_url
+
+        # o request roda numa task própria: cancelar um chamador não cancela
+        # os outros que estão esperando o mesmo resultado
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._get(session, req_url, key, headers, ttl, timeout, reader))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._request_done(k, t))
+        return await asyncio.shield(task)
+
+    def _request_done(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            self._inflight.pop(key, None)
+        if not task.cancelled():
+            # evita "exception was never retrieved" se todo mundo desistiu
+            task.exception()
+
+    async def get_json(self, session: aiohttp.ClientSession, url: str, **kw) -> Optional[Any]:
+        status, body = await self.get_text(session, url, **kw)
+        if status != 200 or not body:
+            return None
+        try:
+            return json.loads(body)
+        except Exception:
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.revalidated + self.misses
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "hit_rate": ((self.hits + self.revalidated) / total) if total else 0.0,
+        }
+
+    # ---------- internals ----------
+    async def _get(self, session, req_url, key, headers, ttl, timeout, reader) -> Tuple[Optional[int], Optional[str]]:
+        now = time.time()
+        cached = await self._load(key)
+        if cached is not None and now < cached["expires_at"]:
+            self.hits += 1
+            return cached["status"], cached["body"]
+
+        req_headers = dict(headers or {})
+        if cached is not None and cached["status"] == 200:
+            if cached.get("etag"):
+                req_headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                req_headers["If-Modified-Since"] = cached["last_modified"]
+
+        kw: Dict[str, Any] = {"headers": req_headers, "allow_redirects": True}
+        if timeout is not None:
+            kw["timeout"] = aiohttp.ClientTimeout(total=timeout)
+
+        try:
+            async with session.get(req_url, **kw) as r:
+                status = r.status
+                etag = r.headers.get("ETag")
+                last_mod = r.headers.get("Last-Modified")
+                body = None
+                if status == 200:
+                    body = await (reader(r) if reader else r.text(errors="ignore"))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            if cached is not None and cached["status"] == 200:
+                # stale-if-error
+                return cached["status"], cached["body"]
+            await self._store(key, {"status": None, "body": None, "etag": None, "last_modified": None, "expires_at": now + ERROR_TTL})
+            self.misses += 1
+            return None, None
+
+        if status == 304 and cached is not None:
+            self.revalidated += 1
+            cached = dict(cached)
+            cached["expires_at"] = now + (ttl if ttl is not None else _ttl_for(req_url))
+            cached["etag"] = etag or cached.get("etag")
+            cached["last_modified"] = last_mod or cached.get("last_modified")
+            await self._store(key, cached)
+            return cached["status"], cached["body"]
+
+        self.misses += 1
+        if status == 200:
+            expires = now + (ttl if ttl is not None else _ttl_for(req_url))
+        else:
+            expires = now + NEGATIVE_TTL
+        await self._store(key, {"status": status, "body": body, "etag": etag, "last_modified": last_mod, "expires_at": expires})
+        return status, body
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._db is not None:
+                try:
+                    self._db.close()
+                except Exception:
+                    pass
+                self._db = None
+
+
+# instância única, compartilhada entre cogs
+http_cache = HttpCache()
@@ -0,0 +1,102 @@
+# http_clients.py
+"""
+Sessões HTTP compartilhadas pelo processo inteiro.
+
+Antes cada checker (platforms/*) e cada cog abria o próprio ClientSession,
+às vezes um por chamada: DNS + TLS de novo toda vez. Aqui:
+  - UM TCPConnector pra todo mundo: keep-alive, cache de DNS, limite por host
+  - sessões nomeadas por cima dele (cada uma com headers/timeout próprios)
+  - close() fecha tudo no shutdown (main.py); cogs NÃO fecham sessões daqui
+
+Uso:
+    from http_clients import http_clients
+
+    session = http_clients.session("platforms", timeout=12)
+    async with session.get(url) as r: ...
+"""
+
+import asyncio
+import logging
+from typing import Dict, Optional
+
+import aiohttp
+
+log = logging.getLogger("http_clients")
+
+CONN_LIMIT = 64             # conexões abertas no total
+CONN_LIMIT_PER_HOST = 6     # por host (steam, twitch, youtube...)
+DNS_CACHE_TTL = 300
+KEEPALIVE_SEC = 30.0
+DEFAULT_TIMEOUT = 20.0
+
+
+class HttpClients:
+    def __init__(self) -> None:
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_connector(self) -> aiohttp.TCPConnector:
+        loop = asyncio.get_running_loop()
+        if self._connector is None or self._connector.closed or self._loop is not loop:
+            # loop novo (ou connector fechado): fecha as sessões antigas em vez
+            # de só soltar (senão "Unclosed client session" + connector vazando)
+            old_sessions, old_connector = list(self._sessions.values()), self._connector
+            self._sessions.clear()
+            if old_sessions or old_connector is not None:
+                loop.create_task(self._close_all(old_sessions, old_connector))
+            self._connector = aiohttp.TCPConnector(
+                limit=CONN_LIMIT,
+                limit_per_host=CONN_LIMIT_PER_HOST,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                keepalive_timeout=KEEPALIVE_SEC,
+            )
+            self._loop = loop
+        return self._connector
+
+    def session(
+        self,
+        name: str = "default",
+        *,
+        headers: Optional[dict] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> aiohttp.ClientSession:
+        """
+        Sessão nomeada (criada na 1ª chamada; headers/timeout valem só nela).
+        Precisa de loop rodando.
+        """
+        connector = self._ensure_connector()
+        s = self._sessions.get(name)
+        if s is None or s.closed:
+            s = aiohttp.ClientSession(
+                connector=connector,
+                connector_owner=False,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+            )
+            self._sessions[name] = s
+        return s
+
+    async def close(self) -> None:
+        sessions, connector = list(self._sessions.values()), self._connector
+        self._sessions.clear()
+        self._connector = None
+        await self._close_all(sessions, connector)
+
+    @staticmethod
+    async def _close_all(sessions, connector: Optional[aiohttp.TCPConnector]) -> None:
+        for s in sessions:
+            try:
+                await s.close()
+            except Exception as e:
+                log.warning(f"[http_clients] falha fechando sessão: {e}")
+        if connector is not None and not connector.closed:
+            try:
+                await connector.close()
+            except Exception as e:
+                # connector de um loop que já fechou: não tem mais o que liberar
+                log.warning(f"[http_clients] falha fechando connector: {e}")
+
+
+# instância única (mesmo padrão do rest_queue/http_cache)
+http_clients = HttpClients()
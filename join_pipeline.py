@@ -0,0 +1,188 @@
+# join_pipeline.py
+"""
+Entrada única de joins do servidor.
+
+Antes três caminhos reagiam a cada on_member_join (WelcomeCog, WelcomeBridge e
+o welcome do AIChatCog), cada um com timer e cooldown próprios: um raid de 200
+contas virava centenas de sends + add_roles. Agora:
+  - main.py chama join_pipeline.push(member) (único listener)
+  - joins do mesmo servidor são agregados numa janela (WINDOW_SEC)
+  - ao fechar a janela, cada assinante recebe UM JoinBatch
+  - raid: RAID_THRESHOLD joins em RAID_WINDOW liga o modo raid (janela maior,
+    batch.raid=True -> assinantes mandam só um resumo); desliga depois de
+    RAID_HOLD sem join
+  - cooldown por usuário é um só: batch.fresh = quem não foi anunciado nos
+    últimos REJOIN_COOLDOWN (entra/sai/entra não gera boas-vindas de novo)
+
+Assinantes (nome -> handler async) se registram com subscribe(); registrar de
+novo com o mesmo nome substitui (reload de cog não duplica).
+Cargo automático vai pelo rest_queue (rota "role_add"), não daqui.
+
+Uso:
+    from join_pipeline import join_pipeline, JoinBatch
+
+    join_pipeline.subscribe("welcome", self.on_join_batch)
+    join_pipeline.push(member)
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+import discord
+
+log = logging.getLogger("join_pipeline")
+
+WINDOW_SEC = 6.0            # agrega joins próximos
+RAID_WINDOW = 60.0
+RAID_THRESHOLD = 10         # joins dentro de RAID_WINDOW pra considerar raid
+RAID_FLUSH_SEC = 30.0       # janela durante raid (um resumo a cada 30s no máximo)
+RAID_HOLD = 120.0           # sai do modo raid depois disso sem join
+REJOIN_COOLDOWN = 600.0     # não anuncia o mesmo membro de novo nesse tempo
+MAX_BATCH_MEMBERS = 100     # máximo em batch.fresh (exibição); cargo vai pra todos de batch.members
+
+
+@dataclass
+class JoinBatch:
+    guild: discord.Guild
+    members: List[discord.Member]          # todos da janela, sem limite (cargo vai pra todos)
+    fresh: List[discord.Member]            # não anunciados recentemente (boas-vindas), até MAX_BATCH_MEMBERS
+    total: int                             # joins na janela (conta rejoin repetido)
+    raid: bool
+    window: float                          # duração real da janela em segundos
+
+
+JoinHandler = Callable[[JoinBatch], Awaitable[None]]
+
+
+@dataclass
+class _GuildWindow:
+    members: List[discord.Member] = field(default_factory=list)
+    ids: set = field(default_factory=set)
+    total: int = 0
+    opened_at: float = 0.0
+    task: Optional[asyncio.Task] = None
+
+
+class JoinPipeline:
+    def __init__(self) -> None:
+        self._handlers: Dict[str, JoinHandler] = {}
+        self._windows: Dict[int, _GuildWindow] = {}
+        self._recent_joins: Dict[int, Deque[float]] = {}   # guild_id -> ts dos joins (RAID_WINDOW)
+        self._raid_until: Dict[int, float] = {}            # guild_id -> fim do modo raid
+        self._announced: Dict[int, float] = {}             # user_id -> último anúncio
+
+    # ---------- API ----------
+    def subscribe(self, name: str, handler: JoinHandler) -> None:
+        self._handlers[name] = handler
+
+    def unsubscribe(self, name: str) -> None:
+        self._handlers.pop(name, None)
+
+    def push(self, member: discord.Member) -> None:
+        """Chamado no on_member_join (sync; precisa de loop rodando)."""
+        if not member or not member.guild or getattr(member, "bot", False):
+            return
+
+        gid = int(member.guild.id)
+        now = time.monotonic()
+        raid = self._track_rate(gid, now)
+
+        w = self._windows.get(gid)
+        if w is None:
+            w = self._windows[gid] = _GuildWindow(opened_at=now)
+        w.total += 1
+        if member.id not in w.ids:
+            w.ids.add(member.id)
+            w.members.append(member)
+
+        if w.task is None:
+            w.task = asyncio.create_task(self._flush_after(gid, RAID_FLUSH_SEC if raid else WINDOW_SEC))
+
+    def is_raid(self, guild_id: int) -> bool:
+        return time.monotonic() < self._raid_until.get(int(guild_id), 0.0)
+
+    def status(self) -> Dict[int, dict]:
+        now = time.monotonic()
+        out: Dict[int, dict] = {}
+        for gid, hits in self._recent_joins.items():
+            w = self._windows.get(gid)
+            out[gid] = {
+                "joins_last_window": sum(1 for t in hits if now - t <= RAID_WINDOW),
+                "raid": self.is_raid(gid),
+                "pending": w.total if w else 0,
+            }
+        return out
+
+    # ---------- internals ----------
+    def _track_rate(self, gid: int, now: float) -> bool:
+        hits = self._recent_joins.setdefault(gid, deque())
+        hits.append(now)
+        while hits and now - hits[0] > RAID_WINDOW:
+            hits.popleft()
+
+        if len(hits) >= RAID_THRESHOLD:
+            if not self.is_raid(gid):
+                log.warning(f"[JoinPipeline] modo raid ligado (guild={gid}, {len(hits)} joins em {RAID_WINDOW:.0f}s)")
+            self._raid_until[gid] = now + RAID_HOLD
+        elif gid in self._raid_until and now < self._raid_until[gid]:
+            # ainda dentro do raid: cada join empurra o fim
+            self._raid_until[gid] = now + RAID_HOLD
+        return self.is_raid(gid)
+
+    async def _flush_after(self, gid: int, delay: float) -> None:
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self._windows.pop(gid, None)
+            return
+
+        w = self._windows.pop(gid, None)
+        if w is None or not w.members:
+            return
+
+        now_wall = time.time()
+        fresh = [m for m in w.members if now_wall - self._announced.get(m.id, 0.0) >= REJOIN_COOLDOWN]
+        for m in fresh:
+            # os além do limite entram só no resumo, mas contam como anunciados
+            self._announced[m.id] = now_wall
+        self._prune_announced(now_wall)
+
+        batch = JoinBatch(
+            guild=w.members[0].guild,
+            members=w.members,
+            fresh=fresh[:MAX_BATCH_MEMBERS],
+            total=w.total,
+            raid=self.is_raid(gid),
+            window=time.monotonic() - w.opened_at,
+        )
+        for name, handler in list(self._handlers.items()):
+            asyncio.create_task(self._dispatch(name, handler, batch))
+
+    async def _dispatch(self, name: str, handler: JoinHandler, batch: JoinBatch) -> None:
+        try:
+            await handler(batch)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            log.exception(f"[JoinPipeline] assinante {name} falhou (guild={batch.guild.id})")
+
+    def _prune_announced(self, now_wall: float) -> None:
+        if len(self._announced) < 5000:
+            return
+        for uid, ts in list(self._announced.items()):
+            if now_wall - ts >= REJOIN_COOLDOWN:
+                self._announced.pop(uid, None)
+
+    def close(self) -> None:
+        for w in self._windows.values():
+            if w.task and not w.task.done():
+                w.task.cancel()
+        self._windows.clear()
+
+
+# instância única (mesmo padrão do rest_queue/http_clients)
+join_pipeline = JoinPipeline()
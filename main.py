@@ -6,6 +6,10 @@ import asyncio
 import logging
 import threading
 import webhook_server
+from http_cache import http_cache
+from http_clients import http_clients
+from join_pipeline import join_pipeline
+from rest_queue import rest_queue
 
 import discord
 from keep_alive import app, serve_foreground
@@ -117,6 +121,10 @@ class OverrideBot(commands.Bot):
         # 1) carrega todos os cogs ANTES de sync (isso evita CommandNotFound no boot)
         await load_all_cogs()
 
+        # pool de frases do welcome (carrega do disco + refill em background)
+        welcome_bridge.start()
+        join_pipeline.subscribe("welcome_bridge", welcome_bridge.on_join_batch)
+
         # 2) sync rápido no servidor de teste (DEV) — global só via !sync global
         guild_obj = discord.Object(id=GUILD_ID)
         try:
@@ -139,11 +147,12 @@ async def on_ready():
     for name in bot.cogs:
         print(" -", name)
 
-# ✅ evento de join: só encaminha pro bridge (sem mexer em conversa/cooldown)
+# ✅ evento de join: listener ÚNICO -> join_pipeline agrega e repassa pros
+# assinantes (WelcomeCog, WelcomeBridge, AIChatCog) um batch por janela
 @bot.event
 async def on_member_join(member: discord.Member):
     try:
-        welcome_bridge.notify_join(member)
+        join_pipeline.push(member)
     except Exception:
         traceback.print_exc()
 
@@ -193,11 +202,37 @@ async def unsync_guild_cmd(ctx: commands.Context):
         await ctx.send(f"❌ Falha ao limpar: `{type(e).__name__}: {e}`")
         traceback.print_exc()
 
+@bot.command(name="restq")
+async def restq_cmd(ctx: commands.Context):
+    """
+    Latência da fila REST por rota (enfileirou -> começou).
+    """
+    if ctx.author.id != OWNER_ID:
+        return
+
+    stats = rest_queue.stats()
+    lines = [f"📬 Fila REST: {rest_queue.queue_size()} pendentes"]
+    for route, st in sorted(stats.items()):
+        lines.append(
+            f"`{route}` n={st['count']} coalesc={st['coalesced']} falhas={st['failed']} "
+            f"média={st['avg_wait']:.2f}s p95={st['p95_wait']:.2f}s máx={st['max_wait']:.2f}s"
+        )
+    if not stats:
+        lines.append("(nenhuma ação ainda)")
+    await ctx.send("\n".join(lines))
+
 # ─────────────────────────────
 # BOT MAIN
 # ─────────────────────────────
 async def main():
-    await bot.start(TOKEN)
+    try:
+        await bot.start(TOKEN)
+    finally:
+        join_pipeline.close()
+        welcome_bridge.stop()
+        rest_queue.close()
+        await http_clients.close()
+        http_cache.close()
 
 # ─────────────────────────────
 # ENTRYPOINT
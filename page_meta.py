@@ -0,0 +1,217 @@
+# page_meta.py
+"""
+Leitura parcial de páginas de loja (OpenGraph / meta / JSON-LD).
+
+A maioria das lojas põe o que interessa no <head>, mas a página inteira tem
+vários MB. fetch_head() lê a resposta em pedaços e para assim que:
+  - o </head> passou (padrão), e
+  - se need_jsonld: um bloco application/ld+json fechou (com jsonld_with:
+    um bloco que contenha algum desses marcadores; os outros são pulados), e
+  - se until: todos os marcadores apareceram (+ UNTIL_TAIL_BYTES depois do último)
+ou quando bate max_bytes. O prefixo lido passa pelo http_cache (entrada própria).
+Se o bloco procurado não aparece, o prefixo vai até max_bytes: quem chamou
+ainda pode procurar no corpo (ex.: preço por regex).
+
+Parsers (funcionam no prefixo ou na página inteira):
+    parse_meta(html)   -> {"og:title": ..., "description": ..., ...}
+    parse_jsonld(html) -> [objeto, ...]
+    element_inner(html, "div", id="x") / element_inner(html, "div", cls="y")
+    html_text(fragment) -> igual ao get_text("\n", strip=True) do BeautifulSoup
+"""
+
+import html as _html
+import json
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+import aiohttp
+
+from http_cache import http_cache
+
+CHUNK_BYTES = 16 * 1024
+MAX_PAGE_BYTES = 512 * 1024
+UNTIL_TAIL_BYTES = 32 * 1024
+
+_HEAD_END = (b"</head", b"<body")
+_LD_OPEN = b"application/ld+json"
+_SCRIPT_END = b"</script"
+
+_META_TAG = re.compile(r"<meta\b([^>]*)>", re.I)
+_ATTR = re.compile(r"""([a-zA-Z_:.-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""")
+_JSONLD = re.compile(r"""<script[^>]+type=["']application/ld\+json["'][^>]*>(.*?)</script>""", re.I | re.S)
+
+
+class _StopScanner:
+    """Decide quando parar de ler, olhando só os bytes novos de cada pedaço."""
+
+    def __init__(self, need_jsonld: bool, until: Sequence[bytes], jsonld_with: Sequence[bytes] = ()) -> None:
+        self.until = [m.lower() for m in until]
+        self.jsonld_with = [m.lower() for m in jsonld_with]
+        self.head_done = False
+        self.ld_done = not (need_jsonld or self.jsonld_with)
+        self.ld_from = 0                      # onde continuar procurando o próximo bloco JSON-LD
+        self.until_at: Dict[bytes, int] = {}
+        self.buf = bytearray()
+        self.low = bytearray()                # buf em minúsculas (busca sem relower)
+
+    def feed(self, chunk: bytes) -> bool:
+        start = max(0, len(self.buf) - 32)  # sobreposição pra marcador partido entre pedaços
+        self.buf += chunk
+        self.low += chunk.lower()
+
+        if not self.head_done:
+            self.head_done = any(self.low.find(m, start) >= 0 for m in _HEAD_END)
+
+        if not self.ld_done:
+            self._scan_jsonld()
+
+        for m in self.until:
+            if m not in self.until_at:
+                i = self.low.find(m, start)
+                if i >= 0:
+                    self.until_at[m] = i
+
+        return self.done()
+
+    def _scan_jsonld(self) -> None:
+        while not self.ld_done:
+            i = self.low.find(_LD_OPEN, self.ld_from)
+            if i < 0:
+                self.ld_from = max(self.ld_from, len(self.low) - len(_LD_OPEN))
+                return
+            j = self.low.find(_SCRIPT_END, i)
+            if j < 0:
+                self.ld_from = i  # bloco ainda aberto: espera o próximo pedaço
+                return
+            block = self.low[i:j]
+            self.ld_done = not self.jsonld_with or any(m in block for m in self.jsonld_with)
+            self.ld_from = j
+
+    def done(self) -> bool:
+        if not (self.head_done and self.ld_done):
+            return False
+        if self.until:
+            if len(self.until_at) < len(self.until):
+                return False
+            return len(self.buf) >= max(self.until_at.values()) + UNTIL_TAIL_BYTES
+        return True
+
+
+async def _read_prefix(
+    r: aiohttp.ClientResponse,
+    need_jsonld: bool,
+    until: Sequence[bytes],
+    max_bytes: int,
+    jsonld_with: Sequence[bytes] = (),
+) -> str:
+    sc = _StopScanner(need_jsonld, until, jsonld_with)
+    async for chunk in r.content.iter_chunked(CHUNK_BYTES):
+        if sc.feed(chunk) or len(sc.buf) >= max_bytes:
+            break
+    return bytes(sc.buf[:max_bytes]).decode(r.charset or "utf-8", errors="ignore")
+
+
+async def fetch_head(
+    session: aiohttp.ClientSession,
+    url: str,
+    *,
+    headers: Optional[dict] = None,
+    need_jsonld: bool = False,
+    jsonld_with: Sequence[bytes] = (),
+    until: Sequence[bytes] = (),
+    max_bytes: int = MAX_PAGE_BYTES,
+    timeout: Optional[float] = None,
+) -> Optional[str]:
+    """
+    Prefixo HTML da página (decodificado) ou None se não veio 200.
+    """
+    variant = (
+        "head"
+        + ("+ld" if need_jsonld else "")
+        + "".join(f"+ld:{m.decode(errors='ignore')}" for m in jsonld_with)
+        + "".join(f"+{m.decode(errors='ignore')}" for m in until)
+    )
+    status, body = await http_cache.get_text(
+        session,
+        url,
+        headers=headers,
+        timeout=timeout,
+        reader=lambda r: _read_prefix(r, need_jsonld, until, max_bytes, jsonld_with),
+        variant=variant,
+    )
+    if status != 200:
+        return None
+    return body
+
+
+def parse_meta(html_text: Optional[str]) -> Dict[str, str]:
+    """
+    Todas as <meta property|name=... content=...> numa passada (ordem dos
+    atributos não importa). Chave em minúsculas; primeira ocorrência vale.
+    """
+    out: Dict[str, str] = {}
+    if not html_text:
+        return out
+    for m in _META_TAG.finditer(html_text):
+        attrs = {a.lower(): (v1 or v2 or v3) for a, v1, v2, v3 in _ATTR.findall(m.group(1))}
+        key = (attrs.get("property") or attrs.get("name") or attrs.get("itemprop") or "").strip().lower()
+        content = attrs.get("content")
+        if key and content and key not in out:
+            out[key] = _html.unescape(content)
+    return out
+
+
+def parse_jsonld(html_text: Optional[str]) -> List[Any]:
+    out: List[Any] = []
+    if not html_text:
+        return out
+    for m in _JSONLD.finditer(html_text):
+        blob = (m.group(1) or "").strip()
+        if not blob:
+            continue
+        try:
+            out.append(json.loads(blob))
+        except Exception:
+            continue
+    return out
+
+
+_TAG = re.compile(r"<!--.*?-->|<(script|style)\b.*?</\1\s*>|<[^>]*>", re.I | re.S)
+# trechos onde "<div>" é texto (JS inline, CSS, comentário): element_inner pula
+_SKIP = r"<!--.*?-->|<(?P<raw>script|style)\b.*?</(?P=raw)\s*>"
+
+
+def element_inner(html_text: Optional[str], tag: str, *, id: Optional[str] = None, cls: Optional[str] = None) -> Optional[str]:
+    """
+    HTML interno do primeiro <tag> com esse id (ou com essa classe),
+    balanceando tags do mesmo nome aninhadas. Sem árvore; conteúdo de
+    <script>/<style>/comentários não conta.
+    """
+    if not html_text:
+        return None
+    if id is not None:
+        attr = rf"""\bid\s*=\s*["']{re.escape(id)}["']"""
+    else:
+        attr = rf"""\bclass\s*=\s*["'](?:[^"']*\s)?{re.escape(cls or "")}(?:\s[^"']*)?["']"""
+    opens = re.compile(rf"{_SKIP}|(?P<tag><{tag}\b[^>]*{attr}[^>]*>)", re.I | re.S)
+    m = next((o for o in opens.finditer(html_text) if o.group("tag")), None)
+    if not m:
+        return None
+
+    depth = 1
+    tags = re.compile(rf"{_SKIP}|(?P<tag><(?P<close>/?){tag}\b[^>]*>)", re.I | re.S)
+    for t in tags.finditer(html_text, m.end()):
+        if not t.group("tag"):
+            continue
+        depth += -1 if t.group("close") else 1
+        if depth == 0:
+            return html_text[m.end():t.start()]
+    # prefixo cortado antes do fechamento: devolve o que tem
+    return html_text[m.end():]
+
+
+def html_text(fragment: Optional[str]) -> str:
+    if not fragment:
+        return ""
+    parts = (_html.unescape(p).strip() for p in _TAG.sub("\x1f", fragment).split("\x1f"))
+    return "\n".join(p for p in parts if p)
@@ -1 +1,5 @@
+# platforms/__init__.py
 
+
+class LiveCheckError(Exception):
+    """Check de live falhou (rede, HTTP, resposta ilegível): estado desconhecido, não "offline"."""
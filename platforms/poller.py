@@ -0,0 +1,299 @@
+# platforms/poller.py
+"""
+Agendador de polling de lives (twitch / youtube / tiktok).
+
+Cada canal vigiado tem o próprio "próximo check"; um único loop dorme até o
+mais próximo (heap), dispara o check respeitando o limite por plataforma e
+reagenda:
+  - ao vivo: ONLINE_INTERVAL (pra perceber o fim rápido)
+  - offline perto do horário em que costuma abrir live: HOT_INTERVAL
+  - offline fora do horário: BASE_INTERVAL, crescendo até MAX_INTERVAL
+  - tudo com jitter (±JITTER) pra não bater em rajada
+Mudança de estado chama on_start(platform, channel, info) / on_end(platform, channel).
+Fim só conta depois de END_CONFIRM checks seguidos que CONFIRMARAM offline;
+check que falhou (exceção / LiveCheckError) é UNKNOWN e não conta pra nada.
+
+Plataformas com probe (PROBES) usam ele enquanto já estão ao vivo: a página
+inteira só é baixada/parseada na transição offline -> live.
+
+O histórico de horários (hora da semana em que cada canal abriu live) fica em
+data/live_poller.json.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from platforms.tiktok import check_tiktok_live
+from platforms.twitch import check_twitch_live, probe_twitch_live
+from platforms.youtube import check_youtube_live
+
+log = logging.getLogger("live_poller")
+
+STATE_PATH = "data/live_poller.json"
+
+ONLINE_INTERVAL = 60.0
+HOT_INTERVAL = 90.0
+BASE_INTERVAL = 180.0
+MAX_INTERVAL = 900.0
+JITTER = 0.15
+END_CONFIRM = 2
+
+# checks simultâneos por plataforma
+PLATFORM_CONCURRENCY: Dict[str, int] = {"twitch": 2, "youtube": 2, "tiktok": 1}
+
+CHECKERS: Dict[str, Callable[[str], Awaitable[Optional[dict]]]] = {
+    "twitch": check_twitch_live,
+    "youtube": check_youtube_live,
+    "tiktok": check_tiktok_live,
+}
+
+# sim/não barato: True | False | None (não deu pra saber -> check completo)
+PROBES: Dict[str, Callable[[str], Awaitable[Optional[bool]]]] = {
+    "twitch": probe_twitch_live,
+}
+
+StartCallback = Callable[[str, str, dict], Awaitable[None]]
+EndCallback = Callable[[str, str], Awaitable[None]]
+
+_WEEK_HOURS = 7 * 24
+
+# resultado de check que falhou: nem live nem offline
+UNKNOWN = object()
+
+
+def _hour_of_week(ts: float) -> int:
+    t = time.localtime(ts)
+    return t.tm_wday * 24 + t.tm_hour
+
+
+@dataclass
+class _Target:
+    platform: str
+    channel: str
+    live: bool = False
+    misses: int = 0                # checks seguidos sem live enquanto live=True
+    offline_polls: int = 0         # checks seguidos offline (alonga o intervalo)
+    hours: Dict[int, int] = field(default_factory=dict)  # hora da semana -> vezes que abriu live
+    last_info: Optional[dict] = None
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.platform, self.channel)
+
+
+class LivePoller:
+    def __init__(self, on_start: StartCallback, on_end: EndCallback) -> None:
+        self.on_start = on_start
+        self.on_end = on_end
+        self._targets: Dict[Tuple[str, str], _Target] = {}
+        self._heap: List[Tuple[float, int, Tuple[str, str]]] = []
+        self._seq = itertools.count()
+        self._sems: Dict[str, asyncio.Semaphore] = {}
+        self._running: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loaded = False
+
+    # ---------- API ----------
+    def set_channels(self, channels: Iterable[Tuple[str, str]]) -> None:
+        wanted = set()
+        for platform, channel in channels:
+            platform = (platform or "").strip().lower()
+            channel = (channel or "").strip()
+            if platform not in CHECKERS or not channel:
+                log.warning(f"[LivePoller] ignorado: {platform}/{channel}")
+                continue
+            key = (platform, channel)
+            wanted.add(key)
+            if key not in self._targets:
+                self._targets[key] = _Target(platform, channel)
+                # primeira rodada espalhada pra não disparar tudo junto
+                self._schedule(key, random.uniform(1.0, 15.0))
+
+        for key in list(self._targets):
+            if key not in wanted:
+                self._targets.pop(key, None)
+        if self._wake:
+            self._wake.set()
+
+    def seed_live(self, platform: str, channel: str) -> None:
+        """
+        Marca um canal já cadastrado como ao vivo sem chamar on_start (live
+        anunciada antes de um restart). Se ela acabou enquanto o bot estava
+        fora, o caminho normal de END_CONFIRM chama on_end.
+        """
+        t = self._targets.get(((platform or "").strip().lower(), (channel or "").strip()))
+        if t is not None:
+            t.live = True
+
+    def start(self) -> None:
+        """Chamar depois do set_channels (o histórico é carregado pros canais já cadastrados)."""
+        if self._task and not self._task.done():
+            return
+        self._load_state()
+        self._wake = asyncio.Event()
+        self._sems = {p: asyncio.Semaphore(n) for p, n in PLATFORM_CONCURRENCY.items()}
+        self._task = asyncio.create_task(self._loop())
+
+    def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+        self._task = None
+        for t in self._running.values():
+            t.cancel()
+        self._running.clear()
+        self._save_state()
+
+    def status(self) -> List[Dict[str, Any]]:
+        due = {key: when for when, _, key in self._heap}
+        now = time.monotonic()
+        return [
+            {
+                "platform": t.platform,
+                "channel": t.channel,
+                "live": t.live,
+                "next_in": max(0.0, due.get(t.key, now) - now),
+            }
+            for t in self._targets.values()
+        ]
+
+    # ---------- agenda ----------
+    def _schedule(self, key: Tuple[str, str], delay: float) -> None:
+        heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), key))
+        if self._wake:
+            self._wake.set()
+
+    def _next_interval(self, t: _Target) -> float:
+        if t.live:
+            base = ONLINE_INTERVAL
+        elif self._is_hot(t, time.time()):
+            base = HOT_INTERVAL
+        else:
+            # 180s, 270s, 405s... até MAX_INTERVAL
+            base = min(MAX_INTERVAL, BASE_INTERVAL * (1.5 ** min(t.offline_polls, 10)))
+        return base * random.uniform(1.0 - JITTER, 1.0 + JITTER)
+
+    @staticmethod
+    def _is_hot(t: _Target, now: float) -> bool:
+        if not t.hours:
+            return False
+        h = _hour_of_week(now)
+        # hora atual ou a próxima (pega quem costuma abrir "lá pelas X")
+        return any(t.hours.get((h + d) % _WEEK_HOURS, 0) > 0 for d in (0, 1))
+
+    async def _loop(self) -> None:
+        try:
+            while True:
+                now = time.monotonic()
+                while self._heap and self._heap[0][0] <= now:
+                    _, _, key = heapq.heappop(self._heap)
+                    if key in self._targets and key not in self._running:
+                        self._running[key] = asyncio.create_task(self._check(self._targets[key]))
+
+                wait = (self._heap[0][0] - now) if self._heap else None
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            return
+
+    async def _check(self, t: _Target) -> None:
+        info: Any = None
+        try:
+            async with self._sems.setdefault(t.platform, asyncio.Semaphore(1)):
+                probe = PROBES.get(t.platform)
+                live = await probe(t.channel) if (probe and t.live) else None
+                if live is True and t.last_info is not None:
+                    info = t.last_info  # continua no ar: nada mudou que precise da página
+                elif live is not False:
+                    # sem probe / probe sem resposta / live semeada sem info ainda
+                    info = await CHECKERS[t.platform](t.channel)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            info = UNKNOWN
+            log.warning(f"[LivePoller] {t.platform}/{t.channel} falhou: {e}")
+
+        try:
+            await self._apply(t, info)
+        except Exception:
+            log.exception(f"[LivePoller] callback falhou ({t.platform}/{t.channel})")
+        finally:
+            self._running.pop(t.key, None)
+            if t.key in self._targets:
+                self._schedule(t.key, self._next_interval(t))
+
+    async def _apply(self, t: _Target, info: Any) -> None:
+        if info is UNKNOWN:
+            # não sabe: mantém o estado (live continua live) e tenta de novo
+            return
+        if info:
+            t.misses = 0
+            t.offline_polls = 0
+            t.last_info = info
+            if not t.live:
+                t.live = True
+                h = _hour_of_week(time.time())
+                t.hours[h] = t.hours.get(h, 0) + 1
+                self._save_state()
+                log.info(f"[LivePoller] {t.platform}/{t.channel} AO VIVO")
+                await self.on_start(t.platform, t.channel, info)
+            return
+
+        t.offline_polls += 1
+        if t.live:
+            t.misses += 1
+            if t.misses >= END_CONFIRM:
+                t.live = False
+                t.misses = 0
+                t.last_info = None
+                log.info(f"[LivePoller] {t.platform}/{t.channel} encerrou")
+                await self.on_end(t.platform, t.channel)
+
+    # ---------- persistência ----------
+    def _load_state(self) -> None:
+        try:
+            if not os.path.isfile(STATE_PATH):
+                self._loaded = True
+                return
+            with open(STATE_PATH, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            log.warning(f"[LivePoller] estado ilegível, ignorando: {e}")
+            return
+        self._loaded = True
+        for item in data.get("targets", []) if isinstance(data, dict) else []:
+            key = (item.get("platform"), item.get("channel"))
+            t = self._targets.get(key)
+            if t and isinstance(item.get("hours"), dict):
+                t.hours = {int(h): int(n) for h, n in item["hours"].items()}
+
+    def _save_state(self) -> None:
+        if not self._loaded:
+            # nunca leu o arquivo (ou estava ilegível): não sobrescreve
+            return
+        data = {
+            "targets": [
+                {"platform": t.platform, "channel": t.channel, "hours": {str(h): n for h, n in t.hours.items()}}
+                for t in self._targets.values()
+                if t.hours
+            ]
+        }
+        try:
+            os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+            tmp = STATE_PATH + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, STATE_PATH)
+        except Exception as e:
+            log.warning(f"[LivePoller] falha salvando estado: {e}")
@@ -1,5 +1,9 @@
 import aiohttp
 import json
+from typing import Optional
+
+from http_clients import http_clients
+from platforms import LiveCheckError
 
 HEADERS = {
     "User-Agent": (
@@ -11,24 +15,30 @@ HEADERS = {
     "Referer": "https://www.tiktok.com/",
 }
 
-async def check_tiktok_live(username: str):
+async def check_tiktok_live(username: str, session: Optional[aiohttp.ClientSession] = None):
+    """
+    None = offline (ou usuário sem sala); falha de rede/resposta estranha
+    levanta LiveCheckError (o poller não conta isso como offline).
+    """
     url = f"https://www.tiktok.com/api/user/detail/?uniqueId={username}"
 
-    async with aiohttp.ClientSession(headers=HEADERS) as session:
-        async with session.get(url) as resp:
-            text = await resp.text()
-
-            # DEBUG CRÍTICO
-            if not text.startswith("{"):
-                print("[TikTok DEBUG] Resposta NÃO JSON")
-                print(text[:300])
-                return None
-
-            try:
-                data = json.loads(text)
-            except Exception as e:
-                print("[TikTok DEBUG] Falha ao parsear JSON:", e)
-                return None
+    if session is None:
+        session = http_clients.session("platforms")
+
+    async with session.get(url, headers=HEADERS) as resp:
+        status = resp.status
+        text = await resp.text()
+
+    if status != 200:
+        raise LiveCheckError(f"tiktok/{username}: HTTP {status}")
+
+    if not text.startswith("{"):
+        raise LiveCheckError(f"tiktok/{username}: resposta NÃO JSON: {text[:300]!r}")
+
+    try:
+        data = json.loads(text)
+    except Exception as e:
+        raise LiveCheckError(f"tiktok/{username}: falha ao parsear JSON: {e}")
 
     user = data.get("userInfo", {}).get("user")
     if not user:
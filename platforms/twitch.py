@@ -5,6 +5,10 @@ Não usa API oficial, não usa OAuth.
 
 Função principal:
     check_twitch_live(channel, session=None) → LiveInfo | None
+    (None = offline; falha de rede/HTTP levanta LiveCheckError)
+
+Probe barato (só sim/não, sem baixar a página):
+    probe_twitch_live(channel, session=None) → True | False | None (não deu pra saber)
 
 channel pode ser:
     - "theadryanbr"
@@ -26,11 +30,15 @@ Retorno LiveInfo:
 
 import aiohttp
 import asyncio
+import html as html_lib
 import re
 import json
 from datetime import datetime, timezone
 from typing import Optional
 
+from http_clients import http_clients
+from platforms import LiveCheckError
+
 _TTV_SEMAPHORE = asyncio.Semaphore(2)
 
 DEFAULT_HEADERS = {
@@ -47,23 +55,69 @@ async def _fetch_text(url: str, session: aiohttp.ClientSession, timeout=12):
         return None, None
 
 
+# ------------------------------------------------------------------------------
+# Probe: thumbnail de preview
+#   live    → 200 com a imagem
+#   offline → redirect pro placeholder 404_preview
+# Só o HEAD, sem corpo.
+# ------------------------------------------------------------------------------
+
+_PREVIEW_URL = "https://static-cdn.jtvnw.net/previews-ttv/live_user_{}-80x45.jpg"
+
+
+async def probe_twitch_live(channel: str, session: Optional[aiohttp.ClientSession] = None) -> Optional[bool]:
+    name = _channel_name(channel)
+    if not name:
+        return None
+    if session is None:
+        session = http_clients.session("platforms")
+    try:
+        async with session.head(_PREVIEW_URL.format(name.lower()), allow_redirects=False, timeout=8) as resp:
+            if resp.status == 200:
+                return True
+            if resp.status in (301, 302, 303, 307, 308):
+                loc = resp.headers.get("Location") or ""
+                return False if "404_preview" in loc else None
+            if resp.status == 404:
+                return False
+            return None
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        return None
+
+
+def _channel_name(channel: str) -> Optional[str]:
+    channel = (channel or "").strip()
+    if channel.startswith("http"):
+        m = re.search(r"twitch\.tv/([^/?]+)", channel)
+        return m.group(1) if m else None
+    return channel.lstrip("@") or None
+
+
 # ------------------------------------------------------------------------------
 # Extrair o objeto JSON "data-a-state", onde fica o estado da página da Twitch
 # ------------------------------------------------------------------------------
 
+_STATE_MARKER = 'data-a-state="'
+
+
 def _extract_twitch_state(html: str):
     """
     Twitch insere um JSON gigante em data-a-state="...".
     Contém informações completas sobre o canal.
+    O JSON vem com aspas como &quot;, então o atributo termina no próximo '"'.
     """
-    m = re.search(r'data-a-state="({.*?})"', html)
-    if not m:
+    i = html.find(_STATE_MARKER)
+    if i < 0:
+        return None
+    i += len(_STATE_MARKER)
+    j = html.find('"', i)
+    if j < 0 or html[i:i + 1] != "{":
         return None
     try:
-        # html entities → normal
-        raw = m.group(1).replace("&quot;", '"').replace("&amp;", "&")
-        return json.loads(raw)
-    except:
+        return json.loads(html_lib.unescape(html[i:j]))
+    except ValueError:
         return None
 
 
@@ -125,9 +179,14 @@ def _parse_live_info(state: dict):
 # Função principal
 # ------------------------------------------------------------------------------
 
-async def check_twitch_live(channel: str, session: Optional[aiohttp.ClientSession] = None) -> Optional[dict]:
+async def check_twitch_live(
+    channel: str,
+    session: Optional[aiohttp.ClientSession] = None,
+    probe: bool = True,
+) -> Optional[dict]:
     """
     Detecta lives na Twitch de forma leve e sem API.
+    probe=True: pergunta antes pro probe_twitch_live; offline confirmado = nem baixa a página.
     """
 
     channel = channel.strip()
@@ -142,16 +201,19 @@ async def check_twitch_live(channel: str, session: Optional[aiohttp.ClientSessio
         channel = channel.lstrip("@")
         url_channel = f"https://www.twitch.tv/{channel}"
 
-    own_session = False
     if session is None:
-        session = aiohttp.ClientSession()
-        own_session = True
+        session = http_clients.session("platforms")
+
+    if probe and await probe_twitch_live(channel, session) is False:
+        return None
 
     await _TTV_SEMAPHORE.acquire()
     try:
         status, html = await _fetch_text(url_channel, session)
-        if not html:
+        if status == 404:
             return None
+        if status != 200 or not html:
+            raise LiveCheckError(f"twitch/{channel}: HTTP {status}")
 
         # ------------------------------------------------------------------
         # 1) Extrair JSON state do data-a-state
@@ -194,6 +256,4 @@ async def check_twitch_live(channel: str, session: Optional[aiohttp.ClientSessio
 
     finally:
         _TTV_SEMAPHORE.release()
-        if own_session:
-            await session.close()
 
@@ -5,6 +5,7 @@ Não usa API oficial (que exige key e tem limite). Apenas scraping de metadados.
 
 Função principal:
     check_youtube_live(channel, session=None) → LiveInfo | None
+    (None = offline; falha de rede/HTTP levanta LiveCheckError)
 
 channel pode ser:
     - "theadryanbr"
@@ -31,6 +32,9 @@ import json
 from datetime import datetime, timezone
 from typing import Optional
 
+from http_clients import http_clients
+from platforms import LiveCheckError
+
 _YT_SEMAPHORE = asyncio.Semaphore(2)  # limitar requests simultâneos
 
 DEFAULT_HEADERS = {
@@ -51,47 +55,97 @@ async def _fetch_text(url: str, session: aiohttp.ClientSession, timeout=12):
 # Extração de ytInitialData (JSON enorme dentro do HTML)
 # ------------------------------------------------------------
 
+_YT_DATA_MARKERS = ('var ytInitialData = ', 'window["ytInitialData"] = ', 'ytInitialData"] = ', 'var ytInitialData=')
+_JSON = json.JSONDecoder()
+
+
 def _extract_yt_initial_data(html: str):
     """
-    Tenta extrair o objeto JSON do ytInitialData.
+    Acha o início do ytInitialData por índice e decodifica SÓ o objeto com
+    raw_decode (para no "}" que fecha, sem regex varrendo o HTML inteiro).
     """
-    m = re.search(r"ytInitialData\"\]\s*=\s*({.*?});</script>", html, re.DOTALL)
-    if m:
-        try:
-            return json.loads(m.group(1))
-        except:
-            pass
-    m = re.search(r"var ytInitialData\s*=\s*({.*?});", html, re.DOTALL)
-    if m:
+    for marker in _YT_DATA_MARKERS:
+        i = html.find(marker)
+        if i < 0:
+            continue
+        j = html.find("{", i + len(marker), i + len(marker) + 16)
+        if j < 0:
+            continue
         try:
-            return json.loads(m.group(1))
-        except:
-            pass
+            obj, _ = _JSON.raw_decode(html, j)
+        except ValueError:
+            continue
+        if isinstance(obj, dict):
+            return obj
     return None
 
 
+def _is_live_renderer(v) -> bool:
+    if not isinstance(v, dict):
+        return False
+    for o in v.get("thumbnailOverlays") or ():
+        if o.get("thumbnailOverlayTimeStatusRenderer", {}).get("style") == "LIVE":
+            return True
+    for b in v.get("badges") or ():
+        if b.get("metadataBadgeRenderer", {}).get("style") == "BADGE_STYLE_TYPE_LIVE_NOW":
+            return True
+    return False
+
+
+def _items(obj, *path):
+    """Desce por chaves/listas; "*" = cada item da lista. Gera o que existir no fim."""
+    if not path:
+        yield obj
+        return
+    head, rest = path[0], path[1:]
+    if head == "*":
+        if isinstance(obj, list):
+            for it in obj:
+                yield from _items(it, *rest)
+    elif isinstance(obj, dict) and head in obj:
+        yield from _items(obj[head], *rest)
+
+
+def _known_video_renderers(data):
+    """
+    Só os caminhos onde o YouTube põe vídeos na página do canal
+    (aba inicial: destaque/prateleiras; aba /streams: grade).
+    """
+    for tab in _items(data, "contents", "twoColumnBrowseResultsRenderer", "tabs", "*", "tabRenderer", "content"):
+        for section in _items(tab, "sectionListRenderer", "contents", "*", "itemSectionRenderer", "contents", "*"):
+            yield from _items(section, "channelFeaturedContentRenderer", "items", "*", "videoRenderer")
+            for it in _items(section, "shelfRenderer", "content", "horizontalListRenderer", "items", "*"):
+                yield from _items(it, "gridVideoRenderer")
+                yield from _items(it, "videoRenderer")
+            yield from _items(section, "videoRenderer")
+        for it in _items(tab, "richGridRenderer", "contents", "*", "richItemRenderer", "content"):
+            yield from _items(it, "videoRenderer")
+
+
 def _search_live_in_initial_data(data):
     """
-    Procura vídeo ao vivo dentro de ytInitialData.
+    Procura vídeo ao vivo dentro de ytInitialData pelos caminhos conhecidos.
+    A árvore inteira só é varrida quando esses caminhos não trazem vídeo
+    nenhum (layout novo/desconhecido); vídeos achados e nenhum ao vivo =
+    offline, sem varredura (o caso comum de cada poll).
     """
     if not isinstance(data, dict):
         return None
 
+    found_any = False
+    for v in _known_video_renderers(data):
+        found_any = True
+        if _is_live_renderer(v):
+            return v
+    if found_any:
+        return None
+
     # Busca em todo o JSON (recursivo)
     def walk(obj):
         if isinstance(obj, dict):
             # Muitos vídeos aparecem em "gridVideoRenderer", "videoRenderer", etc.
-            if "videoRenderer" in obj:
-                v = obj["videoRenderer"]
-                # se for live
-                if v.get("badges") or v.get("thumbnailOverlays"):
-                    # procurar "LIVE NOW" badge
-                    overlays = v.get("thumbnailOverlays", [])
-                    for o in overlays:
-                        if "thumbnailOverlayTimeStatusRenderer" in o:
-                            style = o["thumbnailOverlayTimeStatusRenderer"].get("style")
-                            if style == "LIVE":
-                                return v
+            if "videoRenderer" in obj and _is_live_renderer(obj["videoRenderer"]):
+                return obj["videoRenderer"]
             # continuar
             for val in obj.values():
                 r = walk(val)
@@ -130,16 +184,16 @@ async def check_youtube_live(channel: str, session: Optional[aiohttp.ClientSessi
         channel = channel.lstrip("@")
         url_channel = f"https://www.youtube.com/@{channel}"
 
-    own_session = False
     if session is None:
-        session = aiohttp.ClientSession()
-        own_session = True
+        session = http_clients.session("platforms")
 
     await _YT_SEMAPHORE.acquire()
     try:
         status, html = await _fetch_text(url_channel, session)
-        if not html:
+        if status == 404:
             return None
+        if status != 200 or not html:
+            raise LiveCheckError(f"youtube/{channel}: HTTP {status}")
 
         # ------------------------------------------------
         # 1) Procurar live pela meta tag - mais rápido
@@ -212,5 +266,3 @@ async def check_youtube_live(channel: str, session: Optional[aiohttp.ClientSessi
 
     finally:
         _YT_SEMAPHORE.release()
-        if own_session:
-            await session.close()
@@ -0,0 +1,313 @@
+# rest_queue.py
+"""
+Fila única de ações REST pro Discord (renomes, edits, create/delete/move).
+
+Cada ação cai num "bucket" (rota + objeto), com limite próprio:
+  - channel_rename: 2 a cada 10 min POR CANAL (limite real do Discord)
+  - message_edit / channel_create / channel_delete / member_move: limites curtos
+
+Regras:
+  - coalesce: se já tem uma ação pendente com a mesma chave (ex.: rename do
+    mesmo canal), só a ÚLTIMA roda; quem pediu antes recebe o mesmo resultado
+  - prioridade: PRIORITY_USER (usuário esperando) passa na frente do resto
+  - latência de fila (enfileirou -> começou) fica em stats() (comando !restq)
+
+Uso:
+    from rest_queue import rest_queue, PRIORITY_USER
+
+    await rest_queue.run("member_move", guild.id, lambda: member.move_to(vc), priority=PRIORITY_USER)
+    rest_queue.submit("channel_rename", ch.id, lambda: ch.edit(name=n), coalesce_key=("rename", ch.id))
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+import discord
+
+log = logging.getLogger("rest_queue")
+
+PRIORITY_USER = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BACKGROUND = 2
+
+# rota -> (máximo de chamadas, janela em segundos), contado por (rota, bucket_id)
+ROUTE_LIMITS: Dict[str, Tuple[int, float]] = {
+    "channel_rename": (2, 600.0),
+    "channel_edit": (5, 10.0),
+    "channel_create": (5, 10.0),
+    "channel_delete": (5, 10.0),
+    "member_move": (10, 10.0),
+    "message_edit": (5, 5.0),
+    "message_send": (5, 5.0),
+    "role_add": (10, 10.0),
+}
+DEFAULT_LIMIT: Tuple[int, float] = (5, 5.0)
+
+# quantas ações podem estar em voo ao mesmo tempo
+MAX_IN_FLIGHT = 4
+
+# avisa no log quando uma ação de usuário espera mais que isso na fila
+SLOW_USER_WAIT_SEC = 3.0
+
+# retry volta pra fila depois disso (+ RETRY_STEP_SEC por tentativa) e pega vaga no bucket de novo
+RETRY_BASE_SEC = 0.25
+RETRY_STEP_SEC = 0.20
+
+
+@dataclass
+class _Action:
+    route: str
+    bucket: Tuple[str, Hashable]
+    factory: Callable[[], Awaitable[Any]]
+    priority: int
+    coalesce_key: Optional[Hashable]
+    retries: int
+    enqueued_at: float
+    future: asyncio.Future
+    started: bool = False
+    attempt: int = 0
+
+
+@dataclass
+class _RouteStats:
+    count: int = 0
+    coalesced: int = 0
+    failed: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+    last_wait: float = 0.0
+    recent: Deque[float] = field(default_factory=lambda: deque(maxlen=50))
+
+
+def _is_retryable(e: BaseException) -> bool:
+    # sem permissão / objeto sumiu: repetir não adianta
+    return not isinstance(e, (discord.Forbidden, discord.NotFound))
+
+
+class RestScheduler:
+    def __init__(self) -> None:
+        self._heap: List[Tuple[int, int, _Action]] = []
+        self._seq = itertools.count()
+        self._pending: Dict[Hashable, _Action] = {}       # coalesce_key -> ação ainda não iniciada
+        self._buckets: Dict[Tuple[str, Hashable], Deque[float]] = {}
+        self._stats: Dict[str, _RouteStats] = {}
+        self._retrying: Dict[int, Tuple[asyncio.TimerHandle, _Action]] = {}   # id(ação) -> timer do retry
+        self._wake: Optional[asyncio.Event] = None
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._task: Optional[asyncio.Task] = None
+
+    # ---------- API ----------
+    def submit(
+        self,
+        route: str,
+        bucket_id: Hashable,
+        factory: Callable[[], Awaitable[Any]],
+        *,
+        coalesce_key: Optional[Hashable] = None,
+        priority: int = PRIORITY_NORMAL,
+        retries: int = 0,
+    ) -> asyncio.Future:
+        """
+        Enfileira e devolve um Future com o resultado (não precisa await).
+        """
+        self._ensure_worker()
+        st = self._stats.setdefault(route, _RouteStats())
+
+        if coalesce_key is not None:
+            old = self._pending.get(coalesce_key)
+            if old is not None and not old.started and not old.future.done():
+                # só a versão mais nova é enviada; quem esperava a antiga recebe o resultado dela
+                old.factory = factory
+                old.retries = max(old.retries, retries)
+                if priority < old.priority:
+                    old.priority = priority
+                    heapq.heappush(self._heap, (priority, next(self._seq), old))
+                st.coalesced += 1
+                self._wake.set()
+                return old.future
+
+        loop = asyncio.get_running_loop()
+        action = _Action(
+            route=route,
+            bucket=(route, bucket_id),
+            factory=factory,
+            priority=priority,
+            coalesce_key=coalesce_key,
+            retries=retries,
+            enqueued_at=time.monotonic(),
+            future=loop.create_future(),
+        )
+        if coalesce_key is not None:
+            self._pending[coalesce_key] = action
+        heapq.heappush(self._heap, (priority, next(self._seq), action))
+        self._wake.set()
+        return action.future
+
+    async def run(self, route: str, bucket_id: Hashable, factory: Callable[[], Awaitable[Any]], **kw) -> Any:
+        """
+        submit() + await do resultado (exceções sobem pro chamador).
+        Cancelar quem está esperando NÃO cancela a ação: com coalesce o mesmo
+        future pode ter outros esperando.
+        """
+        return await asyncio.shield(self.submit(route, bucket_id, factory, **kw))
+
+    def queue_size(self) -> int:
+        return sum(1 for _, _, a in self._heap if not a.started and not a.future.done())
+
+    def stats(self) -> Dict[str, dict]:
+        out: Dict[str, dict] = {}
+        for route, st in self._stats.items():
+            recent = sorted(st.recent)
+            p95 = recent[int(len(recent) * 0.95) - 1] if len(recent) >= 20 else (recent[-1] if recent else 0.0)
+            out[route] = {
+                "count": st.count,
+                "coalesced": st.coalesced,
+                "failed": st.failed,
+                "avg_wait": (st.wait_total / st.count) if st.count else 0.0,
+                "p95_wait": p95,
+                "max_wait": st.wait_max,
+                "last_wait": st.last_wait,
+            }
+        return out
+
+    def close(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        for timer, a in self._retrying.values():
+            timer.cancel()
+            if not a.future.done():
+                a.future.cancel()
+        self._retrying.clear()
+        for _, _, a in self._heap:
+            if not a.future.done():
+                a.future.cancel()
+        self._heap.clear()
+        self._pending.clear()
+
+    # ---------- internals ----------
+    def _ensure_worker(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._wake = asyncio.Event()
+        self._sem = asyncio.Semaphore(MAX_IN_FLIGHT)
+        self._task = asyncio.create_task(self._worker())
+
+    def _bucket_wait(self, bucket: Tuple[str, Hashable], now: float) -> float:
+        """0 se pode disparar agora; senão quantos segundos faltam."""
+        limit, window = ROUTE_LIMITS.get(bucket[0], DEFAULT_LIMIT)
+        hits = self._buckets.get(bucket)
+        if not hits:
+            return 0.0
+        while hits and now - hits[0] >= window:
+            hits.popleft()
+        if not hits:
+            self._buckets.pop(bucket, None)
+            return 0.0
+        if len(hits) < limit:
+            return 0.0
+        return window - (now - hits[0])
+
+    def _pick(self) -> Tuple[Optional[_Action], Optional[float]]:
+        """
+        Pega a ação de maior prioridade cujo bucket está livre.
+        Se nenhuma estiver, devolve quanto esperar até a próxima liberar.
+        """
+        now = time.monotonic()
+        skipped: List[Tuple[int, int, _Action]] = []
+        chosen: Optional[_Action] = None
+        next_wait: Optional[float] = None
+
+        while self._heap:
+            item = heapq.heappop(self._heap)
+            prio, _, action = item
+            if action.started or action.future.done() or prio != action.priority:
+                # entrada velha (já rodou, cancelada ou re-priorizada)
+                continue
+            wait = self._bucket_wait(action.bucket, now)
+            if wait <= 0:
+                chosen = action
+                break
+            skipped.append(item)
+            next_wait = wait if next_wait is None else min(next_wait, wait)
+
+        for item in skipped:
+            heapq.heappush(self._heap, item)
+        return chosen, next_wait
+
+    async def _worker(self) -> None:
+        try:
+            while True:
+                action, wait = self._pick()
+                if action is None:
+                    self._wake.clear()
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), timeout=wait)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                await self._sem.acquire()
+                action.started = True
+                if action.coalesce_key is not None and self._pending.get(action.coalesce_key) is action:
+                    self._pending.pop(action.coalesce_key, None)
+                self._buckets.setdefault(action.bucket, deque()).append(time.monotonic())
+                asyncio.create_task(self._execute(action))
+        except asyncio.CancelledError:
+            return
+
+    async def _execute(self, action: _Action) -> None:
+        st = self._stats.setdefault(action.route, _RouteStats())
+        if action.attempt == 0:
+            # latência de fila só da primeira tentativa
+            waited = time.monotonic() - action.enqueued_at
+            st.count += 1
+            st.wait_total += waited
+            st.wait_max = max(st.wait_max, waited)
+            st.last_wait = waited
+            st.recent.append(waited)
+            if action.priority == PRIORITY_USER and waited > SLOW_USER_WAIT_SEC:
+                log.warning(f"[RestQueue] {action.route} esperou {waited:.1f}s na fila (fila={self.queue_size()})")
+
+        try:
+            try:
+                result = await action.factory()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if action.attempt >= action.retries or not _is_retryable(e):
+                    st.failed += 1
+                    if not action.future.done():
+                        action.future.set_exception(e)
+                        # evita "exception was never retrieved" em submit sem await
+                        action.future.exception()
+                    return
+                # retry volta pro heap: passa pelo limite do bucket como qualquer ação
+                delay = RETRY_BASE_SEC + RETRY_STEP_SEC * action.attempt
+                action.attempt += 1
+                timer = asyncio.get_running_loop().call_later(delay, self._requeue, action)
+                self._retrying[id(action)] = (timer, action)
+                return
+            if not action.future.done():
+                action.future.set_result(result)
+        finally:
+            self._sem.release()
+
+    def _requeue(self, action: _Action) -> None:
+        self._retrying.pop(id(action), None)
+        if action.future.done():
+            return  # cancelado enquanto esperava o retry
+        action.started = False
+        heapq.heappush(self._heap, (action.priority, next(self._seq), action))
+        if self._wake:
+            self._wake.set()
+
+
+# instância única (mesmo padrão do webhook_queue)
+rest_queue = RestScheduler()
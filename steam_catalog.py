@@ -0,0 +1,225 @@
+# steam_catalog.py
+"""
+Catálogo offline da Steam (nome -> appid) com índice de trigramas.
+
+- carrega um dump local (data/steam_applist.json) num índice compacto:
+  nomes normalizados + appids em array + trigram -> array de posições
+- search() faz ranking fuzzy (Dice de trigramas) sem tocar na rede
+- reload() relê o dump (troca o índice de uma vez, leitura segue funcionando)
+- quem usa cai pra API (storesearch) só quando o catálogo não acha nada
+
+Formatos aceitos do dump:
+    {"applist": {"apps": [{"appid": 730, "name": "Counter-Strike 2"}, ...]}}   (GetAppList)
+    {"apps": [...]}  /  [{"appid": ..., "name": ...}, ...]  /  {"730": "Counter-Strike 2", ...}
+"""
+
+import heapq
+import json
+import logging
+import os
+import re
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+log = logging.getLogger("steam_catalog")
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+STEAM_CATALOG_PATH = os.path.join(BASE_DIR, "data", "steam_applist.json")
+
+# trigramas presentes em mais que essa fração do catálogo quase não separam nada
+COMMON_GRAM_FRAC = 0.05
+# quantos candidatos (por contagem de trigramas) vão pro cálculo do Dice
+PREFILTER = 64
+# stale() olha o mtime do dump no máximo uma vez nesse intervalo (busca não faz stat)
+STALE_CHECK_SEC = 60.0
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_title(s: str) -> str:
+    s = (s or "").lower()
+    s = _NON_ALNUM.sub(" ", s)
+    return " ".join(s.split())
+
+
+def _grams(norm: str) -> List[str]:
+    if not norm:
+        return []
+    p = f"  {norm} "
+    return list({p[i:i + 3] for i in range(len(p) - 2)})
+
+
+def _iter_apps(raw: Any) -> Iterable[Tuple[int, str]]:
+    if isinstance(raw, dict):
+        if isinstance(raw.get("applist"), dict):
+            raw = raw["applist"].get("apps") or []
+        elif isinstance(raw.get("apps"), list):
+            raw = raw["apps"]
+        else:
+            for k, v in raw.items():
+                if isinstance(v, str) and str(k).isdigit():
+                    yield int(k), v
+            return
+    if isinstance(raw, list):
+        for it in raw:
+            if not isinstance(it, dict):
+                continue
+            appid = it.get("appid", it.get("id"))
+            name = it.get("name")
+            if isinstance(appid, int) and isinstance(name, str):
+                yield appid, name
+
+
+class _Index:
+    __slots__ = ("names", "appids", "gram_count", "postings", "exact", "common_limit")
+
+    def __init__(self, apps: Iterable[Tuple[int, str]]) -> None:
+        self.names: List[str] = []
+        self.appids = array("I")
+        self.gram_count = array("H")
+        self.exact: Dict[str, int] = {}
+        tmp: Dict[str, List[int]] = {}
+
+        seen = set()
+        for appid, name in apps:
+            name = name.strip()
+            norm = normalize_title(name)
+            if not norm or appid in seen:
+                continue
+            seen.add(appid)
+            i = len(self.names)
+            self.names.append(name)
+            self.appids.append(appid)
+            grams = _grams(norm)
+            self.gram_count.append(min(len(grams), 0xFFFF))
+            for g in grams:
+                tmp.setdefault(g, []).append(i)
+            prev = self.exact.get(norm)
+            if prev is None or appid < self.appids[prev]:
+                self.exact[norm] = i
+
+        self.postings: Dict[str, array] = {g: array("I", ids) for g, ids in tmp.items()}
+        self.common_limit = max(1000, int(len(self.names) * COMMON_GRAM_FRAC))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class SteamCatalog:
+    def __init__(self, path: str = STEAM_CATALOG_PATH) -> None:
+        self.path = path
+        self._index: Optional[_Index] = None
+        self._mtime: Optional[float] = None
+        self._next_stat = 0.0
+        self.err: Optional[str] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._index is not None
+
+    def __len__(self) -> int:
+        return len(self._index) if self._index else 0
+
+    # ---------- carga ----------
+    def reload(self, path: Optional[str] = None) -> int:
+        """
+        Relê o dump e troca o índice. Bloqueante (rodar via asyncio.to_thread).
+        Retorna quantos apps ficaram no índice (0 se falhou; índice antigo é mantido).
+        """
+        path = path or self.path
+        t0 = time.perf_counter()
+        try:
+            mtime = os.path.getmtime(path)
+            with open(path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            idx = _Index(_iter_apps(raw))
+        except FileNotFoundError:
+            self.err = f"dump não encontrado: {path}"
+            return 0
+        except Exception as e:
+            self.err = f"falha lendo dump: {e}"
+            log.warning(f"[SteamCatalog] {self.err}")
+            return 0
+
+        self._index = idx
+        self._mtime = mtime
+        self.path = path
+        self.err = None
+        log.info(f"[SteamCatalog] {len(idx)} apps indexados em {time.perf_counter() - t0:.1f}s")
+        return len(idx)
+
+    def stale(self) -> bool:
+        """
+        True se o arquivo mudou desde a última carga. O stat roda no máximo
+        uma vez a cada STALE_CHECK_SEC; entre um e outro devolve False.
+        """
+        now = time.monotonic()
+        if now < self._next_stat:
+            return False
+        self._next_stat = now + STALE_CHECK_SEC
+        try:
+            return os.path.getmtime(self.path) != self._mtime
+        except OSError:
+            return False
+
+    # ---------- busca ----------
+    def lookup_exact(self, title: str) -> Optional[int]:
+        idx = self._index
+        if idx is None:
+            return None
+        i = idx.exact.get(normalize_title(title))
+        return idx.appids[i] if i is not None else None
+
+    def search(self, title: str, limit: int = 10, min_score: float = 0.3) -> List[Tuple[int, str, float]]:
+        """
+        [(appid, nome, score)] ordenado por score (Dice de trigramas, 0..1).
+        """
+        idx = self._index
+        if idx is None:
+            return []
+        norm = normalize_title(title)
+        q = _grams(norm)
+        if not q:
+            return []
+
+        out: List[Tuple[int, str, float]] = []
+        exact = idx.exact.get(norm)
+        if exact is not None:
+            out.append((idx.appids[exact], idx.names[exact], 1.0))
+
+        lists = [idx.postings[g] for g in q if g in idx.postings]
+        rare = [p for p in lists if len(p) <= idx.common_limit]
+        # título só com trigramas comuns: usa todos mesmo (lento, mas raro)
+        use = rare if rare else lists
+        if not use:
+            return out
+
+        counts: Counter = Counter()
+        for p in use:
+            counts.update(p)
+
+        # trigramas comuns que ficaram de fora entram no Dice só pros finalistas
+        skipped = [p for p in lists if len(p) > idx.common_limit] if rare else []
+        nq = len(q)
+        scored: List[Tuple[float, int]] = []
+        for i, c in counts.most_common(PREFILTER):
+            if i == exact:
+                continue
+            if skipped:
+                c += sum(1 for p in skipped if _contains(p, i))
+            score = 2.0 * c / (nq + idx.gram_count[i])
+            if score >= min_score:
+                scored.append((score, i))
+
+        for score, i in heapq.nlargest(limit - len(out), scored):
+            out.append((idx.appids[i], idx.names[i], score))
+        return out[:limit]
+
+
+def _contains(arr: array, i: int) -> bool:
+    # postings são crescentes
+    j = bisect_left(arr, i)
+    return j < len(arr) and arr[j] == i
@@ -0,0 +1,6 @@
+# tests/conftest.py
+import os
+import sys
+
+# módulos do bot ficam na raiz (main.py roda de lá)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
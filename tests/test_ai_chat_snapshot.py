@@ -0,0 +1,108 @@
+# tests/test_ai_chat_snapshot.py
+import json
+
+from cogs.ai_chat.ai_state import AIStateManager
+from cogs.ai_chat.conversation_manager import ConversationManager, ConversationState
+from cogs.ai_chat.core import ChatCore, TopicSession
+from cogs.ai_chat.message_buffer import MessageBuffer
+from cogs.ai_chat.social_focus import SocialFocus
+from cogs.ai_chat.typing_tracker import TypingTracker
+
+
+def _core() -> ChatCore:
+    # sem bot/engine/history: snapshot/restore não tocam neles
+    return ChatCore(
+        bot=None,
+        engine=None,
+        buffer=MessageBuffer(max_messages=8),
+        social_focus=SocialFocus(timeout=120),
+        conv=ConversationManager(
+            idle_timeout=20 * 60,
+            soft_exit_timeout=120,
+            max_presence=8 * 60,
+            recent_end_window=90,
+        ),
+        state=AIStateManager(owner_id=1, admin_role_id=2, cooldown=30),
+        typing=TypingTracker(),
+    )
+
+
+def _populate(core: ChatCore):
+    buf = core._get_buffer(10)
+    buf.add_user_message("e aí override, viu o patch novo?", author_id=10, author_name="ana", ts=1000.0, channel_id=500)
+    buf.add_assistant_message("vi sim, mexeram no balanceamento", ts=1001.5, channel_id=500)
+    buf.add_user_message("e no outro canal?", author_id=10, author_name="ana", ts=1001.8, channel_id=502)
+    core._get_buffer(11).add_user_message(
+        "alguém pro ranked?", author_id=11, author_name="bia", ts=1002.0, channel_id=501
+    )
+
+    conv = core._get_conv(10)
+    conv.active_author = 10
+    conv.started_at = 990.0
+    conv.last_activity_ts = 1001.5
+    conv.state = ConversationState.ENGAGED
+
+    core.self_memory_by_author[10] = ["vi sim, mexeram no balanceamento"]
+
+    core.pending_buffers[11] = ["alguém pro ranked?", "tô sem duo"]
+    core.pending_meta[11] = {"channel_id": 501, "author_name": "bia"}
+    core.batch_first_ts[11] = 1002.0
+    core.batch_last_ts[11] = 1003.0
+    core.fragment_hold_until[11] = 1011.0
+
+    core.topic_sessions["t1"] = TopicSession(
+        key="t1", keywords={"patch", "balanceamento"}, authors={10, 11}, last_activity=1001.5, turns=2
+    )
+    core.author_topic[10] = "t1"
+    core._last_vibe_by_author[11] = 995.0
+
+    core.global_active_author = 10
+    core.global_state = ConversationState.ENGAGED
+    core.global_state_ts = 990.0
+
+    core.state.last_interaction[10] = 1001.5
+    core.state.active_conversations.add(10)
+    core.interject.mark_used(11, mode="spontaneous")
+    core.chanmem.add(1001.5, "vi sim, mexeram no balanceamento")
+
+
+def test_snapshot_json_round_trip():
+    src = _core()
+    _populate(src)
+    snap = src.snapshot()
+
+    # precisa sobreviver ao JSON do autosave (chaves viram str, sets viram listas)
+    data = json.loads(json.dumps(snap))
+
+    dst = _core()
+    dst.restore(data)
+
+    assert dst.snapshot() == data
+    assert [m["channel_id"] for m in dst.buffers[10].messages] == [500, 500, 502]
+    assert dst.pending_buffers[11] == ["alguém pro ranked?", "tô sem duo"]
+    assert dst.topic_sessions["t1"].authors == {10, 11}
+    assert dst.author_topic == {10: "t1"}
+    assert dst.global_state is ConversationState.ENGAGED
+    assert dst.conv_by_author[10].state is ConversationState.ENGAGED
+
+
+def test_restore_drops_dangling_topic_and_empty_pending():
+    src = _core()
+    _populate(src)
+    data = json.loads(json.dumps(src.snapshot()))
+    data["author_topic"]["11"] = "sumiu"
+    data["pending"]["12"] = {"messages": [], "meta": {}}
+
+    dst = _core()
+    dst.restore(data)
+
+    assert 11 not in dst.author_topic
+    assert 12 not in dst.pending_buffers
+
+
+def test_restore_old_snapshot_uses_buffer_channel():
+    # snapshot de antes do canal por mensagem: canal só no buffer
+    old = {"buffers": {"10": {"channel_id": 500, "messages": [{"role": "user", "content": "oi", "ts": 1.0}]}}}
+    dst = _core()
+    dst.restore(old)
+    assert dst.buffers[10].messages[0]["channel_id"] == 500
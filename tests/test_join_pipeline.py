@@ -0,0 +1,137 @@
+# tests/test_join_pipeline.py
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import join_pipeline as jp
+from join_pipeline import JoinPipeline
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+class _Clock:
+    def __init__(self):
+        self.mono = 1000.0
+        self.wall = 1_700_000_000.0
+
+    def advance(self, sec):
+        self.mono += sec
+        self.wall += sec
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = _Clock()
+    monkeypatch.setattr(jp.time, "monotonic", lambda: c.mono)
+    monkeypatch.setattr(jp.time, "time", lambda: c.wall)
+    return c
+
+
+@pytest.fixture(autouse=True)
+def short_windows(monkeypatch):
+    # janelas reais em segundos; aqui o flush é imediato (o relógio é falso)
+    monkeypatch.setattr(jp, "WINDOW_SEC", 0.0)
+    monkeypatch.setattr(jp, "RAID_FLUSH_SEC", 0.0)
+
+
+GUILD = SimpleNamespace(id=1)
+
+
+def _member(i, bot=False):
+    return SimpleNamespace(id=i, guild=GUILD, bot=bot)
+
+
+async def _flush():
+    # deixa _flush_after e os _dispatch rodarem
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def _pipeline():
+    p = JoinPipeline()
+    batches = []
+
+    async def handler(batch):
+        batches.append(batch)
+
+    p.subscribe("test", handler)
+    return p, batches
+
+
+def test_window_aggregates_and_skips_bots(clock):
+    async def go():
+        p, batches = _pipeline()
+        for i in range(3):
+            p.push(_member(i))
+        p.push(_member(99, bot=True))
+        p.push(_member(1))            # repetido na mesma janela
+        await _flush()
+        return batches
+
+    (batch,) = _run(go())
+    assert [m.id for m in batch.members] == [0, 1, 2]
+    assert batch.total == 4
+    assert not batch.raid
+
+
+def test_raid_switches_on_and_off(clock):
+    async def go():
+        p, batches = _pipeline()
+        for i in range(jp.RAID_THRESHOLD - 1):
+            p.push(_member(i))
+        assert not p.is_raid(GUILD.id)
+        p.push(_member(500))
+        assert p.is_raid(GUILD.id)
+        await _flush()
+
+        # continua em raid enquanto chega gente
+        clock.advance(jp.RAID_HOLD - 1)
+        p.push(_member(501))
+        assert p.is_raid(GUILD.id)
+        await _flush()
+
+        # RAID_HOLD sem join: desliga
+        clock.advance(jp.RAID_HOLD + 1)
+        assert not p.is_raid(GUILD.id)
+        p.push(_member(502))
+        await _flush()
+        return batches
+
+    batches = _run(go())
+    assert [b.raid for b in batches] == [True, True, False]
+
+
+def test_rejoin_cooldown(clock):
+    async def go():
+        p, batches = _pipeline()
+        p.push(_member(7))
+        await _flush()
+        clock.advance(jp.REJOIN_COOLDOWN - 1)
+        p.push(_member(7))
+        await _flush()
+        clock.advance(2)
+        p.push(_member(7))
+        await _flush()
+        return batches
+
+    b1, b2, b3 = _run(go())
+    assert [m.id for m in b1.fresh] == [7]
+    assert b2.fresh == [] and [m.id for m in b2.members] == [7]   # cargo ainda vai
+    assert [m.id for m in b3.fresh] == [7]
+
+
+def test_every_member_kept_for_roles(clock):
+    async def go():
+        p, batches = _pipeline()
+        for i in range(jp.MAX_BATCH_MEMBERS + 50):
+            p.push(_member(i))
+        await _flush()
+        return batches
+
+    (batch,) = _run(go())
+    assert len(batch.members) == jp.MAX_BATCH_MEMBERS + 50
+    assert len(batch.fresh) == jp.MAX_BATCH_MEMBERS
+
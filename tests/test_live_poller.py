@@ -0,0 +1,123 @@
+# tests/test_live_poller.py
+import asyncio
+
+import pytest
+
+from platforms import LiveCheckError
+from platforms import poller as poller_mod
+from platforms.poller import END_CONFIRM, UNKNOWN, LivePoller, _Target
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def events():
+    return {"start": [], "end": []}
+
+
+@pytest.fixture
+def poller(events):
+    async def on_start(platform, channel, info):
+        events["start"].append((platform, channel))
+
+    async def on_end(platform, channel):
+        events["end"].append((platform, channel))
+
+    return LivePoller(on_start, on_end)
+
+
+def test_end_needs_confirmed_offline_checks(poller, events):
+    t = _Target("youtube", "canal")
+
+    async def go():
+        await poller._apply(t, {"live_id": "x"})
+        for _ in range(END_CONFIRM - 1):
+            await poller._apply(t, None)
+        assert t.live and not events["end"]
+        await poller._apply(t, None)
+
+    _run(go())
+    assert events["start"] == [("youtube", "canal")]
+    assert events["end"] == [("youtube", "canal")]
+    assert not t.live
+
+
+def test_unknown_does_not_count_as_offline(poller, events):
+    t = _Target("youtube", "canal")
+
+    async def go():
+        await poller._apply(t, {"live_id": "x"})
+        await poller._apply(t, None)
+        for _ in range(END_CONFIRM * 3):
+            await poller._apply(t, UNKNOWN)
+        # volta a responder ao vivo: sem novo anúncio
+        await poller._apply(t, {"live_id": "x"})
+
+    _run(go())
+    assert t.live
+    assert t.misses == 0 and t.offline_polls == 0
+    assert events["end"] == []
+    assert events["start"] == [("youtube", "canal")]
+
+
+def test_unknown_keeps_offline_backoff(poller):
+    t = _Target("youtube", "canal")
+
+    async def go():
+        await poller._apply(t, None)
+        await poller._apply(t, UNKNOWN)
+
+    _run(go())
+    assert t.offline_polls == 1
+
+
+def test_checker_error_maps_to_unknown(poller, events, monkeypatch):
+    async def failing(channel):
+        raise LiveCheckError("HTTP 503")
+
+    monkeypatch.setitem(poller_mod.CHECKERS, "youtube", failing)
+    poller.set_channels([("youtube", "canal")])
+    t = poller._targets[("youtube", "canal")]
+    t.live = True
+
+    _run(poller._check(t))
+    assert t.live and t.misses == 0
+    assert events["end"] == []
+
+
+def test_seeded_live_ends_through_end_confirm(poller, events, monkeypatch):
+    async def offline(channel):
+        return None
+
+    monkeypatch.setitem(poller_mod.CHECKERS, "youtube", offline)
+    poller.set_channels([("youtube", "canal")])
+    poller.seed_live("youtube", "canal")
+    t = poller._targets[("youtube", "canal")]
+
+    async def go():
+        for _ in range(END_CONFIRM):
+            await poller._check(t)
+
+    _run(go())
+    assert events["start"] == []
+    assert events["end"] == [("youtube", "canal")]
+
+
+def test_seeded_live_with_positive_probe_fetches_info(poller, events, monkeypatch):
+    async def probe(channel):
+        return True
+
+    async def live(channel):
+        return {"live_id": "abc"}
+
+    monkeypatch.setitem(poller_mod.PROBES, "twitch", probe)
+    monkeypatch.setitem(poller_mod.CHECKERS, "twitch", live)
+    poller.set_channels([("twitch", "canal")])
+    poller.seed_live("twitch", "canal")
+    t = poller._targets[("twitch", "canal")]
+
+    _run(poller._check(t))
+    assert t.live and t.last_info == {"live_id": "abc"}
+    assert events["start"] == [] and events["end"] == []
@@ -0,0 +1,45 @@
+# tests/test_message_buffer.py
+import asyncio
+
+from cogs.ai_chat.message_buffer import MessageBuffer
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+class _Store:
+    def __init__(self):
+        self.rows = []
+        self.loads = []
+
+    def append(self, channel_id, author_id, msg):
+        self.rows.append((channel_id, author_id, msg["content"]))
+
+    async def load(self, channel_id, author_id, *, before_ts, limit, since_ts=0.0):
+        self.loads.append((channel_id, author_id, before_ts))
+        return []
+
+
+def test_each_message_goes_to_its_own_channel():
+    store = _Store()
+    buf = MessageBuffer(max_messages=8, store=store, owner_id=7)
+    buf.add_user_message("no geral", author_id=7, author_name="ana", channel_id=100)
+    buf.add_user_message("no off-topic", author_id=7, author_name="ana", channel_id=200)
+    buf.add_assistant_message("respondi lá", channel_id=200)
+
+    assert store.rows == [(100, 7, "no geral"), (200, 7, "no off-topic"), (200, 7, "respondi lá")]
+    assert [m["content"] for m in buf.get_messages(100)] == ["no geral"]
+    assert len(buf.get_messages()) == 3
+
+
+def test_older_reads_the_requested_channel():
+    store = _Store()
+    buf = MessageBuffer(max_messages=8, store=store, owner_id=7)
+    buf.add_user_message("a", author_id=7, ts=10.0, channel_id=100)
+    buf.add_user_message("b", author_id=7, ts=20.0, channel_id=200)
+
+    _run(buf.older(5, max_age=3600, channel_id=200))
+
+    # corta pela primeira mensagem do canal 200, não pela do 100
+    assert store.loads == [(200, 7, 20.0)]
@@ -0,0 +1,126 @@
+# tests/test_rest_queue.py
+import asyncio
+import time
+
+import rest_queue
+from rest_queue import PRIORITY_BACKGROUND, PRIORITY_NORMAL, PRIORITY_USER, RestScheduler
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_coalesce_runs_only_latest():
+    async def go():
+        q = RestScheduler()
+        ran = []
+
+        def make(tag):
+            async def f():
+                ran.append(tag)
+                return tag
+            return f
+
+        f1 = q.submit("channel_rename", 1, make("old"), coalesce_key=("rename", 1))
+        f2 = q.submit("channel_rename", 1, make("new"), coalesce_key=("rename", 1))
+        assert f1 is f2
+        result = await f1
+        q.close()
+        return ran, result, q.stats()["channel_rename"]["coalesced"]
+
+    ran, result, coalesced = _run(go())
+    assert ran == ["new"]
+    assert result == "new"
+    assert coalesced == 1
+
+
+def test_priority_order():
+    async def go():
+        q = RestScheduler()
+        started = []
+
+        def make(tag):
+            async def f():
+                started.append(tag)
+            return f
+
+        futs = [
+            q.submit("message_edit", 1, make("bg"), priority=PRIORITY_BACKGROUND),
+            q.submit("message_edit", 2, make("normal"), priority=PRIORITY_NORMAL),
+            q.submit("message_edit", 3, make("user"), priority=PRIORITY_USER),
+        ]
+        await asyncio.gather(*futs)
+        q.close()
+        return started
+
+    assert _run(go()) == ["user", "normal", "bg"]
+
+
+def test_bucket_limit_delays_extra_calls(monkeypatch):
+    monkeypatch.setitem(rest_queue.ROUTE_LIMITS, "test_route", (2, 0.3))
+
+    async def go():
+        q = RestScheduler()
+        starts = []
+
+        async def f():
+            starts.append(time.monotonic())
+
+        await asyncio.gather(*(q.submit("test_route", 1, f) for _ in range(3)))
+        # outro bucket da mesma rota não espera
+        t0 = time.monotonic()
+        await q.submit("test_route", 2, f)
+        other = starts[-1] - t0
+        q.close()
+        return starts, other
+
+    starts, other = _run(go())
+    assert starts[1] - starts[0] < 0.1
+    assert starts[2] - starts[0] >= 0.25
+    assert other < 0.1
+
+
+def test_retry_takes_a_bucket_slot(monkeypatch):
+    monkeypatch.setitem(rest_queue.ROUTE_LIMITS, "test_route", (1, 0.4))
+
+    async def go():
+        q = RestScheduler()
+        attempts = []
+
+        async def flaky():
+            attempts.append(time.monotonic())
+            if len(attempts) == 1:
+                raise RuntimeError("falha temporária")
+            return "ok"
+
+        result = await q.run("test_route", 1, flaky, retries=1)
+        q.close()
+        return attempts, result, q.stats()["test_route"]
+
+    attempts, result, st = _run(go())
+    assert result == "ok"
+    assert len(attempts) == 2
+    assert attempts[1] - attempts[0] >= 0.35   # esperou a janela, não só o backoff
+    assert st["count"] == 1 and st["failed"] == 0
+
+
+def test_cancelled_caller_does_not_cancel_coalesced_action():
+    async def go():
+        q = RestScheduler()
+        gate = asyncio.Event()
+
+        async def f():
+            await gate.wait()
+            return "done"
+
+        a = asyncio.create_task(q.run("message_edit", 1, f, coalesce_key="k"))
+        b = asyncio.create_task(q.run("message_edit", 1, f, coalesce_key="k"))
+        await asyncio.sleep(0.01)
+        a.cancel()
+        await asyncio.sleep(0.01)
+        gate.set()
+        result = await b
+        q.close()
+        return result
+
+    assert _run(go()) == "done"
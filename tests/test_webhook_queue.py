@@ -0,0 +1,89 @@
+# tests/test_webhook_queue.py
+import asyncio
+
+import pytest
+from aiohttp.test_utils import make_mocked_request
+
+import webhook_server
+from webhook_server import RETRY_AFTER_SEC, WebhookQueue
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_coalesce_replaces_pending_payload():
+    q = WebhookQueue(10)
+    q.coalesce_key = lambda p: (p["event"], p["user"]) if p.get("event") == "live_info" else None
+
+    assert q.put_nowait({"event": "live_info", "user": "a", "n": 1}) is True
+    assert q.put_nowait({"event": "live_start", "user": "a"}) is True
+    assert q.put_nowait({"event": "live_info", "user": "a", "n": 2}) is False
+
+    batch = _run(q.get_batch(timeout=0.1))
+    assert [p.get("n") for p in batch] == [2, None]
+    assert q.coalesced == 1
+
+    # já consumido: o mesmo evento volta a entrar como novo
+    assert q.put_nowait({"event": "live_info", "user": "a", "n": 3}) is True
+
+
+def test_full_queue_rejects():
+    q = WebhookQueue(2)
+    q.put_nowait({"i": 1})
+    q.put_nowait({"i": 2})
+    with pytest.raises(asyncio.QueueFull):
+        q.put_nowait({"i": 3})
+    assert q.rejected == 1
+    assert q.qsize() == 2
+
+
+def test_get_batch_respects_max_items_and_timeout():
+    q = WebhookQueue(10)
+    for i in range(5):
+        q.put_nowait({"i": i})
+
+    async def go():
+        first = await q.get_batch(max_items=3)
+        rest = await q.get_batch(max_items=3)
+        empty = await q.get_batch(timeout=0.05)
+        return first, rest, empty
+
+    first, rest, empty = _run(go())
+    assert [p["i"] for p in first] == [0, 1, 2]
+    assert [p["i"] for p in rest] == [3, 4]
+    assert empty == []
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    q = WebhookQueue(1)
+    monkeypatch.setattr(webhook_server, "webhook_queue", q)
+    monkeypatch.setattr(webhook_server, "WEBHOOK_SECRET", "")
+
+    async def fake_read(request):
+        return {"event": "live_start", "user": "a"}
+
+    monkeypatch.setattr(webhook_server, "_read_payload", fake_read)
+    return q
+
+
+def _post():
+    return webhook_server.handler(make_mocked_request("POST", webhook_server.PATH))
+
+
+def test_handler_503_when_not_accepting(queue):
+    queue.accepting = False
+    r = _run(_post())
+    assert r.status == 503
+    assert r.headers["Retry-After"] == str(RETRY_AFTER_SEC)
+    assert queue.qsize() == 0
+
+
+def test_handler_429_when_full(queue):
+    queue.accepting = True
+    assert _run(_post()).status == 200
+    r = _run(_post())
+    assert r.status == 429
+    assert r.headers["Retry-After"] == str(RETRY_AFTER_SEC)
+    assert queue.qsize() == 1
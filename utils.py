@@ -38,6 +38,10 @@ BOOSTER_ROLE_ID = 0  # ⚠️ coloque aqui o ID do cargo "Server Booster" (se vo
 PLATFORM_LIVE_CHANNEL_ID = 1214687236331667497
 PLATFORM_PING_ROLE_ID = 1254470641944494131
 
+# Polling de lives (além do webhook do TikFinity). Lista vazia = desligado.
+#   ex.: ("twitch", "theadryanbr"), ("youtube", "@theadryanbr"), ("tiktok", "theadryanbr")
+PLATFORM_POLL_CHANNELS = []
+
 # Promoções
 
 PROMO_CHANNEL_ID = 1241172026715144306
@@ -59,6 +63,7 @@ FREESTUFF_PING_ROLE_ID = 1254470219305324564
 FREESTUFF_BOT_ID = 672822334641537041
 
 # Voice Rooms (gatilhos -> categoria + prefixo)
+#   • "pool" (opcional) sobrescreve VOICE_WARM_POOL_SIZE só pra aquele gatilho
 CANAL_FIXO_CONFIG = {
     1469497077732999178: {"categoria_id": 1469496488823492608, "prefixo_nome": "🎧║𝐋𝐨𝐛𝐛𝐲║"},  # Conversas
     1406308661810171965: {"categoria_id": 1213316039350296637, "prefixo_nome": "🎧║𝐋𝐨𝐛𝐛𝐲║"},  # Outros jogos
@@ -76,6 +81,9 @@ CANAL_FIXO_CONFIG = {
     1213322826564767776: {"categoria_id": 1213322073594793994, "prefixo_nome": "👥║𝐒𝐪𝐮𝐚𝐝║"},   # COD
 }
 
+# Salas "quentes": quantas salas ocultas deixar pré-criadas por gatilho (0 = desligado)
+VOICE_WARM_POOL_SIZE = 0
+
 
 # ─────────────────────────────
 # TEMPO
@@ -2,59 +2,157 @@
 import asyncio
 import logging
 import json
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional
+from urllib.parse import parse_qsl
+
 from aiohttp import web
 
 log = logging.getLogger("webhook_server")
 
-# Fila async pro seu cog consumir
-webhook_queue: asyncio.Queue = asyncio.Queue()
-
 WEBHOOK_SECRET = ""  # opcional, mas recomendo
 HOST = "0.0.0.0"
 PORT = 8787
 PATH = "/tikfinity"
 
+QUEUE_MAX = 500          # payloads esperando o cog; cheio = 429
+RETRY_AFTER_SEC = 5
+
 _runner = None
 _site = None
 
+
+class WebhookQueue:
+    """
+    Fila limitada com coalescência:
+      - coalesce_key(payload) -> chave ou None (definido pelo consumidor);
+        payload novo com a mesma chave de um ainda na fila SUBSTITUI o antigo
+        (ex.: vários live_info do mesmo usuário viram só o último)
+      - cheia: put_nowait levanta asyncio.QueueFull (handler responde 429)
+      - accepting=False (ninguém consumindo): handler responde 503
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.coalesce_key: Optional[Callable[[dict], Optional[Hashable]]] = None
+        self.accepting = False
+        self._items: Deque[list] = deque()          # [chave, payload]
+        self._by_key: Dict[Hashable, list] = {}
+        self._ready = asyncio.Event()
+        self.coalesced = 0
+        self.rejected = 0
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def put_nowait(self, payload: dict) -> bool:
+        """True = entrou; False = substituiu um pendente (coalescido)."""
+        key = None
+        if self.coalesce_key is not None:
+            try:
+                key = self.coalesce_key(payload)
+            except Exception:
+                key = None
+
+        if key is not None:
+            entry = self._by_key.get(key)
+            if entry is not None:
+                entry[1] = payload
+                self.coalesced += 1
+                return False
+
+        if len(self._items) >= self.maxsize:
+            self.rejected += 1
+            raise asyncio.QueueFull
+
+        entry = [key, payload]
+        self._items.append(entry)
+        if key is not None:
+            self._by_key[key] = entry
+        self._ready.set()
+        return True
+
+    async def get_batch(self, max_items: int = 32, timeout: Optional[float] = None) -> List[dict]:
+        """Espera ter algo (até timeout) e devolve até max_items, na ordem de chegada."""
+        if not self._items:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return []
+
+        batch: List[dict] = []
+        while self._items and len(batch) < max_items:
+            entry = self._items.popleft()
+            if entry[0] is not None and self._by_key.get(entry[0]) is entry:
+                self._by_key.pop(entry[0], None)
+            batch.append(entry[1])
+        return batch
+
+
+# Fila pro seu cog consumir
+webhook_queue = WebhookQueue(QUEUE_MAX)
+
+
+async def _read_payload(request: web.Request) -> Dict[str, Any]:
+    """
+    Lê o corpo UMA vez e escolhe o parser pelo Content-Type
+    (json / form / multipart / texto que parece json / texto cru).
+    """
+    payload: Dict[str, Any] = {}
+
+    # querystring
+    if request.query:
+        payload.update(dict(request.query))
+
+    ctype = request.content_type or ""
+    if ctype.startswith("multipart/"):
+        form = await request.post()
+        payload.update({k: str(v) for k, v in form.items()})
+        return payload
+
+    body = await request.read()
+    if not body:
+        return payload
+    text = body.decode(request.charset or "utf-8", errors="ignore").strip()
+
+    if ctype == "application/x-www-form-urlencoded":
+        payload.update(dict(parse_qsl(text, keep_blank_values=True)))
+        return payload
+
+    if ctype.endswith("json") or text[:1] in ("{", "["):
+        try:
+            j = json.loads(text)
+            payload.update(j if isinstance(j, dict) else {"data": j})
+            return payload
+        except ValueError:
+            pass
+
+    if text:
+        payload["raw"] = text
+    return payload
+
 async def handler(request: web.Request) -> web.Response:
     # Segurança simples (evita qualquer device da rede te spammar)
     if WEBHOOK_SECRET:
         if request.headers.get("X-Webhook-Secret") != WEBHOOK_SECRET:
             return web.Response(status=401, text="unauthorized")
 
-    payload = {}
-
-    # querystring
-    if request.query:
-        payload.update(dict(request.query))
+    if not webhook_queue.accepting:
+        return web.Response(status=503, text="not ready", headers={"Retry-After": str(RETRY_AFTER_SEC)})
 
-    # json / form / texto
     try:
-        data = await request.json()
-        if isinstance(data, dict):
-            payload.update(data)
-        else:
-            payload["data"] = data
-    except Exception:
-        try:
-            form = await request.post()
-            if form:
-                payload.update({k: str(v) for k, v in form.items()})
-        except Exception:
-            try:
-                raw = (await request.text()).strip()
-                if raw:
-                    try:
-                        j = json.loads(raw)
-                        payload.update(j if isinstance(j, dict) else {"data": j})
-                    except Exception:
-                        payload["raw"] = raw
-            except Exception:
-                pass
+        payload = await _read_payload(request)
+    except Exception as e:
+        log.warning(f"[Webhook] corpo ilegível: {e}")
+        return web.Response(status=400, text="bad payload")
 
-    await webhook_queue.put(payload)
-    return web.Response(text="ok")
+    try:
+        queued = webhook_queue.put_nowait(payload)
+    except asyncio.QueueFull:
+        log.warning(f"[Webhook] fila cheia ({webhook_queue.maxsize}), recusando")
+        return web.Response(status=429, text="busy", headers={"Retry-After": str(RETRY_AFTER_SEC)})
+    return web.Response(text="ok" if queued else "ok (coalesced)")
 
 async def ensure_webhook_server(host: str = "0.0.0.0", port: int = 8787, path: str = "/tikfinity"):
     global _runner, _site